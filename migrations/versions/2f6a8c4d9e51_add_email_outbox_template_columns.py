@@ -0,0 +1,52 @@
+"""add email outbox template columns
+
+Revision ID: 2f6a8c4d9e51
+Revises: 9e3b5f7a2c18
+Create Date: 2026-10-17 00:12:09.554213
+
+"""
+
+from typing import Sequence  # noqa: UP035
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+from sqlmodel import AutoString
+
+# revision identifiers, used by Alembic.
+revision: str = "2f6a8c4d9e51"
+down_revision: str | None = "9e3b5f7a2c18"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "email_outbox",
+        sa.Column("template", AutoString(length=64), nullable=True),
+    )
+    op.add_column(
+        "email_outbox",
+        sa.Column("context", postgresql.JSON(astext_type=sa.Text()), nullable=True),
+    )
+    op.alter_column(
+        "email_outbox",
+        "subject",
+        existing_type=AutoString(length=255),
+        nullable=True,
+    )
+    op.alter_column("email_outbox", "body", existing_type=sa.Text(), nullable=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.alter_column("email_outbox", "body", existing_type=sa.Text(), nullable=False)
+    op.alter_column(
+        "email_outbox",
+        "subject",
+        existing_type=AutoString(length=255),
+        nullable=False,
+    )
+    op.drop_column("email_outbox", "context")
+    op.drop_column("email_outbox", "template")
@@ -0,0 +1,64 @@
+"""create email outbox table
+
+Revision ID: 9e3b5f7a2c18
+Revises: d4a81f0c6e25
+Create Date: 2026-10-16 23:52:41.318406
+
+"""
+
+from typing import Sequence  # noqa: UP035
+
+import sqlalchemy as sa
+from alembic import op
+from sqlmodel import AutoString
+
+# revision identifiers, used by Alembic.
+revision: str = "9e3b5f7a2c18"
+down_revision: str | None = "d4a81f0c6e25"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "email_outbox",
+        sa.Column("id", sa.UUID(), nullable=False),
+        sa.Column("idempotency_key", AutoString(length=255), nullable=False),
+        sa.Column("recipient", AutoString(length=320), nullable=False),
+        sa.Column("subject", AutoString(length=255), nullable=False),
+        sa.Column("body", sa.Text(), nullable=False),
+        sa.Column("is_html", sa.Boolean(), nullable=False),
+        sa.Column(
+            "status",
+            sa.Enum("PENDING", "SENT", "FAILED", name="emailstatus"),
+            nullable=False,
+        ),
+        sa.Column("attempts", sa.Integer(), nullable=False),
+        sa.Column("last_error", sa.Text(), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("available_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("locked_until", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("sent_at", sa.DateTime(timezone=True), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        "ix_email_outbox_idempotency_key",
+        "email_outbox",
+        ["idempotency_key"],
+        unique=True,
+    )
+    op.create_index(
+        "ix_email_outbox_status_available_at",
+        "email_outbox",
+        ["status", "available_at"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_email_outbox_status_available_at", table_name="email_outbox")
+    op.drop_index("ix_email_outbox_idempotency_key", table_name="email_outbox")
+    op.drop_table("email_outbox")
+    sa.Enum(name="emailstatus").drop(op.get_bind(), checkfirst=True)
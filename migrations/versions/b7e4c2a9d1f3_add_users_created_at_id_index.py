@@ -0,0 +1,29 @@
+"""add users created_at id index
+
+Revision ID: b7e4c2a9d1f3
+Revises: 6c3fbc1eb5bf
+Create Date: 2026-10-16 10:12:41.518204
+
+"""
+
+from typing import Sequence  # noqa: UP035
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "b7e4c2a9d1f3"
+down_revision: str | None = "6c3fbc1eb5bf"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        "ix_users_created_at_id", "users", ["created_at", "id"], unique=False
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_users_created_at_id", table_name="users")
@@ -0,0 +1,44 @@
+"""create event outbox table
+
+Revision ID: d4a81f0c6e25
+Revises: b7e4c2a9d1f3
+Create Date: 2026-10-16 13:47:05.902117
+
+"""
+
+from typing import Sequence  # noqa: UP035
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+from sqlmodel import AutoString
+
+# revision identifiers, used by Alembic.
+revision: str = "d4a81f0c6e25"
+down_revision: str | None = "b7e4c2a9d1f3"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "event_outbox",
+        sa.Column("id", sa.UUID(), nullable=False),
+        sa.Column("event", AutoString(length=255), nullable=False),
+        sa.Column("payload", postgresql.JSON(astext_type=sa.Text()), nullable=False),
+        sa.Column("attempts", sa.Integer(), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("available_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("locked_until", sa.DateTime(timezone=True), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        "ix_event_outbox_available_at", "event_outbox", ["available_at"], unique=False
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_event_outbox_available_at", table_name="event_outbox")
+    op.drop_table("event_outbox")
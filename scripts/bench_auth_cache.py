@@ -0,0 +1,39 @@
+"""Per-request cost of the require_auth dependency with and without its cache.
+
+Usage: python scripts/bench_auth_cache.py [requests]
+"""
+
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from fastapi.security import HTTPAuthorizationCredentials  # noqa: E402
+
+from helpers.auth import access_token_cache, create_access_token, require_auth  # noqa: E402
+
+
+async def measure(credentials: HTTPAuthorizationCredentials, requests: int) -> float:
+    """Return microseconds per require_auth call."""
+    await require_auth(credentials)
+    started = time.perf_counter()
+    for _ in range(requests):
+        await require_auth(credentials)
+    return (time.perf_counter() - started) / requests * 1e6
+
+
+async def main(requests: int):
+    credentials = HTTPAuthorizationCredentials(
+        scheme="Bearer", credentials=create_access_token("bench@example.com")
+    )
+    max_size = access_token_cache.max_size or 10000
+    for name, size in (("cache off", 0), ("cache on", max_size)):
+        access_token_cache.clear()
+        access_token_cache.max_size = size
+        print(f"{name:>9}: {await measure(credentials, requests):.1f} us/request")
+
+
+if __name__ == "__main__":
+    asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else 20000))
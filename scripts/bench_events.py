@@ -0,0 +1,63 @@
+"""Events per second through the event bus under mixed-latency listeners.
+
+Every event runs a fast coroutine listener; one in ten also waits 50 ms in a
+slow one, standing in for a database round-trip. With a single consumer the
+slow events hold up everything queued behind them.
+
+Usage: python scripts/bench_events.py [events]
+"""
+
+import asyncio
+import logging
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from helpers.events import Events  # noqa: E402
+from helpers.executor import BoundedExecutor  # noqa: E402
+
+
+async def measure(concurrency: int, count: int) -> float:
+    """Return events handled per second with `concurrency` consumers."""
+    done = asyncio.Event()
+    handled = 0
+
+    async def fast(index: int):
+        pass
+
+    async def slow(index: int):
+        nonlocal handled
+        if index % 10 == 0:
+            await asyncio.sleep(0.05)
+        handled += 1
+        if handled == count:
+            done.set()
+
+    bus = Events(
+        concurrency=concurrency,
+        thread_executor=BoundedExecutor(1, 1, mode="thread", name="bench"),
+        process_executor=BoundedExecutor(1, 1, mode="thread", name="bench"),
+    )
+    bus.on("bench", fast)
+    bus.on("bench", slow)
+
+    started = time.perf_counter()
+    await bus.start_worker()
+    await bus.emit_many("bench", ((index,) for index in range(count)))
+    await done.wait()
+    elapsed = time.perf_counter() - started
+    await bus.stop_worker()
+    return count / elapsed
+
+
+async def main(count: int):
+    logging.disable(logging.INFO)
+    for concurrency in (1, 4, 16, 64):
+        rate = await measure(concurrency, count)
+        print(f"{concurrency:>3} consumer(s): {rate:,.0f} events/s")
+
+
+if __name__ == "__main__":
+    asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else 2000))
@@ -0,0 +1,81 @@
+"""CPU per request for a 100-user `find` response, validated and fast.
+
+The validated route builds each UserRead with model_validate and lets FastAPI
+validate and encode the APIResponse against its response_model again. The
+fast route builds them with model_construct and returns
+`APIResponse.response()`, which FastAPI sends as is.
+
+Usage: python scripts/bench_fast_response.py [requests]
+"""
+
+import asyncio
+import sys
+import time
+import uuid
+from pathlib import Path
+from types import SimpleNamespace
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+import httpx  # noqa: E402
+from fastapi import FastAPI  # noqa: E402
+
+from helpers.model import APIResponse, utc_now  # noqa: E402
+from models.users import UserRead, UserRole  # noqa: E402
+
+ROWS = [
+    SimpleNamespace(
+        id=uuid.uuid4(),
+        email=f"user{index}@example.com",
+        first_name="First",
+        last_name="Last",
+        role=UserRole.USER,
+        is_active=True,
+        is_verified=True,
+        meta_data={"index": index, "tags": ["a", "b"]},
+        created_at=utc_now(),
+        updated_at=None,
+        authenticated_at=utc_now(),
+    )
+    for index in range(100)
+]
+
+app = FastAPI()
+
+
+@app.get("/validated", response_model=APIResponse[list[UserRead]])
+async def validated():
+    data = [UserRead.model_validate(row) for row in ROWS]
+    return APIResponse[list[UserRead]](data=data, meta={"total": len(data)})
+
+
+@app.get("/fast", response_model=APIResponse[list[UserRead]])
+async def fast():
+    data = [UserRead.model_construct(**vars(row)) for row in ROWS]
+    return APIResponse[list[UserRead]](data=data, meta={"total": len(data)}).response()
+
+
+async def measure(client: httpx.AsyncClient, path: str, requests: int) -> float:
+    """Return CPU milliseconds per request."""
+    for _ in range(20):
+        await client.get(path)
+    started = time.process_time()
+    for _ in range(requests):
+        await client.get(path)
+    return (time.process_time() - started) / requests * 1e3
+
+
+async def main(requests: int):
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(
+        transport=transport, base_url="http://bench"
+    ) as client:
+        validated_body = (await client.get("/validated")).json()
+        assert (await client.get("/fast")).json() == validated_body
+        for path in ("/validated", "/fast"):
+            cpu = await measure(client, path, requests)
+            print(f"{path:>10}: {cpu:.2f} ms CPU/request")
+
+
+if __name__ == "__main__":
+    asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else 500))
@@ -0,0 +1,135 @@
+"""/health latency through the app while signups and logins hash passwords.
+
+Probes `/health` every 10 ms while a burst of concurrent signups and logins
+runs against a throwaway SQLite database, first with bcrypt run inline on the
+event loop, as it used to be, then on the password executor. Every request
+goes through the ASGI app and its middleware.
+
+Usage: python scripts/bench_health_under_auth.py [signups]
+"""
+
+import asyncio
+import logging
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+import httpx  # noqa: E402
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine  # noqa: E402
+
+import repositories.users  # noqa: E402
+from core.database import PrimarySession, _WriteTrackingSession, router  # noqa: E402
+from helpers.auth import (  # noqa: E402
+    hash_password,
+    hash_password_async,
+    password_executor,
+    verify_password,
+    verify_password_async,
+)
+from models import SQLModel  # noqa: E402
+from server import app  # noqa: E402
+
+
+async def hash_inline(password: str) -> str:
+    return hash_password(password)
+
+
+async def verify_inline(plain_password: str, hashed_password: str) -> bool:
+    return verify_password(plain_password, hashed_password)
+
+
+async def measure(client: httpx.AsyncClient, prefix: str, signups: int) -> list[float]:
+    """Run `signups` signups then as many logins; return /health latencies in ms.
+
+    Probes are due every 10 ms whether or not earlier ones have finished, and
+    each is timed from when it was due, so time spent waiting for a blocked
+    event loop counts against it.
+    """
+    loop = asyncio.get_running_loop()
+    latencies: list[float] = []
+    probes: list[asyncio.Task] = []
+    done = asyncio.Event()
+
+    async def probe(due: float):
+        response = await client.get("/health")
+        latencies.append((loop.time() - due) * 1000)
+        assert response.status_code == 200
+
+    async def schedule():
+        due = loop.time()
+        while not done.is_set():
+            due += 0.01
+            await asyncio.sleep(max(0, due - loop.time()))
+            probes.append(asyncio.create_task(probe(due)))
+
+    def user(index: int) -> dict[str, str]:
+        return {
+            "email": f"{prefix}{index}@example.com",
+            "first_name": "Bench",
+            "last_name": "User",
+            "password": "correct horse battery staple",
+        }
+
+    async def signup_and_login(index: int):
+        response = await client.post("/api/v1/users/account", json=user(index))
+        assert response.status_code == 200, response.text
+        credentials = {key: user(index)[key] for key in ("email", "password")}
+        response = await client.post("/api/v1/users/account/validate", json=credentials)
+        assert response.status_code == 200, response.text
+
+    scheduler = asyncio.create_task(schedule())
+    await asyncio.gather(*(signup_and_login(index) for index in range(signups)))
+    done.set()
+    await scheduler
+    await asyncio.gather(*probes)
+    return latencies
+
+
+async def main(signups: int):
+    logging.disable(logging.INFO)
+    with tempfile.TemporaryDirectory() as directory:
+        # SQLite allows one writer; wait for it rather than failing the burst
+        engine = create_async_engine(
+            f"sqlite+aiosqlite:///{directory}/bench.db", connect_args={"timeout": 60}
+        )
+        async with engine.begin() as connection:
+            await connection.run_sync(SQLModel.metadata.create_all)
+        router.primary = async_sessionmaker(
+            bind=engine,
+            expire_on_commit=False,
+            class_=PrimarySession,
+            sync_session_class=_WriteTrackingSession,
+        )
+        router.replicas = []
+
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(
+            transport=transport, base_url="http://bench"
+        ) as client:
+            for name, hash_, verify in (
+                ("inline", hash_inline, verify_inline),
+                ("executor", hash_password_async, verify_password_async),
+            ):
+                repositories.users.hash_password_async = hash_
+                repositories.users.verify_password_async = verify
+                started = time.perf_counter()
+                latencies = await measure(client, name, signups)
+                elapsed = time.perf_counter() - started
+                p50 = statistics.median(latencies)
+                p99 = statistics.quantiles(latencies, n=100, method="inclusive")[98]
+                print(
+                    f"{name:>8}: {signups} signups + logins in {elapsed:.2f}s, "
+                    f"/health p50 {p50:.1f} ms, p99 {p99:.1f} ms, "
+                    f"max {max(latencies):.1f} ms ({len(latencies)} probes)"
+                )
+        print(f"executor stats: {password_executor.stats()}")
+        password_executor.shutdown()
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else 20))
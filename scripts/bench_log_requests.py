@@ -0,0 +1,81 @@
+"""Requests per second through the access-log middleware.
+
+Compares the pure ASGI LogRequests against the BaseHTTPMiddleware version it
+replaced, on a bare FastAPI app serving a small JSON response.
+
+Usage: python scripts/bench_log_requests.py [requests]
+"""
+
+import asyncio
+import sys
+import time
+from collections.abc import Callable
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+import httpx  # noqa: E402
+from fastapi import FastAPI, Request, Response  # noqa: E402
+from starlette.middleware.base import BaseHTTPMiddleware  # noqa: E402
+
+from helpers.logger import Logger  # noqa: E402
+from middlewares.log_requests import LogRequests  # noqa: E402
+
+logger = Logger("bench")
+
+
+class BaseHTTPLogRequests(BaseHTTPMiddleware):
+    """The previous LogRequests implementation, kept for comparison."""
+
+    async def dispatch(self, request: Request, call_next: Callable) -> Response:
+        start_time = time.time()
+        client_ip = request.client.host if request.client else "unknown"
+        forwarded_for = request.headers.get("X-Forwarded-For")
+        if forwarded_for:
+            client_ip = forwarded_for.split(",")[0].strip()
+        logger.info(
+            f"Incoming request | {request.method} {request.url.path} | Client IP: {client_ip}"
+        )
+        response = await call_next(request)
+        logger.info(
+            f"Request completed | {request.method} {request.url.path} | "
+            f"Status: {response.status_code} | Time: {time.time() - start_time:.3f}s | "
+            f"Client IP: {client_ip}"
+        )
+        return response
+
+
+def build_app(middleware: type | None) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/health")
+    async def health():
+        return {"status": "healthy"}
+
+    if middleware is not None:
+        app.add_middleware(middleware)
+    return app
+
+
+async def measure(app: FastAPI, requests: int) -> float:
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as c:
+        await c.get("/health")
+        started = time.perf_counter()
+        for _ in range(requests):
+            await c.get("/health")
+        return requests / (time.perf_counter() - started)
+
+
+async def main(requests: int):
+    for name, middleware in (
+        ("none", None),
+        ("BaseHTTPMiddleware", BaseHTTPLogRequests),
+        ("LogRequests", LogRequests),
+    ):
+        rate = await measure(build_app(middleware), requests)
+        print(f"{name:>18}: {rate:.0f} req/s")
+
+
+if __name__ == "__main__":
+    asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else 3000))
@@ -0,0 +1,105 @@
+"""Sequential signups per second with and without the email pre-check SELECT.
+
+Runs against a throwaway SQLite database with password hashing stubbed out,
+so only the database work of `UserRespository.create` is measured.
+
+Usage: python scripts/bench_signup.py [signups]
+"""
+
+import asyncio
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from sqlalchemy.exc import IntegrityError  # noqa: E402
+from sqlalchemy.ext.asyncio import (  # noqa: E402
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
+from sqlmodel import select  # noqa: E402
+
+import repositories.users  # noqa: E402
+from core.database import PrimarySession, _WriteTrackingSession, router  # noqa: E402
+from helpers.model import APIError, APIResponse  # noqa: E402
+from models import SQLModel  # noqa: E402
+from models.users import UserCreate, UserRead, Users  # noqa: E402
+from repositories.users import UserRespository  # noqa: E402
+
+
+class PreCheckUserRespository(UserRespository):
+    """The previous create, which looked the email up before inserting."""
+
+    async def create(self, payload: UserCreate) -> APIResponse[UserRead] | None:
+        db: AsyncSession = await self.get_database_session()
+        try:
+            statement = select(Users).where(
+                Users.email == payload.email,
+                Users.is_deleted == False,  # noqa: E712
+            )
+            result = await db.execute(statement)
+            if result.scalar_one_or_none():
+                raise APIError(409, "User with this email already exists")
+
+            user = Users(
+                **payload.model_dump(exclude={"password"}),
+                password=await repositories.users.hash_password_async(payload.password),
+            )
+            db.add(user)
+            await db.commit()
+            data = UserRead.model_validate(user)
+            return APIResponse[UserRead](data=data)
+        except IntegrityError as e:
+            await db.rollback()
+            raise APIError(400, "Database integrity error") from e
+        finally:
+            await self.close_database_session()
+
+
+async def stub_hash(password: str) -> str:
+    return password
+
+
+async def measure(repository: UserRespository, prefix: str, signups: int) -> float:
+    """Return signups per second."""
+    started = time.perf_counter()
+    for index in range(signups):
+        await repository.create(
+            UserCreate(
+                email=f"{prefix}{index}@example.com",
+                first_name="Bench",
+                last_name="User",
+                password="password",
+            )
+        )
+    return signups / (time.perf_counter() - started)
+
+
+async def main(signups: int):
+    repositories.users.hash_password_async = stub_hash
+    with tempfile.TemporaryDirectory() as directory:
+        engine = create_async_engine(f"sqlite+aiosqlite:///{directory}/bench.db")
+        async with engine.begin() as connection:
+            await connection.run_sync(SQLModel.metadata.create_all)
+        router.primary = async_sessionmaker(
+            bind=engine,
+            expire_on_commit=False,
+            class_=PrimarySession,
+            sync_session_class=_WriteTrackingSession,
+        )
+        router.replicas = []
+
+        for name, repository in (
+            ("pre-check", PreCheckUserRespository()),
+            ("index only", UserRespository()),
+        ):
+            rate = await measure(repository, name.replace(" ", "-"), signups)
+            print(f"{name:>10}: {rate:,.0f} signups/s")
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else 500))
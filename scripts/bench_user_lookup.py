@@ -0,0 +1,93 @@
+"""CPU per email lookup with per-call and prebuilt statements.
+
+Compares building `select(Users).where(...)` on every call, as the
+repository used to, against the module-level ACTIVE_USER_BY_EMAIL statement
+with a bound parameter. Runs against a throwaway SQLite database with the
+user cache off, so every lookup reaches the database.
+
+Usage: python scripts/bench_user_lookup.py [lookups]
+"""
+
+import asyncio
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from sqlalchemy.ext.asyncio import (  # noqa: E402
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
+from sqlmodel import select  # noqa: E402
+
+from core.database import PrimarySession, _WriteTrackingSession, router  # noqa: E402
+from models import SQLModel  # noqa: E402
+from models.users import UserCreate, UserRead, Users  # noqa: E402
+from repositories.users import (  # noqa: E402
+    ACTIVE_USER_BY_EMAIL,
+    UserRespository,
+    user_cache,
+)
+
+
+async def per_call(repository: UserRespository, email: str) -> Any:
+    db: AsyncSession = await repository.get_database_session(readonly=True)
+    try:
+        statement = select(Users).where(
+            Users.email == email,
+            Users.is_deleted == False,  # noqa: E712
+        )
+        user = (await db.execute(statement)).scalar_one_or_none()
+        return UserRead.model_validate(user)
+    finally:
+        await repository.close_database_session()
+
+
+async def prebuilt(repository: UserRespository, email: str) -> Any:
+    db: AsyncSession = await repository.get_database_session(readonly=True)
+    try:
+        user = (await db.execute(ACTIVE_USER_BY_EMAIL, {"email": email})).one()
+        return UserRead.model_validate(user)
+    finally:
+        await repository.close_database_session()
+
+
+async def main(lookups: int):
+    user_cache.enabled = False
+    with tempfile.TemporaryDirectory() as directory:
+        engine = create_async_engine(f"sqlite+aiosqlite:///{directory}/bench.db")
+        async with engine.begin() as connection:
+            await connection.run_sync(SQLModel.metadata.create_all)
+        router.primary = async_sessionmaker(
+            bind=engine,
+            expire_on_commit=False,
+            class_=PrimarySession,
+            sync_session_class=_WriteTrackingSession,
+        )
+        router.replicas = []
+
+        repository = UserRespository()
+        email = "bench@example.com"
+        await repository.create(
+            UserCreate(
+                email=email, first_name="Bench", last_name="User", password="password"
+            )
+        )
+
+        for name, lookup in (("per-call", per_call), ("prebuilt", prebuilt)):
+            for _ in range(100):
+                await lookup(repository, email)
+            started = time.process_time()
+            for _ in range(lookups):
+                await lookup(repository, email)
+            cpu = (time.process_time() - started) / lookups * 1e6
+            print(f"{name:>8}: {cpu:.0f} us CPU/lookup")
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else 3000))
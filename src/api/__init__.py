@@ -1,5 +1,6 @@
 from fastapi import APIRouter
 
+from api.internal.metrics import metrics_router
 from api.v1.users import user_router
 
 
@@ -7,4 +8,5 @@ def setup_routes() -> APIRouter:
     """Configure and return the main API router with all routes."""
     router = APIRouter()
     router.include_router(user_router)
+    router.include_router(metrics_router)
     return router
@@ -0,0 +1,34 @@
+import secrets
+
+from fastapi import APIRouter, Header
+from fastapi.params import Depends
+from fastapi.responses import PlainTextResponse
+
+from core.config import settings
+from helpers.metrics import registry
+from helpers.model import APIError
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+async def require_internal_token(x_internal_token: str = Header(default="")):
+    if not settings.INTERNAL_API_TOKEN:
+        # Left open without a token only outside production, for local scraping
+        if settings.ENV == "production":
+            raise APIError(403, "Internal endpoints are disabled")
+        return
+    if not secrets.compare_digest(x_internal_token, settings.INTERNAL_API_TOKEN):
+        raise APIError(403, "Invalid internal token")
+
+
+metrics_router: APIRouter = APIRouter(
+    prefix="/internal",
+    tags=["internal"],
+    include_in_schema=False,
+    dependencies=[Depends(require_internal_token)],
+)
+
+
+@metrics_router.get("/metrics", response_class=PlainTextResponse)
+async def metrics() -> PlainTextResponse:
+    return PlainTextResponse(registry.render(), media_type=PROMETHEUS_CONTENT_TYPE)
@@ -1,21 +1,30 @@
 from typing import Annotated, Any
 
-from fastapi import APIRouter
+from fastapi import APIRouter, Query
 from fastapi.params import Depends
+from fastapi.responses import Response, StreamingResponse
+from pydantic import EmailStr
 
+from core.config import settings
 from helpers.auth import require_auth
 from helpers.constants import USER_CREATED_EVENT
 from helpers.events import events
-from helpers.model import APIResponse
+from helpers.model import APIError, APIResponse
 from models.users import (
     UserAuthRead,
+    UserBulkCreate,
+    UserBulkCreateResult,
+    UserBulkCreateStatus,
     UserCreate,
+    UserExportFormat,
     UserInvalidate,
     UserManage,
     UserManageAction,
     UserManageRead,
+    UserQuery,
     UserRead,
     UserRevalidate,
+    UserRole,
     UserUpdate,
     UserValidate,
 )
@@ -25,11 +34,72 @@ user_router: APIRouter = APIRouter(prefix="/api/v1/users", tags=["users"])
 user_respository: UserRespository = UserRespository()
 
 
+def respond(result: APIResponse | None) -> APIResponse | Response | None:
+    """Send trusted repository output through the fast path when enabled."""
+    if result is None or not settings.FAST_RESPONSES:
+        return result
+    return result.response()
+
+
+async def require_admin(auth: Annotated[dict[str, Any], Depends(require_auth)]):
+    result = await user_respository.get_by_email(auth["sub"])
+    if not result or not result.data or result.data.role != UserRole.ADMIN:
+        raise APIError(403, "Admin privileges required")
+    return auth
+
+
+@user_router.get(
+    "",
+    response_model=APIResponse[list[UserRead]],
+    summary="List users",
+    dependencies=[Depends(require_admin)],
+)
+async def find(
+    first_name: str | None = None,
+    last_name: str | None = None,
+    email: EmailStr | None = None,
+    cursor: str | None = None,
+    skip: Annotated[int, Query(ge=0)] = 0,
+    limit: Annotated[int, Query(ge=1, le=100)] = 20,
+    with_total: bool = False,
+):
+    query = UserQuery(first_name=first_name, last_name=last_name, email=email)
+    return respond(
+        await user_respository.find(
+            query, skip=skip, limit=limit, cursor=cursor, with_total=with_total
+        )
+    )
+
+
+@user_router.get(
+    "/export",
+    summary="Export users as NDJSON or CSV",
+    dependencies=[Depends(require_admin)],
+    response_class=StreamingResponse,
+)
+async def export(
+    format: UserExportFormat = UserExportFormat.NDJSON,
+    first_name: str | None = None,
+    last_name: str | None = None,
+    email: EmailStr | None = None,
+):
+    query = UserQuery(first_name=first_name, last_name=last_name, email=email)
+    media_type = (
+        "text/csv" if format == UserExportFormat.CSV else "application/x-ndjson"
+    )
+    return StreamingResponse(
+        user_respository.export(query, format),
+        media_type=media_type,
+        headers={"Content-Disposition": f"attachment; filename=users.{format.value}"},
+    )
+
+
 @user_router.get(
     "/account", response_model=APIResponse[UserRead], summary="Get current user info"
 )
 async def get(auth: Annotated[dict[str, Any], Depends(require_auth)]):
-    return await user_respository.get(auth["sub"])
+    # The token subject is the user's email, not their id
+    return respond(await user_respository.get_by_email(auth["sub"]))
 
 
 @user_router.patch(
@@ -38,7 +108,8 @@ async def get(auth: Annotated[dict[str, Any], Depends(require_auth)]):
 async def update(
     payload: UserUpdate, auth: Annotated[dict[str, Any], Depends(require_auth)]
 ):
-    return await user_respository.update(auth["sub"], payload)
+    user = await user_respository.get_by_email(auth["sub"])
+    return respond(await user_respository.update(user.data.id, payload))
 
 
 @user_router.post(
@@ -53,13 +124,33 @@ async def create(payload: UserCreate):
     return result
 
 
+@user_router.post(
+    "/account/bulk",
+    response_model=APIResponse[list[UserBulkCreateResult]],
+    summary="Create user accounts in bulk",
+    dependencies=[Depends(require_admin)],
+)
+async def bulk_create(payload: UserBulkCreate):
+    result = await user_respository.bulk_create(payload.users)
+    if result and result.data:
+        await events.emit_many(
+            USER_CREATED_EVENT,
+            (
+                (entry.email,)
+                for entry in result.data
+                if entry.status == UserBulkCreateStatus.CREATED
+            ),
+        )
+    return result
+
+
 @user_router.post(
     "/account/validate",
     response_model=APIResponse[UserAuthRead],
     summary="Validate user credentials",
 )
 async def validate(payload: UserValidate):
-    return await user_respository.validate(payload)
+    return respond(await user_respository.validate(payload))
 
 
 @user_router.post(
@@ -68,7 +159,7 @@ async def validate(payload: UserValidate):
     summary="Revalidate a session",
 )
 async def revalidate(payload: UserRevalidate):
-    return await user_respository.revalidate(payload)
+    return respond(await user_respository.revalidate(payload))
 
 
 @user_router.post(
@@ -9,6 +9,7 @@ from core.config import settings
 from core.database import check_database_connection, engine
 from helpers.logger import Logger
 from middlewares.log_requests import LogRequests
+from middlewares.unit_of_work import UnitOfWork
 
 logger = Logger(__name__)
 
@@ -52,6 +53,7 @@ class App:
                     },
                 ),
                 (LogRequests, {}),
+                (UnitOfWork, {}),
             ]
 
         for middleware_class, config in middlewares:
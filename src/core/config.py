@@ -18,18 +18,52 @@ class Settings(BaseSettings):
     JWT_ALGORITHM: str = "HS256"
     JWT_EXPIRE_MINUTES: int = 1440
 
+    # Password hashing settings
+    PASSWORD_HASH_EXECUTOR: str = "thread"  # "thread" or "process"
+    PASSWORD_HASH_WORKERS: int = 4
+    PASSWORD_HASH_MAX_PENDING: int = 256
+
+    # Verified access token cache (0 disables it)
+    AUTH_TOKEN_CACHE_SIZE: int = 10000
+
+    # Read-through caches
+    CACHE_BACKEND: str = "memory"  # "memory" or "redis" (adds a shared tier)
+    USER_CACHE_SIZE: int = 10000  # 0 disables the user cache
+    USER_CACHE_TTL: float = 60
+    USER_CACHE_LOCAL_TTL: float = 5  # Local tier TTL when the redis tier is used
+
     # Email settings
     SMTP_SERVER: str = ""
     SMTP_PORT: int = 0
     SMTP_USERNAME: str = ""
     SMTP_PASSWORD: str = ""
     SMTP_SENDER_EMAIL: str = ""
+    SMTP_START_TLS: bool = True
+    SMTP_POOL_SIZE: int = 4  # Persistent connections per process
+    SMTP_IDLE_TIMEOUT: float = 60  # Idle connections older than this are closed
+    SMTP_HEALTH_CHECK_INTERVAL: float = 30  # NOOP connections idle longer than this
+    SMTP_RATE_LIMIT: float = 0  # Provider quota in messages per second, 0 disables it
+    SMTP_RATE_BURST: int = 10
+
+    # Email outbox settings
+    EMAIL_DEDUP_WINDOW: int = 60  # Seconds in which a repeated email is not resent
+    EMAIL_WORKER_BATCH_SIZE: int = 50
+    EMAIL_WORKER_POLL_INTERVAL: float = 1.0
+    EMAIL_VISIBILITY_TIMEOUT: float = 300
+    EMAIL_MAX_ATTEMPTS: int = 5
+    EMAIL_RETRY_BACKOFF: float = 30  # First retry delay, doubled after each failure
+    EMAIL_RETRY_BACKOFF_MAX: float = 3600
+    EMAIL_OUTBOX_RETENTION: int = 7 * 24 * 3600  # Settled emails are kept this long
 
     # Logging settings
     LOG_DIR: str = "logs"
     LOG_FILE: str = "server.log"
     LOG_FILE_MAX_BYTES: int = 10 * 1024 * 1024  # 10MB
     LOG_FILE_BACKUP_COUNT: int = 5
+    LOG_REQUESTS_SAMPLE_RATE: float = 1.0  # Fraction of successful requests logged
+    LOG_FORMAT: str = "text"  # "text" or "json"
+    LOG_QUEUE_SIZE: int = 10000  # Records buffered before new ones are dropped
+    LOG_BATCH_SIZE: int = 100
 
     # Redis settings
     REDIS_HOST: str = ""
@@ -38,6 +72,33 @@ class Settings(BaseSettings):
     REDIS_PORT: int = 6379
     REDIS_DB: int = 0
 
+    # Token revocation settings
+    REVOCATION_BACKEND: str = "memory"  # "memory" or "redis"
+
+    # Event bus settings
+    EVENTS_TRANSPORT: str = "memory"  # "memory" or "database"
+    EVENTS_CONCURRENCY: int = 4  # Consumer tasks per process
+    EVENTS_QUEUE_SIZE: int = 10000  # 0 means unbounded
+    EVENTS_BACKPRESSURE: str = "block"  # "block", "drop" or "error" when full
+    EVENTS_POLL_INTERVAL: float = 0.5
+    EVENTS_VISIBILITY_TIMEOUT: float = 300
+    EVENTS_DEFER_DELAY: float = 0.05  # Requeue delay when an event's limit is hit
+    EVENTS_LISTENER_THREADS: int = 8  # Threads running synchronous listeners
+    EVENTS_LISTENER_PROCESSES: int = 2  # Processes for executor="process" listeners
+    EVENTS_LISTENER_MAX_PENDING: int = 1000
+    EVENTS_LISTENER_TIMEOUT: float = 0  # Default per-attempt timeout, 0 disables it
+    # Timed-out thread listener calls left running before further timed-out
+    # listeners are given up rather than retried
+    EVENTS_LISTENER_MAX_OVERRUNS: int = 4
+
+    # Internal endpoints (metrics); when set, requests need X-Internal-Token.
+    # Without a token they are refused in production and open elsewhere
+    INTERNAL_API_TOKEN: str = ""
+
+    # Serialize trusted repository responses straight to JSON bytes, skipping
+    # FastAPI's response_model validation pass
+    FAST_RESPONSES: bool = False
+
     # CORS settings
     CORS_ORIGINS: str = "*"  # Comma-separated list of allowed origins
 
@@ -49,10 +110,22 @@ class Settings(BaseSettings):
     POSTGRESQL_DB: str = "fastapi"
     POSTGRESQL_POOL_SIZE: int = 5
     POSTGRESQL_MAX_OVERFLOW: int = 10
+    POSTGRESQL_POOL_TIMEOUT: float = 30  # Seconds to wait for a free connection
+    POSTGRESQL_POOL_RECYCLE: int = 300  # Reopen connections older than this
+    POSTGRESQL_POOL_USE_LIFO: bool = True  # Reuse warm connections first
+    POSTGRESQL_POOL_PING_AFTER_IDLE: float = 30  # Ping on checkout after this idle
+    POSTGRESQL_QUERY_CACHE_SIZE: int = 1200  # Compiled statements kept per engine
+    # Executions before psycopg prepares a statement server-side; -1 disables
+    # prepared statements (e.g. behind a transaction-mode pgbouncer)
+    POSTGRESQL_PREPARE_THRESHOLD: int = 5
 
-    @computed_field
-    @property
-    def POSTGRES_URI(self) -> MultiHostUrl:
+    # Read replicas: comma-separated host[:port] list; empty sends all reads to
+    # the primary
+    POSTGRESQL_REPLICA_HOSTS: str = ""
+    POSTGRESQL_REPLICA_BALANCING: str = "round-robin"  # or "least-connections"
+    POSTGRESQL_READ_YOUR_WRITES: float = 5  # Seconds written rows read from primary
+
+    def _postgres_uri(self, host: str, port: int) -> MultiHostUrl:
         if (
             self.ENV == "production"
             and self.POSTGRESQL_USER
@@ -63,19 +136,46 @@ class Settings(BaseSettings):
                 scheme="postgresql+psycopg",
                 username=self.POSTGRESQL_USER,
                 password=self.POSTGRESQL_PASSWORD,
-                host=self.POSTGRESQL_HOST,
-                port=self.POSTGRESQL_PORT,
+                host=host,
+                port=port,
                 path=self.POSTGRESQL_DB,
             )
         else:
             # In development, skip username/password and connect via local peer
             return MultiHostUrl.build(
                 scheme="postgresql+psycopg",
-                host=self.POSTGRESQL_HOST,
-                port=self.POSTGRESQL_PORT,
+                host=host,
+                port=port,
                 path=self.POSTGRESQL_DB,
             )
 
+    @computed_field
+    @property
+    def POSTGRES_URI(self) -> MultiHostUrl:
+        return self._postgres_uri(self.POSTGRESQL_HOST, self.POSTGRESQL_PORT)
+
+    @computed_field
+    @property
+    def POSTGRES_REPLICA_URIS(self) -> list[MultiHostUrl]:
+        uris = []
+        for replica in self.POSTGRESQL_REPLICA_HOSTS.split(","):
+            host, _, port = replica.strip().partition(":")
+            if host:
+                uris.append(self._postgres_uri(host, int(port or self.POSTGRESQL_PORT)))
+        return uris
+
+    @computed_field
+    @property
+    def REDIS_URI(self) -> MultiHostUrl:
+        return MultiHostUrl.build(
+            scheme="redis",
+            username=self.REDIS_USER or None,
+            password=self.REDIS_PASSWORD or None,
+            host=self.REDIS_HOST or "localhost",
+            port=self.REDIS_PORT,
+            path=str(self.REDIS_DB),
+        )
+
     class Config:
         env_file = ".env"
         case_sensitive = True
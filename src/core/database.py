@@ -1,37 +1,314 @@
+import heapq
+import itertools
 import logging
+import time
+from collections.abc import Callable, Hashable, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any
 
+from sqlalchemy import event, exc
 from sqlalchemy.ext.asyncio import (
     AsyncEngine,
     AsyncSession,
     async_sessionmaker,
     create_async_engine,
 )
+from sqlalchemy.orm import ORMExecuteState, Session
+from sqlalchemy.pool import AsyncAdaptedQueuePool, ConnectionPoolEntry
 from sqlmodel import select
 from tenacity import after_log, before_log, retry, stop_after_attempt, wait_fixed
 
 from core.config import settings
 from helpers.logger import Logger
+from helpers.metrics import registry
 
 logger = Logger(__name__)
 
 DATABASE_URI = str(settings.POSTGRES_URI)
 
-# Create async engine with connection pooling
-engine = create_async_engine(
-    DATABASE_URI,
-    pool_size=5,
-    max_overflow=10,
-    pool_pre_ping=True,
-    pool_recycle=300,
-    connect_args={"check_same_thread": False} if "sqlite" in DATABASE_URI else {},
-    echo=False,
+REPLICA_BALANCING = ("round-robin", "least-connections")
+
+pool_checkout_seconds = registry.histogram(
+    "db_pool_checkout_seconds",
+    "Time spent waiting for a pooled database connection",
+    ("pool",),
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 5),
+)
+pool_timeouts = registry.counter(
+    "db_pool_timeouts_total",
+    "Checkouts that gave up waiting for a connection",
+    ("pool",),
+)
+pool_liveness_checks = registry.counter(
+    "db_pool_liveness_checks_total",
+    "Pings of connections that sat idle in the pool, by result",
+    ("pool", "result"),
 )
 
+
+class InstrumentedQueuePool(AsyncAdaptedQueuePool):
+    """Queue pool that records how long each checkout waited."""
+
+    # Log under SQLAlchemy's pool logger rather than this module's
+    _sqla_logger_namespace = "sqlalchemy.pool.impl.AsyncAdaptedQueuePool"
+
+    def _do_get(self) -> ConnectionPoolEntry:
+        started = time.perf_counter()
+        labels = (self.logging_name or "",)
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            pool_timeouts.inc(labels)
+            raise
+        finally:
+            pool_checkout_seconds.observe(labels, time.perf_counter() - started)
+
+
+def _connect_args(uri: str) -> dict[str, Any]:
+    if "sqlite" in uri:
+        return {"check_same_thread": False}
+    threshold = settings.POSTGRESQL_PREPARE_THRESHOLD
+    return {"prepare_threshold": threshold if threshold >= 0 else None}
+
+
+def create_pooled_engine(uri: str, name: str) -> AsyncEngine:
+    """Create an async engine whose pool is configured and instrumented.
+
+    `name` labels the pool's metrics, e.g. "primary" or "replica-0".
+    """
+    db_engine = create_async_engine(
+        uri,
+        poolclass=InstrumentedQueuePool,
+        pool_logging_name=name,
+        pool_size=settings.POSTGRESQL_POOL_SIZE,
+        max_overflow=settings.POSTGRESQL_MAX_OVERFLOW,
+        pool_timeout=settings.POSTGRESQL_POOL_TIMEOUT,
+        pool_recycle=settings.POSTGRESQL_POOL_RECYCLE,
+        pool_use_lifo=settings.POSTGRESQL_POOL_USE_LIFO,
+        query_cache_size=settings.POSTGRESQL_QUERY_CACHE_SIZE,
+        connect_args=_connect_args(uri),
+        echo=False,
+    )
+
+    @event.listens_for(db_engine.sync_engine, "checkin")
+    def on_checkin(dbapi_connection: Any, record: ConnectionPoolEntry):  # noqa: ARG001
+        record.info["checked_in_at"] = time.monotonic()
+
+    @event.listens_for(db_engine.sync_engine, "checkout")
+    def on_checkout(
+        dbapi_connection: Any,
+        record: ConnectionPoolEntry,
+        proxy: Any,  # noqa: ARG001
+    ):
+        """Ping a connection only if it sat idle long enough to have gone stale.
+
+        Unlike `pool_pre_ping`, connections handed straight back out of a busy
+        pool skip the round-trip. A failed ping makes the pool retry with a
+        fresh connection.
+        """
+        checked_in_at = record.info.pop("checked_in_at", None)
+        idle_limit = settings.POSTGRESQL_POOL_PING_AFTER_IDLE
+        if checked_in_at is None or time.monotonic() - checked_in_at < idle_limit:
+            return
+        try:
+            db_engine.dialect.do_ping(dbapi_connection)
+        except Exception as e:
+            pool_liveness_checks.inc((name, "failure"))
+            logger.warning(f"Discarding stale {name} database connection: {e}")
+            raise exc.DisconnectionError() from e
+        pool_liveness_checks.inc((name, "success"))
+
+    _engines.append((name, db_engine))
+    return db_engine
+
+
+# Engines built by `create_pooled_engine`, reported on the metrics endpoint
+_engines: list[tuple[str, AsyncEngine]] = []
+
+
+def _pool_samples(value: Callable[[AsyncAdaptedQueuePool], float]):
+    return [
+        ((name,), value(db_engine.pool))
+        for name, db_engine in _engines
+        if isinstance(db_engine.pool, AsyncAdaptedQueuePool)
+    ]
+
+
+registry.gauge(
+    "db_pool_size",
+    "Connections the pool keeps open",
+    lambda: _pool_samples(lambda pool: pool.size()),
+    ("pool",),
+)
+registry.gauge(
+    "db_pool_checked_out",
+    "Connections currently checked out of the pool",
+    lambda: _pool_samples(lambda pool: pool.checkedout()),
+    ("pool",),
+)
+registry.gauge(
+    "db_pool_overflow",
+    "Connections open beyond the pool size (negative while below it)",
+    lambda: _pool_samples(lambda pool: pool.overflow()),
+    ("pool",),
+)
+
+
+class SessionRouter:
+    """Hand out sessions on the primary or, for read-only work, a replica.
+
+    Replicas are picked round-robin or by fewest checked-out connections.
+    Reads still go to the primary while they could miss a recent write: for
+    the rest of the `unit_of_work` (a request or an event) that committed one,
+    and for `read_your_writes` seconds for keys passed to `mark_written`.
+    """
+
+    def __init__(
+        self,
+        primary: async_sessionmaker[AsyncSession],
+        replicas: list[tuple[AsyncEngine, async_sessionmaker[AsyncSession]]],
+        balancing: str = "round-robin",
+        read_your_writes: float = 5,
+    ):
+        if balancing not in REPLICA_BALANCING:
+            raise ValueError(f"Unsupported replica balancing: {balancing}")
+        self.primary = primary
+        self.replicas = replicas
+        self.balancing = balancing
+        self.read_your_writes = read_your_writes
+        self._next = 0
+        self._written: dict[Hashable, float] = {}
+        # Pins ordered by expiry; the counter breaks ties, since keys of
+        # different types do not compare
+        self._expiries: list[tuple[float, int, Hashable]] = []
+        self._order = itertools.count()
+        # None outside a unit of work, so long-lived tasks such as consumers
+        # and workers are never pinned to the primary for good
+        self._unit_wrote: ContextVar[bool | None] = ContextVar(
+            "session_router_unit_wrote", default=None
+        )
+
+    @contextmanager
+    def unit_of_work(self) -> Iterator[None]:
+        """Scope "this work wrote" stickiness to the enclosed block."""
+        token = self._unit_wrote.set(False)
+        try:
+            yield
+        finally:
+            self._unit_wrote.reset(token)
+
+    def mark_written(self, *keys: Hashable):
+        """Keep reads of `keys`, and of this unit of work, on the primary."""
+        if self._unit_wrote.get() is not None:
+            self._unit_wrote.set(True)
+        if not self.replicas or self.read_your_writes <= 0:
+            return
+        now = time.monotonic()
+        self._unpin_expired(now)
+        until = now + self.read_your_writes
+        for key in keys:
+            self._written[key] = until
+            heapq.heappush(self._expiries, (until, next(self._order), key))
+
+    def _unpin_expired(self, now: float):
+        while self._expiries and self._expiries[0][0] <= now:
+            until, _, key = heapq.heappop(self._expiries)
+            # A key written again since has a later entry still in the heap
+            if self._written.get(key) == until:
+                del self._written[key]
+
+    def _pinned(self, key: Hashable | None) -> bool:
+        if self._unit_wrote.get():
+            return True
+        if key is None:
+            return False
+        until = self._written.get(key)
+        if until is None:
+            return False
+        if until <= time.monotonic():
+            self._written.pop(key, None)
+            return False
+        return True
+
+    def _pick_replica(self) -> async_sessionmaker[AsyncSession]:
+        start = self._next % len(self.replicas)
+        self._next += 1
+        if self.balancing == "least-connections":
+            # Scanning from a rotating start spreads ties across replicas
+            candidates = self.replicas[start:] + self.replicas[:start]
+            _, factory = min(
+                candidates, key=lambda replica: replica[0].pool.checkedout()
+            )
+            return factory
+        _, factory = self.replicas[start]
+        return factory
+
+    def session(self, readonly: bool = False, key: Hashable | None = None):
+        """Open a session; `key` names what a read-only unit of work reads."""
+        if readonly and self.replicas and not self._pinned(key):
+            return self._pick_replica()()
+        return self.primary()
+
+
+class PrimarySession(AsyncSession):
+    """Primary session that tells the router when it commits a write."""
+
+    async def commit(self):
+        await super().commit()
+        if self.info.pop("wrote", False):
+            router.mark_written()
+
+
+class _WriteTrackingSession(Session):
+    """Sync side of `PrimarySession`; its events flag sessions that wrote."""
+
+
+@event.listens_for(_WriteTrackingSession, "after_flush")
+def _on_flush(session: Session, flush_context: Any):  # noqa: ARG001
+    session.info["wrote"] = True
+
+
+@event.listens_for(_WriteTrackingSession, "do_orm_execute")
+def _on_execute(state: ORMExecuteState):
+    if state.is_insert or state.is_update or state.is_delete:
+        state.session.info["wrote"] = True
+
+
+@event.listens_for(_WriteTrackingSession, "after_rollback")
+def _on_rollback(session: Session):
+    session.info.pop("wrote", None)
+
+
+# Create async engine with connection pooling
+engine = create_pooled_engine(DATABASE_URI, "primary")
+
 # Create async session factory
 SessionFactory = async_sessionmaker(
     bind=engine,
     expire_on_commit=False,
-    class_=AsyncSession,
+    class_=PrimarySession,
+    sync_session_class=_WriteTrackingSession,
+)
+
+replica_engines = [
+    create_pooled_engine(str(uri), f"replica-{index}")
+    for index, uri in enumerate(settings.POSTGRES_REPLICA_URIS)
+]
+
+router = SessionRouter(
+    SessionFactory,
+    [
+        (
+            replica,
+            async_sessionmaker(
+                bind=replica, expire_on_commit=False, class_=AsyncSession
+            ),
+        )
+        for replica in replica_engines
+    ],
+    balancing=settings.POSTGRESQL_REPLICA_BALANCING,
+    read_your_writes=settings.POSTGRESQL_READ_YOUR_WRITES,
 )
 
 max_tries = 60 * 5
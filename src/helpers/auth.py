@@ -1,5 +1,9 @@
+import asyncio
+import hashlib
 import secrets
+import time
 import uuid
+from collections.abc import Sequence
 from datetime import datetime, timedelta, timezone
 from typing import Any
 
@@ -10,7 +14,14 @@ from jwt.exceptions import ExpiredSignatureError, InvalidTokenError
 from passlib.context import CryptContext
 
 from core.config import settings
+from helpers.cache import TTLCache
+from helpers.executor import BoundedExecutor, ExecutorSaturatedError
 from helpers.model import APIError
+from helpers.revocation import (
+    RevocationStore,
+    RevocationStoreError,
+    create_revocation_store,
+)
 
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_HOURS = 1
@@ -19,7 +30,16 @@ REFRESH_TOKEN_MAX_DAYS = 7
 
 security = HTTPBearer(auto_error=False)
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
-token_blacklist: set[str] = set()
+revocation_store: RevocationStore = create_revocation_store()
+access_token_cache: TTLCache[bytes, dict[str, Any]] = TTLCache(
+    max_size=settings.AUTH_TOKEN_CACHE_SIZE
+)
+password_executor = BoundedExecutor(
+    max_workers=settings.PASSWORD_HASH_WORKERS,
+    max_pending=settings.PASSWORD_HASH_MAX_PENDING,
+    mode=settings.PASSWORD_HASH_EXECUTOR,
+    name="password-hash",
+)
 
 
 def create_one_time_password() -> str:
@@ -35,6 +55,52 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
 
 
+async def hash_password_async(password: str) -> str:
+    """Hash a password on the password executor instead of the event loop."""
+    try:
+        return await password_executor.run(hash_password, password)
+    except ExecutorSaturatedError:
+        raise APIError(503, "Server is busy, please try again later")
+
+
+def _hash_passwords(passwords: Sequence[str]) -> list[str]:
+    return [hash_password(password) for password in passwords]
+
+
+async def hash_passwords_async(
+    passwords: Sequence[str], chunk_size: int = 8
+) -> list[str]:
+    """Hash many passwords in parallel on the password executor.
+
+    Work is submitted in chunks to at most half of the executor's workers, so
+    interactive logins keep capacity while a bulk import is running.
+    """
+    limit = asyncio.Semaphore(max(1, password_executor.max_workers // 2))
+
+    async def hash_chunk(chunk: Sequence[str]) -> list[str]:
+        async with limit:
+            try:
+                return await password_executor.run(_hash_passwords, chunk)
+            except ExecutorSaturatedError:
+                raise APIError(503, "Server is busy, please try again later")
+
+    chunks = [
+        passwords[i : i + chunk_size] for i in range(0, len(passwords), chunk_size)
+    ]
+    results = await asyncio.gather(*(hash_chunk(chunk) for chunk in chunks))
+    return [hashed for chunk in results for hashed in chunk]
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """Verify a password on the password executor instead of the event loop."""
+    try:
+        return await password_executor.run(
+            verify_password, plain_password, hashed_password
+        )
+    except ExecutorSaturatedError:
+        raise APIError(503, "Server is busy, please try again later")
+
+
 def create_access_token(
     subject: str | Any,
     expires_delta: timedelta = timedelta(hours=ACCESS_TOKEN_EXPIRE_HOURS),
@@ -93,14 +159,40 @@ def verify_access_token(token: str) -> dict[str, Any]:
         raise ValueError(401, f"Token validation failed: {str(e)}")
 
 
-def verify_refresh_token(token: str) -> dict[str, Any]:
+async def revoke_token(payload: dict[str, Any]) -> bool:
+    """Revoke a decoded token until it expires.
+
+    Returns False if the token had no `jti` or was already revoked.
+    """
+    jti = payload.get("jti")
+    if not jti:
+        return False
+    exp = payload.get("exp") or time.time() + REFRESH_TOKEN_MAX_DAYS * 86400
+    try:
+        return await revocation_store.revoke(jti, float(exp))
+    except RevocationStoreError:
+        raise APIError(503, "Authentication is temporarily unavailable")
+
+
+async def is_token_revoked(jti: str) -> bool:
+    """Check `jti` against the revocation store.
+
+    Fails closed: while the store cannot be reached, no token is accepted.
+    """
+    try:
+        return await revocation_store.is_revoked(jti)
+    except RevocationStoreError:
+        raise APIError(503, "Authentication is temporarily unavailable")
+
+
+async def verify_refresh_token(token: str) -> dict[str, Any]:
     try:
         payload = jwt.decode(token, settings.JWT_SECRET, algorithms=[ALGORITHM])
         if payload.get("type") != "refresh":
             raise APIError(401, "Invalid token type")
 
         jti = payload.get("jti")
-        if not jti or jti in token_blacklist:
+        if not jti or await is_token_revoked(jti):
             raise APIError(401, "Refresh token is revoked or reused")
 
         refresh_exp = payload.get("refresh_exp")
@@ -114,12 +206,12 @@ def verify_refresh_token(token: str) -> dict[str, Any]:
         raise APIError(401, "Invalid or expired refresh token")
 
 
-def rotate_refresh_token(old_token: str) -> tuple[str, str]:
-    payload = verify_refresh_token(old_token)
+async def rotate_refresh_token(old_token: str) -> tuple[str, str]:
+    payload = await verify_refresh_token(old_token)
 
-    old_jti = payload.get("jti")
-    if old_jti:
-        token_blacklist.add(old_jti)
+    # Revocation is atomic, so only one of several concurrent rotations wins
+    if not await revoke_token(payload):
+        raise APIError(401, "Refresh token is revoked or reused")
 
     new_access_token = create_access_token(payload["sub"])
     new_refresh_token = create_refresh_token(payload["sub"])
@@ -127,16 +219,25 @@ def rotate_refresh_token(old_token: str) -> tuple[str, str]:
     return new_access_token, new_refresh_token
 
 
-def require_auth(token: HTTPAuthorizationCredentials = Security(security)):
+async def require_auth(token: HTTPAuthorizationCredentials = Security(security)):
     if not token or not token.credentials:
         raise APIError(401, "Missing Authorization token")
 
-    raw_token = token.credentials
-
-    if raw_token in token_blacklist:
+    # Verified claims are cached by token digest until the token's own expiry,
+    # so repeat requests skip signature checks; revocation is still checked
+    # on every request and evicts the cached entry.
+    cache_key = hashlib.blake2b(token.credentials.encode(), digest_size=16).digest()
+    payload = access_token_cache.get(cache_key)
+    if payload is None:
+        try:
+            payload = verify_access_token(token.credentials)
+        except Exception as e:
+            raise APIError(401, f"Unauthorized: {str(e)}")
+        access_token_cache.set(cache_key, payload, expires_at=payload.get("exp"))
+
+    jti = payload.get("jti")
+    if jti and await is_token_revoked(jti):
+        access_token_cache.delete(cache_key)
         raise APIError(401, "Token has been revoked or reused")
 
-    try:
-        return verify_access_token(raw_token)
-    except Exception as e:
-        raise APIError(401, f"Unauthorized: {str(e)}")
+    return payload
@@ -0,0 +1,283 @@
+import asyncio
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable, Hashable, Iterable
+from typing import Any, Generic, TypeVar
+
+from core.config import settings
+from helpers.logger import Logger
+from helpers.metrics import registry
+
+logger = Logger(__name__)
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+class TTLCache(Generic[K, V]):
+    """Size-bounded LRU cache whose entries also expire at a wall-clock time.
+
+    Each entry either carries its own absolute expiry (epoch seconds) or falls
+    back to the cache-wide `ttl`. Once `max_size` is reached the least recently
+    used entry is evicted. Not thread-safe; meant for use on the event loop.
+    """
+
+    def __init__(self, max_size: int, ttl: float | None = None):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._data: OrderedDict[K, tuple[V, float | None]] = OrderedDict()
+
+    def get(self, key: K) -> V | None:
+        entry = self._data.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        value, expires_at = entry
+        if expires_at is not None and expires_at <= time.time():
+            del self._data[key]
+            self.misses += 1
+            return None
+
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key: K, value: V, expires_at: float | None = None):
+        if self.max_size <= 0:
+            return
+        if expires_at is None and self.ttl is not None:
+            expires_at = time.time() + self.ttl
+
+        self._data[key] = (value, expires_at)
+        self._data.move_to_end(key)
+        while len(self._data) > self.max_size:
+            self._data.popitem(last=False)
+
+    def delete(self, key: K):
+        self._data.pop(key, None)
+
+    def clear(self):
+        self._data.clear()
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "size": len(self._data),
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+class RedisCache:
+    """Shared cache tier: byte values under prefixed keys with a fixed TTL.
+
+    Failures are logged and treated as misses, so an unavailable Redis only
+    costs the database round-trips the cache would have saved.
+    """
+
+    def __init__(self, url: str, prefix: str, ttl: float):
+        try:
+            from redis import asyncio as redis
+        except ImportError as e:
+            raise RuntimeError(
+                "The redis cache tier requires the 'redis' package"
+            ) from e
+
+        self._client: Any = redis.from_url(url)
+        self._prefix = prefix
+        self.ttl = max(int(ttl), 1)
+
+    async def get(self, key: str) -> bytes | None:
+        try:
+            return await self._client.get(f"{self._prefix}{key}")
+        except Exception as e:
+            logger.warning(f"Cache read failed for {key}: {e}")
+            return None
+
+    async def set(self, keys: Iterable[str], value: bytes):
+        try:
+            async with self._client.pipeline(transaction=False) as pipe:
+                for key in keys:
+                    pipe.set(f"{self._prefix}{key}", value, ex=self.ttl)
+                await pipe.execute()
+        except Exception as e:
+            logger.warning(f"Cache write failed: {e}")
+
+    async def delete(self, keys: Iterable[str]):
+        keys = [f"{self._prefix}{key}" for key in keys]
+        try:
+            await self._client.delete(*keys)
+        except Exception as e:
+            logger.warning(f"Cache invalidation failed: {e}")
+
+    async def close(self):
+        await self._client.aclose()
+
+
+class ReadThroughCache(Generic[V]):
+    """Read-through cache with a local LRU tier and an optional Redis tier.
+
+    A value is stored under every key returned by `keys(value)` (for example
+    by id and by email), so a lookup through any of them is a hit and one
+    `invalidate` call drops them all. Concurrent misses on the same key share
+    a single load. With Redis, keep the local `ttl` short: it bounds how long
+    another worker may serve a value after it was invalidated elsewhere.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        keys: Callable[[V], Iterable[str]],
+        dumps: Callable[[V], bytes],
+        loads: Callable[[bytes], V],
+        max_size: int,
+        ttl: float,
+        remote: RedisCache | None = None,
+    ):
+        self.name = name
+        self.keys = keys
+        self.dumps = dumps
+        self.loads = loads
+        self.local: TTLCache[str, V] = TTLCache(max_size, ttl)
+        self.remote = remote
+        self.enabled = max_size > 0
+        self._loading: dict[str, asyncio.Future[V | None]] = {}
+        # Bumped by every invalidation, so a load that raced one is not stored
+        self._generation = 0
+
+    async def get(
+        self, key: str, loader: Callable[[], Awaitable[V | None]]
+    ) -> V | None:
+        """Return the cached value for `key`, calling `loader` on a miss."""
+        if not self.enabled:
+            return await loader()
+
+        value = self.local.get(key)
+        if value is not None:
+            cache_requests.inc((self.name, "local_hit"))
+            return value
+
+        if self.remote is not None:
+            raw = await self.remote.get(key)
+            if raw is not None:
+                value = self.loads(raw)
+                self._store_local(value)
+                cache_requests.inc((self.name, "remote_hit"))
+                return value
+
+        cache_requests.inc((self.name, "miss"))
+        while (pending := self._loading.get(key)) is not None:
+            try:
+                return await asyncio.shield(pending)
+            except asyncio.CancelledError:
+                if not pending.cancelled():
+                    raise
+                # The caller running the load was cancelled; take it over
+
+        future: asyncio.Future[V | None] = asyncio.get_running_loop().create_future()
+        self._loading[key] = future
+        generation = self._generation
+        try:
+            value = await loader()
+            if value is not None and generation == self._generation:
+                await self.set(value)
+            future.set_result(value)
+            return value
+        except Exception as e:
+            future.set_exception(e)
+            # Waiters receive the error; retrieve it so it is not reported twice
+            future.exception()
+            raise
+        except BaseException:
+            # Cancelled: not a failed load, so a waiter retries it instead
+            future.cancel()
+            raise
+        finally:
+            del self._loading[key]
+
+    def _store_local(self, value: V):
+        for key in self.keys(value):
+            self.local.set(key, value)
+
+    async def set(self, value: V):
+        if not self.enabled:
+            return
+        self._store_local(value)
+        if self.remote is not None:
+            await self.remote.set(self.keys(value), self.dumps(value))
+
+    async def invalidate(self, *keys: str):
+        """Drop `keys` from every tier (call after the write has committed)."""
+        if not self.enabled:
+            return
+        self._generation += 1
+        for key in keys:
+            self.local.delete(key)
+        if self.remote is not None:
+            await self.remote.delete(keys)
+
+    def hit_ratio(self) -> float:
+        hits = cache_requests.value((self.name, "local_hit")) + cache_requests.value(
+            (self.name, "remote_hit")
+        )
+        total = hits + cache_requests.value((self.name, "miss"))
+        return hits / total if total else 0.0
+
+    async def close(self):
+        if self.remote is not None:
+            await self.remote.close()
+
+
+def create_read_through_cache(
+    name: str,
+    keys: Callable[[V], Iterable[str]],
+    dumps: Callable[[V], bytes],
+    loads: Callable[[bytes], V],
+    max_size: int,
+    ttl: float,
+    local_ttl: float,
+) -> ReadThroughCache[V]:
+    """Build a read-through cache with the tiers selected by `CACHE_BACKEND`."""
+    backend = settings.CACHE_BACKEND.lower()
+    if backend == "redis":
+        remote = RedisCache(str(settings.REDIS_URI), f"cache:{name}:", ttl)
+        cache = ReadThroughCache(
+            name, keys, dumps, loads, max_size, local_ttl, remote=remote
+        )
+    elif backend == "memory":
+        cache = ReadThroughCache(name, keys, dumps, loads, max_size, ttl)
+    else:
+        raise ValueError(f"Unsupported cache backend: {settings.CACHE_BACKEND}")
+    _caches.append(cache)
+    return cache
+
+
+async def close_caches():
+    for cache in _caches:
+        await cache.close()
+
+
+# Caches built by `create_read_through_cache`, reported on the metrics endpoint
+_caches: list[ReadThroughCache] = []
+
+cache_requests = registry.counter(
+    "cache_requests_total", "Cache lookups by result", ("cache", "result")
+)
+registry.gauge(
+    "cache_hit_ratio",
+    "Share of cache lookups served without loading the value",
+    lambda: [((cache.name,), cache.hit_ratio()) for cache in _caches],
+    ("cache",),
+)
+registry.gauge(
+    "cache_entries",
+    "Keys held in the local cache tier",
+    lambda: [((cache.name,), len(cache.local)) for cache in _caches],
+    ("cache",),
+)
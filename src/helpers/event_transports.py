@@ -0,0 +1,349 @@
+import asyncio
+import time
+import uuid
+from abc import ABC, abstractmethod
+from collections.abc import Sequence
+from datetime import timedelta
+from typing import Any
+
+from sqlalchemy import delete, func, or_, select, update
+
+from core.config import settings
+from core.database import SessionFactory
+from helpers.logger import Logger
+from helpers.model import utc_now
+from models.events import EventOutbox
+
+logger = Logger(__name__)
+
+BACKPRESSURE_POLICIES = ("block", "drop", "error")
+
+
+class EventQueueFullError(RuntimeError):
+    """Raised by `emit` when the queue is full and the policy is `error`."""
+
+
+class EventEnvelope:
+    def __init__(
+        self,
+        event: str,
+        args: Sequence[Any] = (),
+        kwargs: dict[str, Any] | None = None,
+        id: uuid.UUID | None = None,
+        listener: str | None = None,
+        attempt: int = 1,
+        enqueued_at: float | None = None,
+    ):
+        self.id = id or uuid.uuid4()
+        self.event = event
+        self.args = tuple(args)
+        self.kwargs = kwargs or {}
+        # Retries target the single listener that failed, by its registration key
+        self.listener = listener
+        self.attempt = attempt
+        # Epoch seconds at which the envelope became deliverable, for lag metrics
+        self.enqueued_at = enqueued_at or time.time()
+
+    def to_payload(self) -> dict[str, Any]:
+        return {
+            "args": list(self.args),
+            "kwargs": self.kwargs,
+            "listener": self.listener,
+            "attempt": self.attempt,
+        }
+
+    @classmethod
+    def from_payload(
+        cls,
+        event: str,
+        payload: dict[str, Any],
+        id: uuid.UUID | None = None,
+        enqueued_at: float | None = None,
+    ) -> "EventEnvelope":
+        return cls(
+            event,
+            payload.get("args", ()),
+            payload.get("kwargs", {}),
+            id=id,
+            listener=payload.get("listener"),
+            attempt=payload.get("attempt", 1),
+            enqueued_at=enqueued_at,
+        )
+
+    def __repr__(self):
+        return f"<EventEnvelope {self.event} {self.id}>"
+
+
+class EventTransport(ABC):
+    """Queue that carries events from `emit` to the consumer tasks.
+
+    Consumers `get` an envelope, run its listeners and then `ack` it; an
+    envelope that is never acknowledged may be delivered again.
+    """
+
+    def __init__(self, max_size: int = 0, backpressure: str = "block"):
+        if backpressure not in BACKPRESSURE_POLICIES:
+            raise ValueError(f"Unsupported backpressure policy: {backpressure}")
+        self.max_size = max_size
+        self.backpressure = backpressure
+        self.dropped = 0
+
+    @abstractmethod
+    async def put(self, envelopes: Sequence[EventEnvelope], delay: float = 0) -> None:
+        """Enqueue envelopes, applying the backpressure policy when full.
+
+        With a `delay` the envelopes only become available after that many
+        seconds; delayed envelopes are retries and bypass the policy.
+        """
+
+    @abstractmethod
+    async def get(self) -> EventEnvelope:
+        """Wait for and claim the next envelope."""
+
+    @abstractmethod
+    async def ack(self, envelope: EventEnvelope) -> None:
+        """Mark an envelope as fully processed."""
+
+    @abstractmethod
+    async def nack(self, envelope: EventEnvelope, delay: float = 0) -> None:
+        """Release an envelope for redelivery after `delay` seconds."""
+
+    @abstractmethod
+    def qsize(self) -> int:
+        """Approximate number of envelopes waiting to be processed."""
+
+    async def close(self) -> None:  # noqa: B027
+        """Release any resources held by the transport."""
+
+    def _reject(self, count: int) -> None:
+        if self.backpressure == "error":
+            raise EventQueueFullError(f"Event queue is full ({self.max_size})")
+        self.dropped += count
+        logger.warning(f"Event queue is full, dropped {count} event(s)")
+
+
+class MemoryEventTransport(EventTransport):
+    """Process-local transport on a bounded `asyncio.Queue`.
+
+    Delayed envelopes wait on the event loop's timer heap rather than in the
+    queue, so they never occupy a consumer while backing off.
+    """
+
+    def __init__(self, max_size: int = 0, backpressure: str = "block"):
+        super().__init__(max_size, backpressure)
+        self._queue: asyncio.Queue[EventEnvelope] = asyncio.Queue(maxsize=max_size)
+        self._delayed: set[asyncio.Task] = set()
+
+    async def put(self, envelopes: Sequence[EventEnvelope], delay: float = 0) -> None:
+        if delay > 0:
+            self._put_in_background(envelopes, delay)
+            return
+
+        for index, envelope in enumerate(envelopes):
+            if self.backpressure == "block":
+                await self._queue.put(envelope)
+                continue
+            try:
+                self._queue.put_nowait(envelope)
+            except asyncio.QueueFull:
+                self._reject(len(envelopes) - index)
+                return
+
+    def _put_in_background(self, envelopes: Sequence[EventEnvelope], delay: float):
+        task = asyncio.create_task(self._put_later(envelopes, delay))
+        self._delayed.add(task)
+        task.add_done_callback(self._delayed.discard)
+
+    async def _put_later(self, envelopes: Sequence[EventEnvelope], delay: float):
+        await asyncio.sleep(delay)
+        for envelope in envelopes:
+            envelope.enqueued_at = time.time()
+            await self._queue.put(envelope)
+
+    async def get(self) -> EventEnvelope:
+        return await self._queue.get()
+
+    async def ack(self, envelope: EventEnvelope) -> None:
+        self._queue.task_done()
+
+    async def nack(self, envelope: EventEnvelope, delay: float = 0) -> None:
+        self._queue.task_done()
+        # Never wait for room here: the consumers releasing envelopes are the
+        # ones that would have to make it
+        self._put_in_background([envelope], delay)
+
+    def qsize(self) -> int:
+        return self._queue.qsize()
+
+    def delayed(self) -> int:
+        return len(self._delayed)
+
+    async def close(self) -> None:
+        for task in self._delayed:
+            task.cancel()
+        self._delayed.clear()
+
+
+class DatabaseEventTransport(EventTransport):
+    """Durable transport backed by the `event_outbox` table.
+
+    Rows are claimed in batches with `FOR UPDATE SKIP LOCKED`, so any number of
+    consumers across workers can share the table. A claimed row is hidden for
+    `visibility_timeout` seconds and reappears if its consumer dies before
+    acknowledging it. Event arguments must be JSON-serializable.
+
+    `put` commits in its own session, so delivery is not transactional with
+    the write that caused the event: emit after that write has committed, and
+    expect the event to be lost if the process dies in between.
+    """
+
+    def __init__(
+        self,
+        max_size: int = 0,
+        backpressure: str = "block",
+        batch_size: int = 100,
+        poll_interval: float = 0.5,
+        visibility_timeout: float = 300,
+    ):
+        super().__init__(max_size, backpressure)
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+        self.visibility_timeout = visibility_timeout
+        self._buffer: asyncio.Queue[EventEnvelope] = asyncio.Queue()
+        self._claim_lock = asyncio.Lock()
+        self._wakeup = asyncio.Event()
+        self._depth = 0
+        self._depth_checked_at = 0.0
+
+    async def _refresh_depth(self) -> int:
+        # Counting rows is not free, so the depth is refreshed at most once a second
+        now = time.monotonic()
+        if now - self._depth_checked_at >= 1:
+            async with SessionFactory() as db:
+                result = await db.execute(select(func.count()).select_from(EventOutbox))
+                self._depth = result.scalar_one()
+            self._depth_checked_at = now
+        return self._depth
+
+    async def put(self, envelopes: Sequence[EventEnvelope], delay: float = 0) -> None:
+        if self.max_size and delay <= 0:
+            while await self._refresh_depth() + len(envelopes) > self.max_size:
+                if self.backpressure != "block":
+                    self._reject(len(envelopes))
+                    return
+                await asyncio.sleep(self.poll_interval)
+
+        available_at = utc_now() + timedelta(seconds=delay)
+        async with SessionFactory() as db:
+            db.add_all(
+                EventOutbox(
+                    id=envelope.id,
+                    event=envelope.event,
+                    payload=envelope.to_payload(),
+                    available_at=available_at,
+                )
+                for envelope in envelopes
+            )
+            await db.commit()
+        self._depth += len(envelopes)
+        if delay <= 0:
+            self._wakeup.set()
+
+    async def _claim(self) -> list[EventEnvelope]:
+        now = utc_now()
+        claimable = (
+            select(EventOutbox.id)
+            .where(
+                EventOutbox.available_at <= now,
+                or_(
+                    EventOutbox.locked_until.is_(None),
+                    EventOutbox.locked_until < now,
+                ),
+            )
+            .order_by(EventOutbox.available_at)
+            .limit(self.batch_size)
+            .with_for_update(skip_locked=True)
+        )
+        statement = (
+            update(EventOutbox)
+            .where(EventOutbox.id.in_(claimable.scalar_subquery()))
+            .values(
+                locked_until=now + timedelta(seconds=self.visibility_timeout),
+                attempts=EventOutbox.attempts + 1,
+            )
+            .returning(
+                EventOutbox.id,
+                EventOutbox.event,
+                EventOutbox.payload,
+                EventOutbox.available_at,
+            )
+            .execution_options(synchronize_session=False)
+        )
+        async with SessionFactory() as db:
+            result = await db.execute(statement)
+            rows = result.all()
+            await db.commit()
+
+        return [
+            EventEnvelope.from_payload(
+                event, payload, id=id, enqueued_at=available_at.timestamp()
+            )
+            for id, event, payload, available_at in rows
+        ]
+
+    async def get(self) -> EventEnvelope:
+        while True:
+            if not self._buffer.empty():
+                return self._buffer.get_nowait()
+
+            async with self._claim_lock:
+                if self._buffer.empty():
+                    for envelope in await self._claim():
+                        self._buffer.put_nowait(envelope)
+                    if self._buffer.empty():
+                        self._wakeup.clear()
+                        try:
+                            await asyncio.wait_for(
+                                self._wakeup.wait(), timeout=self.poll_interval
+                            )
+                        except asyncio.TimeoutError:
+                            pass
+
+    async def ack(self, envelope: EventEnvelope) -> None:
+        async with SessionFactory() as db:
+            await db.execute(delete(EventOutbox).where(EventOutbox.id == envelope.id))
+            await db.commit()
+        self._depth = max(self._depth - 1, 0)
+
+    async def nack(self, envelope: EventEnvelope, delay: float = 0) -> None:
+        async with SessionFactory() as db:
+            await db.execute(
+                update(EventOutbox)
+                .where(EventOutbox.id == envelope.id)
+                .values(
+                    locked_until=None,
+                    available_at=utc_now() + timedelta(seconds=delay),
+                )
+            )
+            await db.commit()
+
+    def qsize(self) -> int:
+        return self._depth
+
+
+def create_event_transport() -> EventTransport:
+    """Build the event transport selected by `EVENTS_TRANSPORT`."""
+    transport = settings.EVENTS_TRANSPORT.lower()
+    if transport == "database":
+        return DatabaseEventTransport(
+            max_size=settings.EVENTS_QUEUE_SIZE,
+            backpressure=settings.EVENTS_BACKPRESSURE,
+            poll_interval=settings.EVENTS_POLL_INTERVAL,
+            visibility_timeout=settings.EVENTS_VISIBILITY_TIMEOUT,
+        )
+    if transport == "memory":
+        return MemoryEventTransport(
+            max_size=settings.EVENTS_QUEUE_SIZE,
+            backpressure=settings.EVENTS_BACKPRESSURE,
+        )
+    raise ValueError(f"Unsupported event transport: {settings.EVENTS_TRANSPORT}")
@@ -1,13 +1,27 @@
 import asyncio
 import threading
-from collections.abc import Callable, Coroutine
+import time
+from collections.abc import Callable, Coroutine, Iterable
 from typing import Any
 
+from core.config import settings
+from core.database import router
+from helpers.event_transports import (
+    EventEnvelope,
+    EventTransport,
+    MemoryEventTransport,
+    create_event_transport,
+)
+from helpers.executor import BoundedExecutor
 from helpers.logger import Logger
+from helpers.metrics import Counter, Gauge, Histogram, MetricsRegistry, registry
 
 logger = Logger(__name__)
 
 
+LISTENER_EXECUTORS = ("thread", "process")
+
+
 class ListenerEntry:
     def __init__(
         self,
@@ -15,11 +29,27 @@ class ListenerEntry:
         once: bool = False,
         retry_attempts: int | None = None,
         retry_delay: float | None = None,
+        executor: str = "thread",
+        timeout: float | None = None,
     ):
+        if executor not in LISTENER_EXECUTORS:
+            raise ValueError(f"Unsupported listener executor: {executor}")
+
         self.listener = listener
         self.once = once
         self.retry_attempts = retry_attempts
         self.retry_delay = retry_delay
+        # Where synchronous listeners run; ignored for coroutine functions
+        self.executor = executor
+        self.timeout = timeout
+        self.is_coroutine = asyncio.iscoroutinefunction(listener)
+        self.name = (
+            f"{getattr(listener, '__module__', '')}."
+            f"{getattr(listener, '__qualname__', repr(listener))}"
+        )
+        # Unique per registration, unlike `name` (set by `Events.on`); retries
+        # find the entry by it
+        self.key = self.name
 
     def __repr__(self):
         return (
@@ -33,15 +63,76 @@ class ListenerEntry:
 
 
 class Events:
-    def __init__(self, default_retry_attempts=3, default_retry_delay=1.0):
+    def __init__(
+        self,
+        default_retry_attempts=3,
+        default_retry_delay=1.0,
+        transport: EventTransport | None = None,
+        concurrency: int = 1,
+        defer_delay: float = 0.05,
+        thread_executor: BoundedExecutor | None = None,
+        process_executor: BoundedExecutor | None = None,
+        default_timeout: float | None = None,
+        max_overruns: int = 4,
+    ):
         self._events: dict[str, list[ListenerEntry]] = {}
-        self._queue: asyncio.Queue = asyncio.Queue()
+        # Every registered entry by key, including once-entries already taken
+        # whose retries may still be pending
+        self._entries: dict[str, ListenerEntry] = {}
+        self._registrations: dict[tuple[str, str], int] = {}
+        self._event_limits: dict[str, int] = {}
+        self._in_flight: dict[str, int] = {}
+        self._defer_delay = defer_delay
+        self._transport = transport or MemoryEventTransport()
         self._default_retry_attempts = default_retry_attempts
         self._default_retry_delay = default_retry_delay
-        self._worker_task: asyncio.Task | None = None
+        self._concurrency = concurrency
+        self._default_timeout = default_timeout
+        self._max_overruns = max_overruns
+        # Synchronous listeners never run on the event loop
+        self._executors = {
+            "thread": thread_executor
+            or BoundedExecutor(8, 1000, mode="thread", name="event-listeners"),
+            "process": process_executor
+            or BoundedExecutor(2, 1000, mode="process", name="event-listeners"),
+        }
+        self._worker_tasks: list[asyncio.Task] = []
+        # Timed-out synchronous calls still running, awaited before any retry,
+        # with the executor each one holds a slot of
+        self._settling: dict[asyncio.Task, str] = {}
         self._lock = threading.Lock()
         self._running = False
 
+        # Instrumentation; updating these is a dict lookup and an addition
+        self.emitted = Counter(
+            "events_emitted_total", "Events handed to the transport", ("event",)
+        )
+        self.lag = Histogram(
+            "events_lag_seconds",
+            "Delay between an event becoming available and a consumer starting it",
+            ("event",),
+        )
+        self.duration = Histogram(
+            "events_listener_duration_seconds",
+            "Listener execution time",
+            ("event", "listener"),
+        )
+        self.attempts = Counter(
+            "events_listener_attempts_total",
+            "Listener invocations by outcome",
+            ("event", "listener", "outcome"),
+        )
+        self.retries = Counter(
+            "events_listener_retries_total",
+            "Listener retries scheduled after a failure",
+            ("event", "listener"),
+        )
+        self.giveups = Counter(
+            "events_listener_giveups_total",
+            "Listeners that failed on their last allowed attempt",
+            ("event", "listener"),
+        )
+
     def on(
         self,
         event: str,
@@ -50,93 +141,350 @@ class Events:
         once: bool = False,
         retry_attempts: int | None = None,
         retry_delay: float | None = None,
+        executor: str = "thread",
+        timeout: float | None = None,
     ):
-        entry = ListenerEntry(listener, once, retry_attempts, retry_delay)
+        """Register `listener` for `event`.
+
+        Synchronous listeners run on the thread pool, or on the process pool
+        with `executor="process"` for CPU-bound work (the listener and the
+        event arguments must then be picklable). An attempt that exceeds
+        `timeout` seconds counts as a failure. Coroutines are cancelled and
+        process pools recycled; a thread runs on and is only retried if it then
+        fails, and not at all while `max_overruns` threads are already stuck.
+        """
+        entry = ListenerEntry(
+            listener, once, retry_attempts, retry_delay, executor, timeout
+        )
         with self._lock:
+            # Numbered in registration order, so processes registering the
+            # same listeners agree on the keys of durable retries
+            count = self._registrations.get((event, entry.name), 0) + 1
+            self._registrations[(event, entry.name)] = count
+            entry.key = f"{event}:{entry.name}#{count}"
             self._events.setdefault(event, []).append(entry)
+            self._entries[entry.key] = entry
             logger.info(f"Listener {listener} added to event: {event} (once={once})")
 
     def off(self, event: str, listener: Callable | None = None):
         with self._lock:
             if event in self._events:
-                if listener:
-                    self._events[event] = [
-                        e for e in self._events[event] if e.listener != listener
-                    ]
-                else:
+                removed = [
+                    e
+                    for e in self._events[event]
+                    if listener is None or e.listener == listener
+                ]
+                self._events[event] = [
+                    e for e in self._events[event] if e not in removed
+                ]
+                if not self._events[event]:
                     del self._events[event]
+                # Pending retries of removed listeners are dropped
+                for entry in removed:
+                    self._entries.pop(entry.key, None)
+
+    def limit(self, event: str, max_concurrency: int | None):
+        """Cap how many `event` envelopes are handled at once (None removes it)."""
+        if max_concurrency is None:
+            self._event_limits.pop(event, None)
+        else:
+            self._event_limits[event] = max_concurrency
+
+    def in_flight(self) -> dict[str, int]:
+        """Number of envelopes currently being handled, per event."""
+        return {event: count for event, count in self._in_flight.items() if count}
+
+    def overruns(self) -> dict[str, int]:
+        """Timed-out synchronous calls still holding a slot, per executor."""
+        counts = dict.fromkeys(LISTENER_EXECUTORS, 0)
+        for executor in self._settling.values():
+            counts[executor] += 1
+        return counts
+
+    def register_metrics(self, target: MetricsRegistry):
+        """Expose this bus' metrics, including transport gauges, on `target`."""
+        for metric in (
+            self.emitted,
+            self.lag,
+            self.duration,
+            self.attempts,
+            self.retries,
+            self.giveups,
+        ):
+            target.register(metric)
+        target.register(
+            Gauge(
+                "events_queue_depth",
+                "Events waiting in the transport",
+                lambda: [((), self._transport.qsize())],
+            )
+        )
+        target.register(
+            Gauge(
+                "events_queue_dropped",
+                "Events dropped by the backpressure policy",
+                lambda: [((), self._transport.dropped)],
+            )
+        )
+        target.register(
+            Gauge(
+                "events_listener_overruns",
+                "Timed-out synchronous listener calls still holding a slot",
+                lambda: [
+                    ((executor,), count) for executor, count in self.overruns().items()
+                ],
+                ("executor",),
+            )
+        )
+        target.register(
+            Gauge(
+                "events_in_flight",
+                "Events currently being handled",
+                lambda: [
+                    ((event,), count) for event, count in self.in_flight().items()
+                ],
+                ("event",),
+            )
+        )
 
     async def emit(self, event: str, *args: Any, **kwargs: Any):
-        """Push the event to the internal queue (non-blocking for caller)."""
-        await self._queue.put((event, args, kwargs))
+        """Push the event to the transport.
+
+        Depending on the transport's backpressure policy, a full queue makes
+        this wait, drop the event or raise `EventQueueFullError`. The event is
+        not part of any open transaction, so emit once the write it reports
+        has committed.
+        """
+        await self._transport.put([EventEnvelope(event, args, kwargs)])
+        self.emitted.inc((event,))
         logger.info(f"Event '{event}' enqueued")
 
-    async def _worker(self):
-        logger.info("Event worker started")
-        self._running = True
+    async def emit_many(self, event: str, calls: Iterable[tuple[Any, ...]]):
+        """Push one event per argument tuple in `calls` to the transport."""
+        envelopes = [EventEnvelope(event, args) for args in calls]
+        await self._transport.put(envelopes)
+        self.emitted.inc((event,), len(envelopes))
+        logger.info(f"{len(envelopes)} '{event}' event(s) enqueued")
+
+    async def _worker(self, index: int):
+        logger.info(f"Event worker {index} started")
         while self._running:
             try:
-                event, args, kwargs = await self._queue.get()
-                await self._handle_event(event, *args, **kwargs)
+                envelope = await self._transport.get()
+            except Exception as e:
+                logger.exception(f"Event worker {index} failed to fetch events: {e}")
+                await asyncio.sleep(self._default_retry_delay)
+                continue
+
+            event = envelope.event
+            limit = self._event_limits.get(event)
+            if limit is not None and self._in_flight.get(event, 0) >= limit:
+                # Hand the envelope back rather than block this consumer on it
+                await self._release(envelope, self._defer_delay)
+                continue
+
+            self.lag.observe((event,), max(time.time() - envelope.enqueued_at, 0))
+            self._in_flight[event] = self._in_flight.get(event, 0) + 1
+            try:
+                # Each event is a unit of work: a listener's write keeps its own
+                # later reads on the primary without pinning this consumer
+                with router.unit_of_work():
+                    await self._handle_event(envelope)
+                # Acknowledge only once every listener has run to completion
+                await self._transport.ack(envelope)
             except Exception as e:
-                logger.exception(f"Exception in event worker: {e}")
+                logger.exception(f"Exception in event worker {index}: {e}")
+                await self._release(envelope, self._default_retry_delay)
+            finally:
+                self._in_flight[event] -= 1
 
-    async def _handle_event(self, event: str, *args: Any, **kwargs: Any):
+    async def _release(self, envelope: EventEnvelope, delay: float):
+        try:
+            await self._transport.nack(envelope, delay)
+        except Exception as e:
+            logger.exception(f"Failed to release event {envelope}: {e}")
+
+    async def _handle_event(self, envelope: EventEnvelope):
+        event = envelope.event
         with self._lock:
-            listeners = list(self._events.get(event, []))
+            if envelope.listener:
+                # A retry runs the entry it was scheduled for, which may be a
+                # once-entry no longer registered for the event
+                entry = self._entries.get(envelope.listener)
+                listeners = [entry] if entry else []
+            else:
+                listeners = list(self._events.get(event, []))
+                if any(entry.once for entry in listeners):
+                    # Taken with the snapshot, so no other consumer runs them
+                    self._events[event] = [e for e in listeners if not e.once]
+
+        if envelope.listener and not listeners:
+            logger.warning(
+                f"Dropping retry of '{envelope.listener}': listener was removed"
+            )
+            return
 
         logger.info(f"Processing event '{event}' with {len(listeners)} listener(s)")
 
-        async def invoke(entry: ListenerEntry):
-            attempts = entry.retry_attempts or self._default_retry_attempts
-            delay = entry.retry_delay or self._default_retry_delay
-            name = getattr(entry.listener, "__name__", repr(entry.listener))
-
-            for attempt in range(1, attempts + 1):
-                try:
-                    logger.info(
-                        f"Invoking listener '{name}' for event '{event}' (attempt {attempt})"
-                    )
-                    # Check if the listener is a coroutine function
-                    if asyncio.iscoroutinefunction(entry.listener):
-                        await entry.listener(*args, **kwargs)
-                    else:
-                        entry.listener(*args, **kwargs)
-                    logger.info(f"Listener {name} succeeded on attempt {attempt}")
-                    break
-                except Exception as e:
-                    logger.error(f"Listener '{name}' failed (attempt {attempt}): {e}")
-                    if attempt < attempts:
-                        await asyncio.sleep(delay)
-                    else:
-                        logger.critical(
-                            f"Listener '{name}' gave up after {attempts} attempts"
-                        )
-
-        await asyncio.gather(*(invoke(entry) for entry in listeners))
+        await asyncio.gather(*(self._invoke(envelope, entry) for entry in listeners))
 
-        with self._lock:
-            if event in self._events:
-                self._events[event] = [
-                    entry for entry in self._events[event] if not entry.once
-                ]
+    async def _invoke(self, envelope: EventEnvelope, entry: ListenerEntry):
+        event, args, kwargs = envelope.event, envelope.args, envelope.kwargs
+        attempt = envelope.attempt
+        name = getattr(entry.listener, "__name__", repr(entry.listener))
+        labels = (event, entry.name)
+        timeout = entry.timeout or self._default_timeout
+
+        started = time.perf_counter()
+        call = asyncio.ensure_future(self._call(entry, args, kwargs))
+        try:
+            logger.info(
+                f"Invoking listener '{name}' for event '{event}' (attempt {attempt})"
+            )
+            if entry.is_coroutine:
+                await asyncio.wait_for(call, timeout)
+            else:
+                # A thread or process cannot be interrupted, so a timeout must
+                # not cancel the call and let a retry overlap it
+                await asyncio.wait_for(asyncio.shield(call), timeout)
+            self.duration.observe(labels, time.perf_counter() - started)
+            self.attempts.inc((*labels, "success"))
+            logger.info(f"Listener {name} succeeded on attempt {attempt}")
+            self._finished(entry)
+        except asyncio.TimeoutError:
+            self.duration.observe(labels, time.perf_counter() - started)
+            self.attempts.inc((*labels, "timeout"))
+            logger.error(
+                f"Listener '{name}' timed out after {timeout}s (attempt {attempt})"
+            )
+            if call.done():
+                await self._retry(envelope, entry)
+                return
+            if entry.executor == "process":
+                # A process can be stopped: terminating the pool fails this
+                # call, and any other it runs, and frees their slots
+                self._executors["process"].recycle()
+            overruns = self.overruns()[entry.executor]
+            retry = overruns < self._max_overruns
+            if not retry:
+                # Every retry of a stuck thread call would hold one more slot
+                self.giveups.inc(labels)
+                logger.critical(
+                    f"Listener '{name}' gave up: {overruns} timed-out call(s) "
+                    f"still hold {entry.executor} slots"
+                )
+                self._finished(entry)
+            # Decide on a retry once the call has actually finished, off the
+            # consumer
+            task = asyncio.create_task(self._settle(call, envelope, entry, retry))
+            self._settling[task] = entry.executor
+            task.add_done_callback(self._settled)
+        except Exception as e:
+            self.duration.observe(labels, time.perf_counter() - started)
+            self.attempts.inc((*labels, "failure"))
+            logger.error(f"Listener '{name}' failed (attempt {attempt}): {e}")
+            await self._retry(envelope, entry)
+
+    def _settled(self, task: asyncio.Task):
+        self._settling.pop(task, None)
+
+    async def _settle(
+        self,
+        call: asyncio.Future,
+        envelope: EventEnvelope,
+        entry: ListenerEntry,
+        retry: bool = True,
+    ):
+        """Wait out a timed-out synchronous call, retrying only if it failed."""
+        name = getattr(entry.listener, "__name__", repr(entry.listener))
+        try:
+            await call
+        except Exception as e:
+            logger.error(
+                f"Listener '{name}' failed after timing out "
+                f"(attempt {envelope.attempt}): {e}"
+            )
+            if retry:
+                await self._retry(envelope, entry)
+        else:
+            logger.warning(
+                f"Listener '{name}' finished after timing out "
+                f"(attempt {envelope.attempt}); not retrying"
+            )
+            if retry:
+                self._finished(entry)
+
+    async def _retry(self, envelope: EventEnvelope, entry: ListenerEntry):
+        """Schedule the next attempt of a failed listener, or give up."""
+        event, labels = envelope.event, (envelope.event, entry.name)
+        attempts = entry.retry_attempts or self._default_retry_attempts
+        delay = entry.retry_delay or self._default_retry_delay
+        name = getattr(entry.listener, "__name__", repr(entry.listener))
+        if envelope.attempt < attempts:
+            # Schedule a delayed retry for this listener alone, so the backoff
+            # does not hold a consumer
+            retry = EventEnvelope(
+                event,
+                envelope.args,
+                envelope.kwargs,
+                listener=entry.key,
+                attempt=envelope.attempt + 1,
+            )
+            try:
+                await self._transport.put([retry], delay=delay)
+            except Exception as e:
+                # Failing the envelope would rerun the listeners that succeeded
+                self.giveups.inc(labels)
+                logger.critical(f"Listener '{name}' gave up: retry not queued: {e}")
+                self._finished(entry)
+                return
+            self.retries.inc(labels)
+        else:
+            self.giveups.inc(labels)
+            logger.critical(f"Listener '{name}' gave up after {attempts} attempts")
+            self._finished(entry)
+
+    def _finished(self, entry: ListenerEntry):
+        """Forget a once-entry when no retry of it can follow."""
+        if entry.once:
+            with self._lock:
+                self._entries.pop(entry.key, None)
+
+    async def _call(self, entry: ListenerEntry, args: tuple, kwargs: dict):
+        if entry.is_coroutine:
+            await entry.listener(*args, **kwargs)
+        else:
+            await self._executors[entry.executor].run(entry.listener, *args, **kwargs)
 
     async def start_worker(self):
-        """Start background event processor (call once during app init)."""
-        logger.info("Starting event worker")
-        if self._worker_task is None or self._worker_task.done():
-            self._worker_task = asyncio.create_task(self._worker())
+        """Start background event processors (call once during app init)."""
+        logger.info(f"Starting {self._concurrency} event worker(s)")
+        self._worker_tasks = [task for task in self._worker_tasks if not task.done()]
+        if self._worker_tasks:
+            return
+        self._running = True
+        self._worker_tasks = [
+            asyncio.create_task(self._worker(index))
+            for index in range(self._concurrency)
+        ]
 
     async def stop_worker(self):
-        """Stop the background event processor (clean shutdown)."""
-        logger.info("Stopping event worker")
+        """Stop the background event processors (clean shutdown).
+
+        Events being handled at this point are not acknowledged, so durable
+        transports deliver them again after a restart.
+        """
+        logger.info("Stopping event workers")
         self._running = False
-        if self._worker_task:
-            self._worker_task.cancel()
-            try:
-                await self._worker_task
-            except asyncio.CancelledError:
-                logger.info("Event worker stopped")
+        tasks = [*self._worker_tasks, *self._settling]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._worker_tasks = []
+        await self._transport.close()
+        for executor in self._executors.values():
+            executor.shutdown(wait=False)
+        logger.info("Event workers stopped")
 
 
 class _Events:
@@ -146,7 +494,26 @@ class _Events:
     def get_instance(cls) -> Events:
         if cls._instance is None:
             logger.info("Creating global events singleton instance")
-            cls._instance = Events()
+            cls._instance = Events(
+                transport=create_event_transport(),
+                concurrency=settings.EVENTS_CONCURRENCY,
+                defer_delay=settings.EVENTS_DEFER_DELAY,
+                thread_executor=BoundedExecutor(
+                    settings.EVENTS_LISTENER_THREADS,
+                    settings.EVENTS_LISTENER_MAX_PENDING,
+                    mode="thread",
+                    name="event-listeners",
+                ),
+                process_executor=BoundedExecutor(
+                    settings.EVENTS_LISTENER_PROCESSES,
+                    settings.EVENTS_LISTENER_MAX_PENDING,
+                    mode="process",
+                    name="event-listeners",
+                ),
+                default_timeout=settings.EVENTS_LISTENER_TIMEOUT or None,
+                max_overruns=settings.EVENTS_LISTENER_MAX_OVERRUNS,
+            )
+            cls._instance.register_metrics(registry)
         return cls._instance
 
 
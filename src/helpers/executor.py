@@ -0,0 +1,168 @@
+import asyncio
+from collections.abc import Callable
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+from typing import Any, TypeVar
+
+from helpers.logger import Logger
+from helpers.metrics import registry
+
+logger = Logger(__name__)
+
+T = TypeVar("T")
+
+
+class ExecutorSaturatedError(RuntimeError):
+    """Raised when a bounded executor already has too many calls waiting."""
+
+
+class BoundedExecutor:
+    """Run blocking callables off the event loop with a concurrency limit.
+
+    At most `max_workers` calls run at once; up to `max_pending` more may wait
+    for a slot, after which new calls are rejected instead of queueing without
+    bound. `mode` selects a thread pool or, for CPU-bound work that must escape
+    the GIL, a process pool (callables and arguments must then be picklable).
+    """
+
+    def __init__(
+        self,
+        max_workers: int,
+        max_pending: int,
+        mode: str = "thread",
+        name: str = "executor",
+    ):
+        if mode not in ("thread", "process"):
+            raise ValueError(f"Unsupported executor mode: {mode}")
+
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self.mode = mode
+        self.name = name
+        self._pool: Executor | None = None
+        self._semaphore = asyncio.Semaphore(max_workers)
+        self._pending = 0
+        self._running = 0
+        self._completed = 0
+        self._failed = 0
+        self._rejected = 0
+        _executors.append(self)
+
+    def _get_pool(self) -> Executor:
+        if self._pool is None:
+            logger.info(
+                f"Starting {self.mode} pool '{self.name}' with {self.max_workers} worker(s)"
+            )
+            if self.mode == "process":
+                self._pool = ProcessPoolExecutor(max_workers=self.max_workers)
+            else:
+                self._pool = ThreadPoolExecutor(
+                    max_workers=self.max_workers, thread_name_prefix=self.name
+                )
+        return self._pool
+
+    async def run(self, fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """Run `fn` on the pool once a slot is free and return its result."""
+        if self._pending >= self.max_pending:
+            self._rejected += 1
+            raise ExecutorSaturatedError(
+                f"Executor '{self.name}' has {self._pending} call(s) waiting"
+            )
+
+        self._pending += 1
+        try:
+            await self._semaphore.acquire()
+        finally:
+            self._pending -= 1
+
+        self._running += 1
+        try:
+            loop = asyncio.get_running_loop()
+            result = await loop.run_in_executor(
+                self._get_pool(), partial(fn, *args, **kwargs)
+            )
+        except Exception:
+            self._failed += 1
+            raise
+        finally:
+            self._running -= 1
+            self._semaphore.release()
+        self._completed += 1
+        return result
+
+    def stats(self) -> dict[str, int]:
+        """Return queue depth and throughput counters for this executor."""
+        return {
+            "max_workers": self.max_workers,
+            "max_pending": self.max_pending,
+            "running": self._running,
+            "pending": self._pending,
+            "completed": self._completed,
+            "failed": self._failed,
+            "rejected": self._rejected,
+        }
+
+    def recycle(self):
+        """Terminate a process pool's workers, failing the calls they run.
+
+        Frees the slots of calls that overran; the next call starts a fresh
+        pool. Threads cannot be terminated, so thread pools are left alone.
+        """
+        if self.mode != "process" or self._pool is None:
+            return
+        logger.warning(f"Recycling process pool '{self.name}'")
+        pool, self._pool = self._pool, None
+        # ProcessPoolExecutor has no public way to stop a running call
+        processes = list((getattr(pool, "_processes", None) or {}).values())
+        pool.shutdown(wait=False, cancel_futures=True)
+        for process in processes:
+            process.terminate()
+
+    def shutdown(self, wait: bool = True):
+        if self._pool is not None:
+            logger.info(f"Shutting down {self.mode} pool '{self.name}'")
+            self._pool.shutdown(wait=wait, cancel_futures=True)
+            self._pool = None
+
+
+# Every executor created, reported on the metrics endpoint by name
+_executors: list[BoundedExecutor] = []
+
+
+def _executor_samples(stat: str):
+    return [
+        ((executor.name, executor.mode), executor.stats()[stat])
+        for executor in _executors
+    ]
+
+
+registry.gauge(
+    "executor_running",
+    "Calls currently running on the executor",
+    lambda: _executor_samples("running"),
+    ("executor", "mode"),
+)
+registry.gauge(
+    "executor_pending",
+    "Calls waiting for an executor slot",
+    lambda: _executor_samples("pending"),
+    ("executor", "mode"),
+)
+registry.gauge(
+    "executor_completed",
+    "Calls the executor has finished successfully",
+    lambda: _executor_samples("completed"),
+    ("executor", "mode"),
+)
+registry.gauge(
+    "executor_failed",
+    "Calls that raised, including those failed by recycling the pool",
+    lambda: _executor_samples("failed"),
+    ("executor", "mode"),
+)
+registry.gauge(
+    "executor_rejected",
+    "Calls rejected because too many were already waiting",
+    lambda: _executor_samples("rejected"),
+    ("executor", "mode"),
+)
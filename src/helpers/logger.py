@@ -1,5 +1,8 @@
+import atexit
+import json
 import logging
-from logging.handlers import RotatingFileHandler
+import queue
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 from pathlib import Path
 
 from colorlog import ColoredFormatter
@@ -7,49 +10,199 @@ from colorlog import ColoredFormatter
 from core.config import settings
 
 
-def Logger(name: str = settings.PROJECT_NAME) -> logging.Logger:
-    """Configure and return a logger instance with Uvicorn-style formatting and colors."""
-    logger = logging.getLogger(name)
-    logger.setLevel(logging.DEBUG if settings.ENV == "development" else logging.INFO)
-    logger.propagate = False
+class JsonFormatter(logging.Formatter):
+    """Format records as single-line JSON objects for log shippers."""
 
-    if logger.hasHandlers():
-        logger.handlers.clear()
+    def format(self, record: logging.LogRecord) -> str:
+        data = {
+            "timestamp": self.formatTime(record, self.datefmt),
+            "name": record.name,
+            "level": record.levelname,
+            "message": record.getMessage(),
+        }
+        if record.exc_info:
+            data["exc_info"] = self.formatException(record.exc_info)
+        return json.dumps(data, default=str)
 
-    # Colored console formatter (like uvicorn)
-    color_formatter = ColoredFormatter(
-        fmt="%(log_color)s%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-        datefmt="%Y-%m-%d %H:%M:%S",
-        log_colors={
-            "DEBUG": "bold_blue",
-            "INFO": "bold_green",
-            "WARNING": "bold_yellow",
-            "ERROR": "bold_red",
-            "CRITICAL": "bold_red,bg_white",
-        },
-    )
 
-    console_handler = logging.StreamHandler()
-    console_handler.setFormatter(color_formatter)
-    logger.addHandler(console_handler)
+class DroppingQueueHandler(QueueHandler):
+    """Queue handler that drops records instead of blocking when the buffer is full."""
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Merge the arguments now, while they still hold their values at the call;
+        # timestamps, tracebacks and the formatter still run on the listener thread
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+class _BatchFlushMixin:
+    """Skip the per-record flush; the listener flushes once per batch."""
+
+    def flush(self):
+        pass
+
+    def flush_batch(self):
+        super().flush()  # type: ignore[misc]
+
+    def close(self):
+        self.flush_batch()
+        super().close()  # type: ignore[misc]
+
+
+class BatchStreamHandler(_BatchFlushMixin, logging.StreamHandler):
+    pass
+
+
+class BatchRotatingFileHandler(_BatchFlushMixin, RotatingFileHandler):
+    pass
+
+
+class BatchingQueueListener(QueueListener):
+    """Queue listener that drains records in batches and flushes once per batch."""
+
+    def __init__(
+        self,
+        log_queue: queue.Queue,
+        *handlers,
+        batch_size: int = 100,
+        stop_timeout: float = 5.0,
+    ):
+        super().__init__(log_queue, *handlers, respect_handler_level=True)
+        self.batch_size = batch_size
+        self.stop_timeout = stop_timeout
+
+    def enqueue_sentinel(self):
+        # The queue may be full at exit: wait for the listener to make room
+        # rather than failing and leaving the backlog unflushed
+        try:
+            self.queue.put(self._sentinel, timeout=self.stop_timeout)
+        except queue.Full:
+            pass
+
+    def stop(self):
+        if self._thread:
+            self.enqueue_sentinel()
+            self._thread.join(self.stop_timeout)
+            self._thread = None
+
+    def _monitor(self):
+        log_queue = self.queue
+        stopping = False
+        while not stopping:
+            record = log_queue.get()
+            log_queue.task_done()
+            if record is self._sentinel:
+                break
+
+            batch = [record]
+            while len(batch) < self.batch_size:
+                try:
+                    record = log_queue.get_nowait()
+                except queue.Empty:
+                    break
+                log_queue.task_done()
+                if record is self._sentinel:
+                    stopping = True
+                    break
+                batch.append(record)
+
+            for record in batch:
+                self.handle(record)
+            for handler in self.handlers:
+                getattr(handler, "flush_batch", handler.flush)()
+
+
+_queue_handler: DroppingQueueHandler | None = None
+
+
+def _get_queue_handler() -> DroppingQueueHandler:
+    """Build the shared logging pipeline on first use.
+
+    Every logger enqueues onto one bounded queue; a single listener thread does
+    the formatting, console writes and file rotation off the event loop.
+    """
+    global _queue_handler
+    if _queue_handler is not None:
+        return _queue_handler
+
+    if settings.LOG_FORMAT.lower() == "json":
+        console_formatter: logging.Formatter = JsonFormatter()
+    else:
+        # Colored console formatter (like uvicorn)
+        console_formatter = ColoredFormatter(
+            fmt="%(log_color)s%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+            datefmt="%Y-%m-%d %H:%M:%S",
+            log_colors={
+                "DEBUG": "bold_blue",
+                "INFO": "bold_green",
+                "WARNING": "bold_yellow",
+                "ERROR": "bold_red",
+                "CRITICAL": "bold_red,bg_white",
+            },
+        )
+
+    console_handler = BatchStreamHandler()
+    console_handler.setFormatter(console_formatter)
+    handlers: list[logging.Handler] = [console_handler]
 
     # Rotating file handler (no colors, plain text)
     if settings.ENV.lower() == "production":
         log_dir = Path(settings.LOG_DIR)
         log_dir.mkdir(parents=True, exist_ok=True)
 
-        file_handler = RotatingFileHandler(
+        file_handler = BatchRotatingFileHandler(
             filename=log_dir / settings.LOG_FILE,
             maxBytes=settings.LOG_FILE_MAX_BYTES,
             backupCount=settings.LOG_FILE_BACKUP_COUNT,
         )
 
-        plain_formatter = logging.Formatter(
-            fmt="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-            datefmt="%Y-%m-%d %H:%M:%S",
-        )
-        file_handler.setFormatter(plain_formatter)
-        logger.addHandler(file_handler)
+        if settings.LOG_FORMAT.lower() == "json":
+            file_formatter: logging.Formatter = JsonFormatter()
+        else:
+            file_formatter = logging.Formatter(
+                fmt="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+                datefmt="%Y-%m-%d %H:%M:%S",
+            )
+        file_handler.setFormatter(file_formatter)
+        handlers.append(file_handler)
+
+    log_queue: queue.Queue = queue.Queue(maxsize=settings.LOG_QUEUE_SIZE)
+    listener = BatchingQueueListener(
+        log_queue, *handlers, batch_size=settings.LOG_BATCH_SIZE
+    )
+    listener.start()
+    atexit.register(listener.stop)
+
+    _queue_handler = DroppingQueueHandler(log_queue)
+    return _queue_handler
+
+
+def dropped_records() -> int:
+    """Number of log records dropped because the logging queue was full."""
+    return _queue_handler.dropped if _queue_handler else 0
+
+
+def Logger(name: str = settings.PROJECT_NAME) -> logging.Logger:
+    """Configure and return a logger instance with Uvicorn-style formatting and colors."""
+    logger = logging.getLogger(name)
+    logger.setLevel(logging.DEBUG if settings.ENV == "development" else logging.INFO)
+    logger.propagate = False
+
+    if logger.hasHandlers():
+        logger.handlers.clear()
+
+    logger.addHandler(_get_queue_handler())
 
     return logger
 
@@ -1,3 +1,8 @@
+import asyncio
+import time
+from collections.abc import AsyncIterator, Sequence
+from contextlib import asynccontextmanager
+from email.message import Message
 from email.mime.multipart import MIMEMultipart
 from email.mime.text import MIMEText
 from typing import Any
@@ -5,6 +10,119 @@ from typing import Any
 import aiosmtplib
 from aiosmtplib.response import SMTPResponse
 
+from core.config import settings
+from helpers.logger import Logger
+from helpers.ratelimit import TokenBucket
+from helpers.templates import EmailTemplates, RenderedEmail
+
+logger = Logger(__name__)
+
+# Errors that fail a single message but leave the SMTP session usable
+MESSAGE_ERRORS = (aiosmtplib.SMTPResponseException, aiosmtplib.SMTPRecipientsRefused)
+
+
+class SMTPConnectionPool:
+    """Pool of connected, authenticated SMTP clients.
+
+    Connections are reused LIFO so the busiest stay warm. One that has sat idle
+    longer than `idle_timeout` is closed instead of reused, and one idle longer
+    than `health_check_interval` is probed with NOOP before being handed out.
+    """
+
+    def __init__(
+        self,
+        hostname: str,
+        port: int,
+        username: str,
+        password: str,
+        start_tls: bool = True,
+        max_size: int = 4,
+        idle_timeout: float = 60,
+        health_check_interval: float = 30,
+        timeout: float = 30,
+    ):
+        self.hostname = hostname
+        self.port = port
+        self.username = username
+        self.password = password
+        self.start_tls = start_tls
+        self.max_size = max_size
+        self.idle_timeout = idle_timeout
+        self.health_check_interval = health_check_interval
+        self.timeout = timeout
+        self._idle: list[tuple[aiosmtplib.SMTP, float]] = []
+        self._semaphore = asyncio.Semaphore(max_size)
+        self._connects = 0
+
+    async def _connect(self) -> aiosmtplib.SMTP:
+        client = aiosmtplib.SMTP(
+            hostname=self.hostname,
+            port=self.port,
+            username=self.username or None,
+            password=self.password or None,
+            start_tls=self.start_tls,
+            timeout=self.timeout,
+        )
+        # Connecting also runs STARTTLS and AUTH when configured
+        await client.connect()
+        self._connects += 1
+        logger.info(f"Opened SMTP connection to {self.hostname}:{self.port}")
+        return client
+
+    @staticmethod
+    async def _discard(client: aiosmtplib.SMTP):
+        try:
+            if client.is_connected:
+                await client.quit()
+        except Exception:
+            client.close()
+
+    async def _checkout(self) -> aiosmtplib.SMTP:
+        while self._idle:
+            client, released_at = self._idle.pop()
+            idle_for = time.monotonic() - released_at
+            if not client.is_connected or idle_for > self.idle_timeout:
+                await self._discard(client)
+                continue
+            if idle_for > self.health_check_interval:
+                try:
+                    await client.noop()
+                except Exception as e:
+                    logger.warning(f"Dropping unhealthy SMTP connection: {e}")
+                    await self._discard(client)
+                    continue
+            return client
+        return await self._connect()
+
+    @asynccontextmanager
+    async def connection(self) -> AsyncIterator[aiosmtplib.SMTP]:
+        """Borrow a live client; it goes back to the pool unless it failed."""
+        async with self._semaphore:
+            client = await self._checkout()
+            try:
+                yield client
+            except MESSAGE_ERRORS:
+                self._idle.append((client, time.monotonic()))
+                raise
+            except BaseException:
+                # The session state is unknown, so do not hand it out again
+                await self._discard(client)
+                raise
+            else:
+                self._idle.append((client, time.monotonic()))
+
+    async def close(self):
+        idle, self._idle = self._idle, []
+        for client, _ in idle:
+            await self._discard(client)
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "max_size": self.max_size,
+            "idle": len(self._idle),
+            "connects": self._connects,
+        }
+
 
 class Mailer:
     def __init__(
@@ -14,20 +132,40 @@ class Mailer:
         username: str,
         password: str,
         sender_email: str,
+        pool_size: int = 4,
+        idle_timeout: float = 60,
+        health_check_interval: float = 30,
+        rate_limit: float = 0,
+        rate_burst: int = 1,
+        start_tls: bool = True,
     ):
         self.smtp_server = smtp_server
         self.port = port
         self.username = username
         self.password = password
         self.sender_email = sender_email
+        self.pool = SMTPConnectionPool(
+            smtp_server,
+            port,
+            username,
+            password,
+            start_tls=start_tls,
+            max_size=pool_size,
+            idle_timeout=idle_timeout,
+            health_check_interval=health_check_interval,
+        )
+        # Provider quota in messages per second; 0 means unlimited
+        self.rate_limiter = TokenBucket(rate_limit, rate_burst)
+        # Compiled once here, so sending only substitutes per-recipient fields
+        self.templates = EmailTemplates(sender_email)
 
-    async def send_email(
+    def build_message(
         self,
         receiver_email: str,
         subject: str,
         body: str,
         is_html: bool = False,
-    ) -> dict[str, Any]:
+    ) -> MIMEMultipart:
         msg = MIMEMultipart("alternative")
         part = MIMEText(body, "html" if is_html else "plain")
         msg.attach(part)
@@ -35,26 +173,121 @@ class Mailer:
         msg["Subject"] = subject
         msg["From"] = self.sender_email
         msg["To"] = receiver_email
+        return msg
 
-        try:
-            result: tuple[dict[str, SMTPResponse], str] = await aiosmtplib.send(
-                msg,
-                hostname=self.smtp_server,
-                port=self.port,
-                start_tls=True,
-                username=self.username,
-                password=self.password,
-            )
-            if result[0] != 250:
-                raise Exception(f"Failed to send email: {result[1]}")
-            return {
-                "status": "success",
-                "message": "Email sent successfully",
-                "details": result,
-            }
-        except Exception as e:
+    @staticmethod
+    def _result(
+        result: tuple[dict[str, SMTPResponse], str] | Exception,
+    ) -> dict[str, Any]:
+        if isinstance(result, Exception):
             return {
                 "status": "error",
                 "message": "Failed to send email",
-                "details": str(e),
+                "details": str(result),
             }
+        return {
+            "status": "success",
+            "message": "Email sent successfully",
+            "details": result,
+        }
+
+    async def _send(
+        self, client: aiosmtplib.SMTP, msg: Message | RenderedEmail
+    ) -> tuple[dict[str, SMTPResponse], str]:
+        await self.rate_limiter.acquire()
+        # Raises when every recipient is refused; partial refusals are reported
+        # in the first element, since the message was still delivered
+        if isinstance(msg, RenderedEmail):
+            return await client.sendmail(msg.sender, [msg.recipient], msg.message)
+        return await client.send_message(msg)
+
+    async def send_email(
+        self,
+        receiver_email: str,
+        subject: str,
+        body: str,
+        is_html: bool = False,
+    ) -> dict[str, Any]:
+        msg = self.build_message(receiver_email, subject, body, is_html)
+        return await self._send_one(msg)
+
+    async def send_template(
+        self, receiver_email: str, template: str, **context: Any
+    ) -> dict[str, Any]:
+        """Render the named template for `receiver_email` and send it."""
+        try:
+            msg = self.templates.render(template, receiver_email, **context)
+        except (KeyError, ValueError) as e:
+            return self._result(e)
+        return await self._send_one(msg)
+
+    async def _send_one(self, msg: Message | RenderedEmail) -> dict[str, Any]:
+        try:
+            async with self.pool.connection() as client:
+                return self._result(await self._send(client, msg))
+        except Exception as e:
+            return self._result(e)
+
+    async def send_many(
+        self, messages: Sequence[Message | RenderedEmail]
+    ) -> list[dict[str, Any]]:
+        """Send `messages` over up to `pool_size` live connections.
+
+        Each connection sends its share back to back, so connect, STARTTLS and
+        AUTH are paid once per connection rather than once per message. Results
+        are returned in the order of `messages`, one per message.
+        """
+        results: list[dict[str, Any]] = [{} for _ in messages]
+        queue: asyncio.Queue[int] = asyncio.Queue()
+        for index in range(len(messages)):
+            queue.put_nowait(index)
+
+        async def drain():
+            while not queue.empty():
+                current: int | None = None
+                try:
+                    async with self.pool.connection() as client:
+                        while not queue.empty():
+                            current = queue.get_nowait()
+                            try:
+                                sent = await self._send(client, messages[current])
+                                results[current] = self._result(sent)
+                            except MESSAGE_ERRORS as e:
+                                # The server rejected this message only
+                                results[current] = self._result(e)
+                            current = None
+                except Exception as e:
+                    if current is not None:
+                        # The connection dropped: fail the message in flight
+                        # and carry on over a fresh connection
+                        logger.warning(f"SMTP connection failed mid-batch: {e}")
+                        results[current] = self._result(e)
+                        continue
+                    # No connection could be opened, so fail what is left
+                    logger.error(f"Failed to connect to SMTP server: {e}")
+                    while not queue.empty():
+                        results[queue.get_nowait()] = self._result(e)
+
+        workers = min(self.pool.max_size, len(messages))
+        await asyncio.gather(*(drain() for _ in range(workers)))
+        return results
+
+    async def close(self):
+        await self.pool.close()
+
+
+def create_mailer() -> Mailer:
+    """Build a mailer from the SMTP settings."""
+    return Mailer(
+        settings.SMTP_SERVER,
+        settings.SMTP_PORT,
+        settings.SMTP_USERNAME,
+        settings.SMTP_PASSWORD,
+        settings.SMTP_SENDER_EMAIL,
+        pool_size=settings.SMTP_POOL_SIZE,
+        idle_timeout=settings.SMTP_IDLE_TIMEOUT,
+        health_check_interval=settings.SMTP_HEALTH_CHECK_INTERVAL,
+        rate_limit=settings.SMTP_RATE_LIMIT,
+        rate_burst=settings.SMTP_RATE_BURST,
+        start_tls=settings.SMTP_START_TLS,
+    )
@@ -5,7 +5,7 @@ from uuid import UUID
 
 from pydantic import BaseModel as PydanticBaseModel
 from sqlmodel import Field, SQLModel
-from starlette.responses import JSONResponse
+from starlette.responses import JSONResponse, Response
 
 T = TypeVar("T")
 
@@ -64,3 +64,16 @@ class APIResponse(PydanticBaseModel, Generic[T]):
     data: T | None = None
     message: str | None = None
     meta: dict[str, Any] | None = None
+
+    def response(self, status_code: int = 200) -> Response:
+        """Serialize to JSON bytes with this model's pydantic-core serializer.
+
+        Returning the `Response` makes FastAPI skip validating and encoding the
+        result against the route's `response_model`, so use it only for data
+        the application built itself.
+        """
+        return Response(
+            self.__pydantic_serializer__.to_json(self),
+            status_code=status_code,
+            media_type="application/json",
+        )
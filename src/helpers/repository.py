@@ -1,18 +1,110 @@
+import base64
+import json
+from collections.abc import Hashable
+from contextvars import ContextVar
+from typing import Any
+
+from sqlalchemy import Select, func, select
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from core.database import SessionFactory
+from core.database import router
+from helpers.model import APIError
+
+
+def encode_cursor(*values: Any) -> str:
+    """Encode keyset values into an opaque, URL-safe pagination cursor."""
+    raw = json.dumps([str(value) for value in values], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, size: int) -> list[str]:
+    """Decode a cursor produced by `encode_cursor` back into its string values."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except ValueError:
+        raise APIError(400, "Invalid pagination cursor")
+    if (
+        not isinstance(values, list)
+        or len(values) != size
+        or not all(isinstance(value, str) for value in values)
+    ):
+        raise APIError(400, "Invalid pagination cursor")
+    return values
+
+
+def is_unique_violation(error: IntegrityError, index: str, column: str) -> bool:
+    """Whether `error` was raised by the unique `index` on `column` (table.column).
+
+    PostgreSQL reports the violated index by name; SQLite only names the column.
+    """
+    diag = getattr(error.orig, "diag", None)
+    constraint = getattr(diag, "constraint_name", None)
+    if constraint is not None:
+        return constraint == index
+    return f"UNIQUE constraint failed: {column}" in str(error.orig)
+
+
+# Open sessions of the current task, keyed by repository. One variable for all
+# repositories: a context keeps every variable ever set in it, so a variable per
+# instance would grow long-lived tasks by one entry per repository created. The
+# mapping is replaced rather than mutated, since child tasks share it.
+_sessions: ContextVar[dict["BaseRepository", AsyncSession] | None] = ContextVar(
+    "repository_sessions", default=None
+)
 
 
 class BaseRepository:
-    def __init__(self):
-        self._session: AsyncSession | None = None
+    """Repository base with a request-scoped database session.
+
+    The session lives in a context variable rather than on the instance, so a
+    single repository shared by every request hands each asyncio task its own
+    `AsyncSession` while still drawing connections from the pooled engine.
+    """
+
+    async def get_database_session(
+        self, readonly: bool = False, key: Hashable | None = None
+    ) -> AsyncSession:
+        """Return this task's session, opening one if needed.
 
-    async def get_database_session(self) -> AsyncSession:
-        if self._session is None:
-            self._session = SessionFactory()
-        return self._session
+        A `readonly` unit of work may be routed to a read replica unless `key`,
+        what it reads, was written too recently to have replicated.
+        """
+        sessions = _sessions.get() or {}
+        session = sessions.get(self)
+        if session is None:
+            session = router.session(readonly, key)
+            _sessions.set({**sessions, self: session})
+        return session
 
     async def close_database_session(self):
-        if self._session:
-            await self._session.close()
-            self._session = None
+        sessions = _sessions.get() or {}
+        session = sessions.get(self)
+        if session:
+            _sessions.set({repo: s for repo, s in sessions.items() if repo is not self})
+            await session.close()
+
+    async def count(
+        self, db: AsyncSession, statement: Select, estimate: bool = False
+    ) -> int:
+        """Count the rows matched by `statement`.
+
+        With `estimate` on PostgreSQL, the planner's row estimate is returned
+        instead, which avoids scanning the table on large listings.
+        """
+        if estimate and db.bind.dialect.name == "postgresql":
+            connection = await db.connection()
+            compiled = statement.compile(dialect=connection.dialect)
+            result = await connection.exec_driver_sql(
+                f"EXPLAIN (FORMAT JSON) {compiled}", compiled.params
+            )
+            plan = result.scalar_one()
+            if isinstance(plan, str):
+                plan = json.loads(plan)
+            return int(plan[0]["Plan"]["Plan Rows"])
+
+        result = await db.execute(
+            select(func.count()).select_from(statement.order_by(None).subquery())
+        )
+        return result.scalar_one()
@@ -0,0 +1,153 @@
+import asyncio
+import heapq
+import time
+from abc import ABC, abstractmethod
+from typing import Any
+
+from core.config import settings
+from helpers.logger import Logger
+
+logger = Logger(__name__)
+
+
+class RevocationStoreError(RuntimeError):
+    """Raised when the revocation store cannot be reached."""
+
+
+class RevocationStore(ABC):
+    """Storage for revoked token ids (`jti`), each kept until its token expires."""
+
+    @abstractmethod
+    async def revoke(self, jti: str, expires_at: float) -> bool:
+        """Revoke `jti` until `expires_at` (epoch seconds).
+
+        Returns False if the id was already revoked, which lets callers detect
+        refresh token reuse atomically. Raises RevocationStoreError if the
+        store cannot be reached.
+        """
+
+    @abstractmethod
+    async def is_revoked(self, jti: str) -> bool:
+        """Return True if `jti` has been revoked and has not yet expired.
+
+        Raises RevocationStoreError if the store cannot be reached.
+        """
+
+    async def close(self) -> None:  # noqa: B027
+        """Release any resources held by the store."""
+
+
+class MemoryRevocationStore(RevocationStore):
+    """Process-local store that evicts every entry once its token expires.
+
+    Entries are indexed by `jti` for O(1) lookups and ordered in a min-heap by
+    expiry, so expired ids are dropped cheaply on each revocation and memory
+    stays proportional to the number of revoked-but-still-valid tokens.
+    """
+
+    def __init__(self):
+        self._expiries: dict[str, float] = {}
+        self._heap: list[tuple[float, str]] = []
+
+    def _evict_expired(self, now: float):
+        while self._heap and self._heap[0][0] <= now:
+            expires_at, jti = heapq.heappop(self._heap)
+            if self._expiries.get(jti) == expires_at:
+                del self._expiries[jti]
+
+    async def revoke(self, jti: str, expires_at: float) -> bool:
+        now = time.time()
+        self._evict_expired(now)
+        if expires_at <= now:
+            return jti not in self._expiries
+        if jti in self._expiries:
+            return False
+        self._expiries[jti] = expires_at
+        heapq.heappush(self._heap, (expires_at, jti))
+        return True
+
+    async def is_revoked(self, jti: str) -> bool:
+        expires_at = self._expiries.get(jti)
+        return expires_at is not None and expires_at > time.time()
+
+    def __len__(self) -> int:
+        return len(self._expiries)
+
+
+class RedisRevocationStore(RevocationStore):
+    """Redis-backed store shared by every worker.
+
+    Each revoked id is a key with a TTL matching its token's expiry, so Redis
+    evicts it automatically. Concurrent `is_revoked` calls made in the same
+    loop iteration are coalesced into one pipelined round-trip.
+    """
+
+    def __init__(self, url: str, prefix: str = "revoked:"):
+        try:
+            from redis import asyncio as redis
+        except ImportError as e:
+            raise RuntimeError(
+                "The redis revocation backend requires the 'redis' package"
+            ) from e
+
+        self._client: Any = redis.from_url(url)
+        self._prefix = prefix
+        self._pending: dict[str, asyncio.Future[bool]] = {}
+        self._flush_task: asyncio.Task | None = None
+
+    def _key(self, jti: str) -> str:
+        return f"{self._prefix}{jti}"
+
+    async def revoke(self, jti: str, expires_at: float) -> bool:
+        ttl = max(int(expires_at - time.time()) + 1, 1)
+        try:
+            return bool(await self._client.set(self._key(jti), 1, ex=ttl, nx=True))
+        except Exception as e:
+            logger.error(f"Revoking token failed: {e}")
+            raise RevocationStoreError(f"Revocation store unavailable: {e}") from e
+
+    async def is_revoked(self, jti: str) -> bool:
+        future = self._pending.get(jti)
+        if future is None:
+            future = asyncio.get_running_loop().create_future()
+            self._pending[jti] = future
+            if self._flush_task is None:
+                self._flush_task = asyncio.create_task(self._flush())
+        return await asyncio.shield(future)
+
+    async def _flush(self):
+        # Yield once so every caller in this loop iteration joins the batch
+        await asyncio.sleep(0)
+        batch, self._pending = self._pending, {}
+        self._flush_task = None
+
+        try:
+            async with self._client.pipeline(transaction=False) as pipe:
+                for jti in batch:
+                    pipe.exists(self._key(jti))
+                results = await pipe.execute()
+        except Exception as e:
+            logger.error(f"Revocation lookup failed for {len(batch)} token(s): {e}")
+            for future in batch.values():
+                if not future.done():
+                    error = RevocationStoreError(f"Revocation store unavailable: {e}")
+                    error.__cause__ = e
+                    future.set_exception(error)
+            return
+
+        for future, exists in zip(batch.values(), results, strict=True):
+            if not future.done():
+                future.set_result(bool(exists))
+
+    async def close(self) -> None:
+        await self._client.aclose()
+
+
+def create_revocation_store() -> RevocationStore:
+    """Build the revocation store selected by `REVOCATION_BACKEND`."""
+    backend = settings.REVOCATION_BACKEND.lower()
+    if backend == "redis":
+        return RedisRevocationStore(str(settings.REDIS_URI))
+    if backend == "memory":
+        return MemoryRevocationStore()
+    raise ValueError(f"Unsupported revocation backend: {settings.REVOCATION_BACKEND}")
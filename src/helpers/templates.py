@@ -0,0 +1,157 @@
+import html
+from email import policy
+from email.charset import Charset
+from email.header import Header
+from email.mime.multipart import MIMEMultipart
+from email.mime.text import MIMEText
+from email.utils import formatdate, make_msgid
+from string import Template
+from typing import Any
+
+# Subject, plain text and HTML for each transactional email; fields use the
+# `string.Template` syntax (`${token}`, `$$` for a literal dollar sign)
+EMAIL_TEMPLATES: dict[str, dict[str, str]] = {
+    "email-verification": {
+        "subject": "Verify your email",
+        "text": "Your verification code is ${token}.\nIt expires in 24 hours.\n",
+        "html": (
+            "<p>Your verification code is <strong>${token}</strong>.</p>"
+            "<p>It expires in 24 hours.</p>"
+        ),
+    },
+    "email-authentication": {
+        "subject": "Your sign-in code",
+        "text": "Your sign-in code is ${token}.\nIt expires in 5 minutes.\n",
+        "html": (
+            "<p>Your sign-in code is <strong>${token}</strong>.</p>"
+            "<p>It expires in 5 minutes.</p>"
+        ),
+    },
+    "password-reset": {
+        "subject": "Reset your password",
+        "text": "Your password reset code is ${token}.\nIt expires in 1 hour.\n",
+        "html": (
+            "<p>Your password reset code is <strong>${token}</strong>.</p>"
+            "<p>It expires in 1 hour.</p>"
+        ),
+    },
+}
+
+# Bodies are sent as 8bit so that fields can be substituted into them verbatim
+_BODY_CHARSET = Charset("utf-8")
+_BODY_CHARSET.body_encoding = None
+
+
+class RenderedEmail:
+    """A complete RFC 5322 message, ready to hand to `SMTP.sendmail`."""
+
+    __slots__ = ("sender", "recipient", "message")
+
+    def __init__(self, sender: str, recipient: str, message: bytes):
+        self.sender = sender
+        self.recipient = recipient
+        self.message = message
+
+    def __repr__(self):
+        return f"<RenderedEmail to {self.recipient}>"
+
+
+class EmailTemplate:
+    """Email whose MIME structure is built once and then only filled in.
+
+    Compiling produces the serialized multipart message with placeholders for
+    the per-message headers and the template fields, so rendering is a single
+    `string.Template` substitution rather than building and serializing a
+    MIME tree for every recipient.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        sender: str,
+        subject: str,
+        text: str,
+        html: str | None = None,
+    ):
+        self.name = name
+        self.sender = sender
+        self.subject = Template(subject)
+        # An explicit domain spares make_msgid a hostname lookup per message
+        self._domain = sender.rpartition("@")[2] or "localhost"
+        self._skeleton = self._compile(text, html)
+
+    @staticmethod
+    def _part(body: str, subtype: str) -> MIMEText:
+        part = MIMEText(body, subtype, _BODY_CHARSET)
+        # An ASCII-only body is labelled 7bit, which fields may not honour
+        del part["Content-Transfer-Encoding"]
+        part["Content-Transfer-Encoding"] = "8bit"
+        return part
+
+    def _compile(self, text: str, html_body: str | None) -> Template:
+        message = MIMEMultipart("alternative")
+        message.attach(self._part(text, "plain"))
+        if html_body is not None:
+            # HTML fields get their own, escaped, values at render time
+            html_body = Template.pattern.sub(
+                lambda m: (
+                    f"${{html_{m.group('named') or m.group('braced')}}}"
+                    if m.group("named") or m.group("braced")
+                    else m.group()
+                ),
+                html_body,
+            )
+            message.attach(self._part(html_body, "html"))
+
+        message["From"] = self.sender.replace("$", "$$")
+        message["To"] = "${_to}"
+        message["Subject"] = "${_subject}"
+        message["Date"] = "${_date}"
+        message["Message-ID"] = "${_message_id}"
+        return Template(message.as_bytes(policy=policy.SMTP).decode())
+
+    def render(self, recipient: str, **context: Any) -> RenderedEmail:
+        """Fill in the skeleton for one recipient; raises KeyError on a missing field."""
+        if "\r" in recipient or "\n" in recipient:
+            raise ValueError("Invalid recipient")
+        subject = self.subject.substitute(context)
+        if "\r" in subject or "\n" in subject:
+            raise ValueError("Invalid subject")
+        if not subject.isascii():
+            subject = Header(subject, "utf-8").encode()
+
+        fields: dict[str, str] = {
+            "_to": recipient,
+            "_subject": subject,
+            "_date": formatdate(localtime=False),
+            "_message_id": make_msgid(domain=self._domain),
+        }
+        for key, value in context.items():
+            value = str(value).replace("\r\n", "\n").replace("\n", "\r\n")
+            fields[key] = value
+            fields[f"html_{key}"] = html.escape(value)
+
+        message = self._skeleton.substitute(fields).encode()
+        return RenderedEmail(self.sender, recipient, message)
+
+
+class EmailTemplates:
+    """Registry of compiled email templates for one sender."""
+
+    def __init__(
+        self, sender: str, definitions: dict[str, dict[str, str]] = EMAIL_TEMPLATES
+    ):
+        self.sender = sender
+        self._templates = {
+            name: EmailTemplate(name, sender, **definition)
+            for name, definition in definitions.items()
+        }
+
+    def get(self, name: str) -> EmailTemplate:
+        template = self._templates.get(name)
+        if template is None:
+            raise KeyError(f"Unknown email template: {name}")
+        return template
+
+    def render(self, name: str, recipient: str, **context: Any) -> RenderedEmail:
+        return self.get(name).render(recipient, **context)
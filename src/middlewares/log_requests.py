@@ -1,50 +1,84 @@
+import logging
+import random
 import time
-from collections.abc import Callable
 
-from fastapi import Request, Response
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.types import ASGIApp
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
+from core.config import settings
 from helpers.logger import Logger
 
 logger = Logger(__name__)
 
 
-class LogRequests(BaseHTTPMiddleware):
-    def __init__(self, app: ASGIApp):
-        super().__init__(app)
+def _client_ip(scope: Scope) -> str:
+    # Get client IP, handling potential proxy headers
+    for name, value in scope.get("headers", ()):
+        if name == b"x-forwarded-for":
+            return value.decode("latin-1").split(",")[0].strip()
+    client = scope.get("client")
+    return client[0] if client else "unknown"
 
-    async def dispatch(self, request: Request, call_next: Callable) -> Response:
-        start_time = time.time()
 
-        # Get client IP, handling potential proxy headers
-        client_ip = request.client.host if request.client else "unknown"
-        forwarded_for = request.headers.get("X-Forwarded-For")
-        if forwarded_for:
-            client_ip = forwarded_for.split(",")[0].strip()
+class LogRequests:
+    """Pure ASGI access-log middleware.
 
-        # Log request
-        logger.info(
-            f"Incoming request | {request.method} {request.url.path} | Client IP: {client_ip}"
-        )
+    Only a `sample_rate` fraction of successful requests is logged, and log
+    arguments are passed through for lazy formatting. Failed requests, whether
+    they raise or respond with a 5xx status, are always logged.
+    """
 
-        try:
-            response = await call_next(request)
-            process_time = time.time() - start_time
+    def __init__(
+        self, app: ASGIApp, sample_rate: float = settings.LOG_REQUESTS_SAMPLE_RATE
+    ):
+        self.app = app
+        self.sample_rate = sample_rate
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
 
-            # Log response
-            logger.info(
-                f"Request completed | {request.method} {request.url.path} | "
-                f"Status: {response.status_code} | Time: {process_time:.3f}s | "
-                f"Client IP: {client_ip}"
-            )
-            return response
+        start_time = time.perf_counter_ns()
+        status_code = 500
 
+        async def send_wrapper(message: Message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
         except Exception as e:
-            process_time = time.time() - start_time
-            logger.error(
-                f"Request failed | {request.method} {request.url.path} | "
-                f"Error: {str(e)} | Time: {process_time:.3f}s | "
-                f"Client IP: {client_ip}"
-            )
+            self._log_failure(scope, e, start_time)
             raise
+
+        # Server errors bypass sampling, like raised exceptions
+        if status_code >= 500:
+            log = logger.error
+        elif logger.isEnabledFor(logging.INFO) and (
+            self.sample_rate >= 1.0 or random.random() < self.sample_rate
+        ):
+            log = logger.info
+        else:
+            return
+
+        log(
+            "Request completed | %s %s | Status: %d | Time: %.3fs | Client IP: %s",
+            scope["method"],
+            scope["path"],
+            status_code,
+            (time.perf_counter_ns() - start_time) / 1e9,
+            _client_ip(scope),
+        )
+
+    @staticmethod
+    def _log_failure(scope: Scope, error: Exception, start_time: int):
+        logger.error(
+            "Request failed | %s %s | Error: %s | Time: %.3fs | Client IP: %s",
+            scope["method"],
+            scope["path"],
+            error,
+            (time.perf_counter_ns() - start_time) / 1e9,
+            _client_ip(scope),
+        )
@@ -0,0 +1,22 @@
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from core.database import router
+
+
+class UnitOfWork:
+    """Pure ASGI middleware making each request one database unit of work.
+
+    Once a request commits a write, its later reads stay on the primary; the
+    next request starts out reading from the replicas again.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        with router.unit_of_work():
+            await self.app(scope, receive, send)
@@ -1,5 +1,7 @@
 from sqlmodel import SQLModel
 
+from models.emails import EmailOutbox
+from models.events import EventOutbox
 from models.users import Users
 
-__all__ = ["Users", "SQLModel"]
+__all__ = ["EmailOutbox", "EventOutbox", "Users", "SQLModel"]
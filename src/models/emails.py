@@ -0,0 +1,57 @@
+import uuid
+from datetime import datetime
+from enum import Enum
+from typing import Any
+from uuid import UUID
+
+from sqlalchemy import Column, DateTime, Index, Text
+from sqlalchemy.dialects.postgresql import JSON
+from sqlmodel import Field, SQLModel
+
+from helpers.model import utc_now
+
+
+class EmailStatus(str, Enum):
+    PENDING = "pending"
+    SENT = "sent"
+    FAILED = "failed"
+
+
+class EmailOutbox(SQLModel, table=True):
+    """Queued outbound email, delivered by the standalone email worker.
+
+    `idempotency_key` is unique, so enqueueing the same message twice within
+    its deduplication window leaves a single row. Rows either name a compiled
+    `template` and the `context` to render it with, or carry a ready `subject`
+    and `body`.
+    """
+
+    __tablename__ = "email_outbox"
+    __table_args__ = (
+        Index("ix_email_outbox_idempotency_key", "idempotency_key", unique=True),
+        Index("ix_email_outbox_status_available_at", "status", "available_at"),
+    )
+
+    id: UUID = Field(default_factory=uuid.uuid4, primary_key=True, nullable=False)
+    idempotency_key: str = Field(max_length=255)
+    recipient: str = Field(max_length=320)
+    template: str | None = Field(default=None, max_length=64)
+    context: dict[str, Any] | None = Field(default=None, sa_type=JSON)
+    subject: str | None = Field(default=None, max_length=255)
+    body: str | None = Field(default=None, sa_type=Text)
+    is_html: bool = Field(default=False)
+    status: EmailStatus = Field(default=EmailStatus.PENDING)
+    attempts: int = Field(default=0)
+    last_error: str | None = Field(default=None, sa_type=Text)
+    created_at: datetime = Field(
+        default_factory=utc_now, sa_column=Column(DateTime(timezone=True))
+    )
+    available_at: datetime = Field(
+        default_factory=utc_now, sa_column=Column(DateTime(timezone=True))
+    )
+    locked_until: datetime | None = Field(
+        default=None, sa_column=Column(DateTime(timezone=True))
+    )
+    sent_at: datetime | None = Field(
+        default=None, sa_column=Column(DateTime(timezone=True))
+    )
@@ -0,0 +1,31 @@
+import uuid
+from datetime import datetime
+from typing import Any
+from uuid import UUID
+
+from sqlalchemy import Column, DateTime, Index
+from sqlalchemy.dialects.postgresql import JSON
+from sqlmodel import Field, SQLModel
+
+from helpers.model import utc_now
+
+
+class EventOutbox(SQLModel, table=True):
+    """Durable queue row for an emitted event, deleted once it is acknowledged."""
+
+    __tablename__ = "event_outbox"
+    __table_args__ = (Index("ix_event_outbox_available_at", "available_at"),)
+
+    id: UUID = Field(default_factory=uuid.uuid4, primary_key=True, nullable=False)
+    event: str = Field(max_length=255)
+    payload: dict[str, Any] = Field(default_factory=dict, sa_type=JSON)
+    attempts: int = Field(default=0)
+    created_at: datetime = Field(
+        default_factory=utc_now, sa_column=Column(DateTime(timezone=True))
+    )
+    available_at: datetime = Field(
+        default_factory=utc_now, sa_column=Column(DateTime(timezone=True))
+    )
+    locked_until: datetime | None = Field(
+        default=None, sa_column=Column(DateTime(timezone=True))
+    )
@@ -0,0 +1,185 @@
+from datetime import datetime, timedelta
+from typing import Any
+from uuid import UUID
+
+from sqlalchemy import delete, or_, update
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlmodel import select
+
+from core.config import settings
+from helpers.model import utc_now
+from helpers.repository import BaseRepository
+from models.emails import EmailOutbox, EmailStatus
+
+
+class EmailOutboxRepository(BaseRepository):
+    """Persistent queue of outbound emails.
+
+    The API only inserts rows, inside its own transaction; the standalone
+    email worker claims, delivers and settles them.
+    """
+
+    async def enqueue(
+        self,
+        db: AsyncSession,
+        purpose: str,
+        recipient: str,
+        subject: str,
+        body: str,
+        is_html: bool = False,
+        window: int = settings.EMAIL_DEDUP_WINDOW,
+    ) -> bool:
+        """Queue an email as part of the caller's (uncommitted) transaction.
+
+        The idempotency key combines `purpose`, `recipient` and the current
+        `window`-second slot, so returns False without queueing anything when
+        the same email was already queued in that slot.
+        """
+        return await self._insert(
+            db,
+            purpose,
+            recipient,
+            window,
+            subject=subject,
+            body=body,
+            is_html=is_html,
+        )
+
+    async def enqueue_template(
+        self,
+        db: AsyncSession,
+        template: str,
+        recipient: str,
+        context: dict[str, Any],
+        window: int = settings.EMAIL_DEDUP_WINDOW,
+    ) -> bool:
+        """Queue a templated email, rendered by the worker at delivery time.
+
+        Deduplicated like `enqueue`, with the template name as the purpose.
+        """
+        return await self._insert(
+            db, template, recipient, window, template=template, context=context
+        )
+
+    async def _insert(
+        self,
+        db: AsyncSession,
+        purpose: str,
+        recipient: str,
+        window: int,
+        **fields: Any,
+    ) -> bool:
+        now = utc_now()
+        slot = int(now.timestamp() // window) if window > 0 else now.timestamp()
+        row = EmailOutbox(
+            idempotency_key=f"{purpose}:{recipient}:{slot}",
+            recipient=recipient,
+            created_at=now,
+            available_at=now,
+            **fields,
+        ).model_dump()
+
+        dialect_insert = (
+            sqlite_insert if db.bind.dialect.name == "sqlite" else postgresql_insert
+        )
+        result = await db.execute(
+            dialect_insert(EmailOutbox)
+            .values(row)
+            .on_conflict_do_nothing(index_elements=["idempotency_key"])
+            .returning(EmailOutbox.id)
+        )
+        return result.scalar_one_or_none() is not None
+
+    async def claim(
+        self, batch_size: int, visibility_timeout: float
+    ) -> list[EmailOutbox]:
+        """Lock up to `batch_size` due emails for `visibility_timeout` seconds.
+
+        Rows are picked with `FOR UPDATE SKIP LOCKED`, so concurrent workers
+        never claim the same email; a claim that is never settled expires and
+        the email becomes due again.
+        """
+        db: AsyncSession = await self.get_database_session()
+        try:
+            now = utc_now()
+            claimable = (
+                select(EmailOutbox.id)
+                .where(
+                    EmailOutbox.status == EmailStatus.PENDING,
+                    EmailOutbox.available_at <= now,
+                    or_(
+                        EmailOutbox.locked_until.is_(None),
+                        EmailOutbox.locked_until < now,
+                    ),
+                )
+                .order_by(EmailOutbox.available_at)
+                .limit(batch_size)
+                .with_for_update(skip_locked=True)
+            )
+            result = await db.execute(
+                update(EmailOutbox)
+                .where(EmailOutbox.id.in_(claimable.scalar_subquery()))
+                .values(
+                    locked_until=now + timedelta(seconds=visibility_timeout),
+                    attempts=EmailOutbox.attempts + 1,
+                )
+                .returning(EmailOutbox)
+                .execution_options(synchronize_session=False)
+            )
+            emails = list(result.scalars().all())
+            await db.commit()
+            return emails
+        finally:
+            await self.close_database_session()
+
+    async def mark_sent(self, ids: list[UUID]):
+        if not ids:
+            return
+        db: AsyncSession = await self.get_database_session()
+        try:
+            await db.execute(
+                update(EmailOutbox)
+                .where(EmailOutbox.id.in_(ids))
+                .values(
+                    status=EmailStatus.SENT,
+                    sent_at=utc_now(),
+                    locked_until=None,
+                    last_error=None,
+                )
+            )
+            await db.commit()
+        finally:
+            await self.close_database_session()
+
+    async def mark_failed(self, id: UUID, error: str, retry_at: datetime | None):
+        """Record a failed attempt; with no `retry_at` the email is abandoned."""
+        db: AsyncSession = await self.get_database_session()
+        try:
+            values = {"locked_until": None, "last_error": error}
+            if retry_at is None:
+                values["status"] = EmailStatus.FAILED
+            else:
+                values["available_at"] = retry_at
+            await db.execute(
+                update(EmailOutbox).where(EmailOutbox.id == id).values(**values)
+            )
+            await db.commit()
+        finally:
+            await self.close_database_session()
+
+    async def prune(self, before: datetime) -> int:
+        """Delete settled emails created before `before`."""
+        db: AsyncSession = await self.get_database_session()
+        try:
+            result = await db.execute(
+                delete(EmailOutbox).where(
+                    EmailOutbox.status != EmailStatus.PENDING,
+                    EmailOutbox.created_at < before,
+                )
+            )
+            await db.commit()
+            return result.rowcount
+        finally:
+            await self.close_database_session()
@@ -1,28 +1,47 @@
-from collections.abc import Awaitable, Callable
+import csv
+import io
+import json
+from collections.abc import AsyncIterator, Awaitable, Callable
 from datetime import datetime, timedelta, timezone
-from typing import cast
+from typing import Any, cast
 from uuid import UUID
 
+from sqlalchemy import Select, bindparam, tuple_, update
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import defer, load_only
 from sqlmodel import select
 
+from core.config import settings
+from core.database import router
 from helpers.auth import (
     create_access_token,
     create_one_time_password,
     create_refresh_token,
-    hash_password,
+    hash_password_async,
+    hash_passwords_async,
+    revoke_token,
     rotate_refresh_token,
-    token_blacklist,
-    verify_password,
+    verify_password_async,
     verify_refresh_token,
 )
+from helpers.cache import ReadThroughCache, create_read_through_cache
 from helpers.model import APIError, APIResponse
-from helpers.repository import BaseRepository
+from helpers.repository import (
+    BaseRepository,
+    decode_cursor,
+    encode_cursor,
+    is_unique_violation,
+)
 from models.users import (
     UserAuthRead,
     UserAuthTokens,
+    UserBulkCreateResult,
+    UserBulkCreateStatus,
     UserCreate,
+    UserExportFormat,
     UserInvalidate,
     UserManage,
     UserManageAction,
@@ -33,29 +52,167 @@ from models.users import (
     UserUpdate,
     UserValidate,
 )
+from repositories.emails import EmailOutboxRepository
+
+email_outbox: EmailOutboxRepository = EmailOutboxRepository()
+
+# UserRead projections of non-deleted users, keyed by id and by email
+user_cache: ReadThroughCache[UserRead] = create_read_through_cache(
+    "users",
+    keys=lambda user: (f"id:{user.id}", f"email:{user.email}"),
+    dumps=lambda user: user.model_dump_json().encode(),
+    loads=UserRead.model_validate_json,
+    max_size=settings.USER_CACHE_SIZE,
+    ttl=settings.USER_CACHE_TTL,
+    local_ttl=settings.USER_CACHE_LOCAL_TTL,
+)
+
+# The columns `UserRead` shows; reads select only these rather than whole rows
+USER_READ_COLUMNS = tuple(getattr(Users, name) for name in UserRead.model_fields)
+
+# Hot lookups are built once with bound parameters: SQLAlchemy compiles each
+# a single time into its compiled cache, and psycopg sees identical SQL it
+# can prepare server-side
+ACTIVE_USER_BY_EMAIL = select(*USER_READ_COLUMNS).where(
+    Users.email == bindparam("email"),
+    Users.is_deleted == False,  # noqa: E712
+)
+ACTIVE_USER_BY_ID = select(*USER_READ_COLUMNS).where(
+    Users.id == bindparam("id"),
+    Users.is_deleted == False,  # noqa: E712
+)
+USER_BY_ID = select(*USER_READ_COLUMNS).where(Users.id == bindparam("id"))
+
+# Entities for write paths, loading only the columns each path needs
+ACTIVE_USER_FOR_UPDATE = (
+    select(Users)
+    .options(load_only(*USER_READ_COLUMNS))
+    .where(
+        Users.id == bindparam("id"),
+        Users.is_deleted == False,  # noqa: E712
+    )
+)
+ACTIVE_USER_FOR_AUTH = (
+    select(Users)
+    .options(load_only(*USER_READ_COLUMNS, Users.password))
+    .where(
+        Users.email == bindparam("email"),
+        Users.is_deleted == False,  # noqa: E712
+    )
+)
+ACTIVE_USER_FOR_MANAGE = (
+    select(Users)
+    .options(defer(Users.meta_data))
+    .where(
+        Users.email == bindparam("email"),
+        Users.is_deleted == False,  # noqa: E712
+    )
+)
 
 
 class UserRespository(BaseRepository):
+    @staticmethod
+    def _filters(query: UserQuery, exclude_deleted: bool) -> list[Any]:
+        filters = []
+        if query.first_name:
+            filters.append(Users.first_name == query.first_name)
+        if query.last_name:
+            filters.append(Users.last_name == query.last_name)
+        if query.email:
+            filters.append(Users.email == query.email)
+        if exclude_deleted:
+            filters.append(Users.is_deleted == False)  # noqa: E712
+        return filters
+
     async def create(self, payload: UserCreate) -> APIResponse[UserRead] | None:
         db: AsyncSession = await self.get_database_session()
         try:
-            statement = select(Users).where(
-                Users.email == payload.email,
-                Users.is_deleted == False,  # noqa: E712
-            )
-            result = await db.execute(statement)
-            if result.scalar_one_or_none():
-                raise APIError(409, "User with this email already exists")
-
             user = Users(
                 **payload.model_dump(exclude={"password"}),
-                password=hash_password(payload.password),
+                password=await hash_password_async(payload.password),
             )
             db.add(user)
             await db.commit()
-            await db.refresh(user)
             data = UserRead.model_validate(user)
             return APIResponse[UserRead](data=data)
+        except IntegrityError as e:
+            await db.rollback()
+            # The unique index is the existence check, saving a SELECT per signup
+            if is_unique_violation(e, "ix_users_email", "users.email"):
+                raise APIError(409, "User with this email already exists") from e
+            raise APIError(400, "Database integrity error") from e
+        finally:
+            await self.close_database_session()
+
+    async def bulk_create(
+        self, payloads: list[UserCreate], batch_size: int = 500
+    ) -> APIResponse[list[UserBulkCreateResult]] | None:
+        """Create many users with one lookup and one multi-row insert per batch.
+
+        Returns a per-row report in input order: `created` with the new id,
+        `exists` if the email is already taken, or `duplicate` if it appeared
+        earlier in the same payload.
+        """
+        db: AsyncSession = await self.get_database_session()
+        try:
+            report: list[UserBulkCreateResult | None] = []
+            unique: dict[str, UserCreate] = {}
+            for payload in payloads:
+                if payload.email in unique:
+                    report.append(
+                        UserBulkCreateResult(
+                            email=payload.email, status=UserBulkCreateStatus.DUPLICATE
+                        )
+                    )
+                else:
+                    unique[payload.email] = payload
+                    report.append(None)
+
+            result = await db.execute(
+                select(Users.email).where(Users.email.in_(list(unique)))
+            )
+            existing = set(result.scalars().all())
+            pending = [p for email, p in unique.items() if email not in existing]
+
+            hashes = await hash_passwords_async([p.password for p in pending])
+            rows = [
+                Users(
+                    **p.model_dump(exclude={"password"}), password=hashed
+                ).model_dump()
+                for p, hashed in zip(pending, hashes, strict=True)
+            ]
+
+            dialect_insert = (
+                sqlite_insert if db.bind.dialect.name == "sqlite" else postgresql_insert
+            )
+            created: dict[str, UUID] = {}
+            for start in range(0, len(rows), batch_size):
+                statement = (
+                    dialect_insert(Users)
+                    .values(rows[start : start + batch_size])
+                    .on_conflict_do_nothing(index_elements=["email"])
+                    .returning(Users.id, Users.email)
+                )
+                result = await db.execute(statement)
+                created.update({email: id for id, email in result.all()})
+            await db.commit()
+
+            data: list[UserBulkCreateResult] = []
+            for payload, entry in zip(payloads, report, strict=True):
+                if entry is None:
+                    user_id = created.get(payload.email)
+                    entry = UserBulkCreateResult(
+                        email=payload.email,
+                        status=UserBulkCreateStatus.CREATED
+                        if user_id
+                        else UserBulkCreateStatus.EXISTS,
+                        id=user_id,
+                    )
+                data.append(entry)
+            return APIResponse[list[UserBulkCreateResult]](
+                data=data,
+                meta={"requested": len(payloads), "created": len(created)},
+            )
         except IntegrityError as e:
             await db.rollback()
             raise APIError(400, "Database integrity error") from e
@@ -67,63 +224,161 @@ class UserRespository(BaseRepository):
         query: UserQuery,
         skip: int = 0,
         limit: int = 20,
+        cursor: str | None = None,
         exclude_deleted: bool = True,
+        with_total: bool = False,
     ) -> APIResponse[list[UserRead]] | None:
-        db: AsyncSession = await self.get_database_session()
+        """List users ordered by `(created_at, id)`.
+
+        Pass the previous page's `next_cursor` as `cursor` for keyset
+        pagination; otherwise `skip` offsets from the start, which is only
+        suitable for small listings. `with_total` adds an approximate total.
+        """
+        db: AsyncSession = await self.get_database_session(readonly=True)
         try:
-            filters = []
-            if query.first_name:
-                filters.append(Users.first_name == query.first_name)
-            if query.last_name:
-                filters.append(Users.last_name == query.last_name)
-            if query.email:
-                filters.append(Users.email == query.email)
-            if exclude_deleted:
-                filters.append(Users.is_deleted == False)  # noqa: E712
-
-            statement = select(Users)
-            if filters:
-                statement = statement.where(*filters)
-
-            statement = statement.offset(skip).limit(limit)
-            result = await db.execute(statement)
-            users = result.scalars().all()
-
-            data = [UserRead.model_validate(user) for user in users]
-            return APIResponse[list[UserRead]](
-                data=data,
-                meta={"skip": skip, "limit": limit, "count": len(data)},
+            statement = select(*USER_READ_COLUMNS).where(
+                *self._filters(query, exclude_deleted)
+            )
+
+            meta: dict[str, Any] = {"limit": limit}
+            if with_total:
+                meta["total"] = await self.count(db, statement, estimate=True)
+                meta["total_is_estimate"] = db.bind.dialect.name == "postgresql"
+
+            page = statement.order_by(Users.created_at, Users.id)
+            if cursor:
+                cursor_created_at, cursor_id = decode_cursor(cursor, 2)
+                try:
+                    after = (datetime.fromisoformat(cursor_created_at), UUID(cursor_id))
+                except ValueError:
+                    raise APIError(400, "Invalid pagination cursor")
+                page = page.where(tuple_(Users.created_at, Users.id) > after)
+            else:
+                page = page.offset(skip)
+                meta["skip"] = skip
+
+            # Fetch one extra row to learn whether another page exists
+            result = await db.execute(page.limit(limit + 1))
+            users = result.all()
+
+            # Rows come straight from the projected columns, so skip validation
+            data = [UserRead.model_construct(**user._mapping) for user in users[:limit]]
+            meta["count"] = len(data)
+            meta["next_cursor"] = (
+                encode_cursor(data[-1].created_at.isoformat(), data[-1].id)
+                if len(users) > limit
+                else None
+            )
+            return APIResponse[list[UserRead]](data=data, meta=meta)
+        finally:
+            await self.close_database_session()
+
+    async def export(
+        self,
+        query: UserQuery,
+        format: UserExportFormat = UserExportFormat.NDJSON,
+        chunk_size: int = 1000,
+        exclude_deleted: bool = True,
+    ) -> AsyncIterator[bytes]:
+        """Stream matching users as NDJSON or CSV, one encoded chunk per batch.
+
+        Rows are read through a server-side cursor `chunk_size` at a time, so
+        memory use does not grow with the size of the table.
+        """
+        # Not the task's shared session: after a client disconnect the
+        # generator may be finalised in another context, so it keeps its own
+        db: AsyncSession = router.session()
+        try:
+            statement = (
+                select(*USER_READ_COLUMNS)
+                .where(*self._filters(query, exclude_deleted))
+                .order_by(Users.created_at, Users.id)
+                .execution_options(yield_per=chunk_size)
             )
+            result = await db.stream(statement)
+
+            buffer = io.StringIO()
+            writer = csv.writer(buffer)
+            if format == UserExportFormat.CSV:
+                writer.writerow(UserRead.model_fields)
+
+            async for users in result.partitions():
+                for user in users:
+                    data = UserRead.model_validate(user)
+                    if format == UserExportFormat.CSV:
+                        row = data.model_dump(mode="json")
+                        row["meta_data"] = json.dumps(row["meta_data"])
+                        writer.writerow(row.values())
+                    else:
+                        buffer.write(data.model_dump_json())
+                        buffer.write("\n")
+
+                yield buffer.getvalue().encode()
+                buffer.seek(0)
+                buffer.truncate()
+
+            if buffer.tell():
+                yield buffer.getvalue().encode()
+        finally:
+            await db.close()
+
+    async def _load_user(
+        self, key: str, statement: Select, params: dict[str, Any]
+    ) -> UserRead | None:
+        db: AsyncSession = await self.get_database_session(readonly=True, key=key)
+        try:
+            result = await db.execute(statement, params)
+            user = result.one_or_none()
+            return UserRead.model_validate(user) if user else None
         finally:
             await self.close_database_session()
 
+    async def _invalidate_user(self, id: UUID, *emails: str | None):
+        """Drop a user's cached projections once a write to it has committed.
+
+        Reads of the same keys are also kept on the primary until the write
+        has had time to reach the replicas.
+        """
+        keys = (f"id:{id}", *(f"email:{email}" for email in emails if email))
+        router.mark_written(*keys)
+        await user_cache.invalidate(*keys)
+
     async def get(
         self, id: UUID, include_deleted: bool = False
     ) -> APIResponse[UserRead] | None:
-        db: AsyncSession = await self.get_database_session()
-        try:
-            statement = select(Users).where(Users.id == id)
-            if not include_deleted:
-                statement = statement.where(Users.is_deleted == False)  # noqa: E712
-
-            result = await db.execute(statement)
-            user = result.scalar_one_or_none()
+        key = f"id:{id}"
+        if include_deleted:
+            db: AsyncSession = await self.get_database_session(readonly=True, key=key)
+            try:
+                result = await db.execute(USER_BY_ID, {"id": id})
+                user = result.one_or_none()
+                data = UserRead.model_validate(user) if user else None
+            finally:
+                await self.close_database_session()
+        else:
+            data = await user_cache.get(
+                key, lambda: self._load_user(key, ACTIVE_USER_BY_ID, {"id": id})
+            )
 
-            if not user:
-                raise APIError(404, "User not found")
+        if not data:
+            raise APIError(404, "User not found")
+        return APIResponse[UserRead](data=data)
 
-            data = UserRead.model_validate(user)
-            return APIResponse[UserRead](data=data)
-        finally:
-            await self.close_database_session()
+    async def get_by_email(self, email: str) -> APIResponse[UserRead] | None:
+        key = f"email:{email}"
+        data = await user_cache.get(
+            key, lambda: self._load_user(key, ACTIVE_USER_BY_EMAIL, {"email": email})
+        )
+        if not data:
+            raise APIError(404, "User not found")
+        return APIResponse[UserRead](data=data)
 
     async def update(
         self, id: UUID, payload: UserUpdate
     ) -> APIResponse[UserRead] | None:
         db: AsyncSession = await self.get_database_session()
         try:
-            statement = select(Users).where(Users.id == id, Users.is_deleted == False)  # noqa: E712
-            result = await db.execute(statement)
+            result = await db.execute(ACTIVE_USER_FOR_UPDATE, {"id": id})
             user = result.scalar_one_or_none()
 
             if not user:
@@ -131,30 +386,26 @@ class UserRespository(BaseRepository):
 
             update_data = payload.model_dump(exclude_unset=True)
 
-            new_email = update_data.get("email")
-            if new_email and new_email != user.email:
-                email_check_statement = select(Users).where(
-                    Users.email == new_email,
-                    Users.id != id,
-                    Users.is_deleted == False,  # noqa: E712
-                )
-                email_check = await db.execute(email_check_statement)
-                if email_check.scalar_one_or_none():
-                    raise APIError(409, "Another user with this email already exists")
-
             if "password" in update_data:
-                update_data["password"] = hash_password(update_data["password"])
+                update_data["password"] = await hash_password_async(
+                    update_data["password"]
+                )
 
+            previous_email = user.email
             for key, value in update_data.items():
                 setattr(user, key, value)
 
             db.add(user)
             await db.commit()
-            await db.refresh(user)
+            await self._invalidate_user(user.id, previous_email, user.email)
             data = UserRead.model_validate(user)
             return APIResponse[UserRead](data=data)
         except IntegrityError as e:
             await db.rollback()
+            if is_unique_violation(e, "ix_users_email", "users.email"):
+                raise APIError(
+                    409, "Another user with this email already exists"
+                ) from e
             raise APIError(400, "Database integrity error") from e
         finally:
             await self.close_database_session()
@@ -162,8 +413,7 @@ class UserRespository(BaseRepository):
     async def delete(self, id: UUID) -> APIResponse | None:
         db: AsyncSession = await self.get_database_session()
         try:
-            statement = select(Users).where(Users.id == id, Users.is_deleted == False)  # noqa: E712
-            result = await db.execute(statement)
+            result = await db.execute(ACTIVE_USER_FOR_UPDATE, {"id": id})
             user = result.scalar_one_or_none()
 
             if not user:
@@ -172,6 +422,7 @@ class UserRespository(BaseRepository):
             user.soft_delete()
             db.add(user)
             await db.commit()
+            await self._invalidate_user(user.id, user.email)
             return APIResponse(message="User soft-deleted")
         finally:
             await self.close_database_session()
@@ -179,23 +430,19 @@ class UserRespository(BaseRepository):
     async def validate(self, payload: UserValidate) -> APIResponse[UserAuthRead] | None:
         db: AsyncSession = await self.get_database_session()
         try:
-            stmt = select(Users).where(
-                Users.email == payload.email,
-                Users.is_deleted == False,  # noqa: E712
-            )
-            result = await db.execute(stmt)
+            result = await db.execute(ACTIVE_USER_FOR_AUTH, {"email": payload.email})
             user = result.scalar_one_or_none()
 
             if not user:
                 raise APIError(404, "User not found")
 
-            if not verify_password(payload.password, user.password):
+            if not await verify_password_async(payload.password, user.password):
                 raise APIError(401, "Invalid credentials")
 
             user.authenticated_at = datetime.utcnow()
             db.add(user)
             await db.commit()
-            await db.refresh(user)
+            await self._invalidate_user(user.id, user.email)
 
             data = UserAuthRead(
                 auth=UserAuthTokens(
@@ -211,46 +458,32 @@ class UserRespository(BaseRepository):
     async def revalidate(
         self, payload: UserRevalidate
     ) -> APIResponse[UserAuthRead] | None:
-        db: AsyncSession = await self.get_database_session()
-        try:
-            auth_data = verify_refresh_token(payload.refresh_token)
-            if not auth_data:
-                raise APIError(401, "Invalid or expired refresh token")
-
-            user_email = auth_data["sub"]
-            access_token, new_refresh_token = rotate_refresh_token(
-                payload.refresh_token
-            )
+        auth_data = await verify_refresh_token(payload.refresh_token)
+        if not auth_data:
+            raise APIError(401, "Invalid or expired refresh token")
 
-            stmt = select(Users).where(
-                Users.email == user_email,
-                Users.is_deleted == False,  # noqa: E712
-            )
-            result = await db.execute(stmt)
-            user = result.scalar_one_or_none()
+        user_email = auth_data["sub"]
+        access_token, new_refresh_token = await rotate_refresh_token(
+            payload.refresh_token
+        )
 
-            if not user:
-                raise APIError(404, "User not found")
+        user = await self.get_by_email(user_email)
 
-            data = UserAuthRead(
-                auth=UserAuthTokens(
-                    access_token=access_token,
-                    refresh_token=new_refresh_token,
-                ),
-                user=UserRead.model_validate(user),
-            )
-            return APIResponse[UserAuthRead](data=data)
-        finally:
-            await self.close_database_session()
+        data = UserAuthRead(
+            auth=UserAuthTokens(
+                access_token=access_token,
+                refresh_token=new_refresh_token,
+            ),
+            user=user.data,
+        )
+        return APIResponse[UserAuthRead](data=data)
 
     async def invalidate(self, payload: UserInvalidate) -> APIResponse | None:
-        auth_data = verify_refresh_token(payload.refresh_token)
+        auth_data = await verify_refresh_token(payload.refresh_token)
         if not auth_data:
             raise APIError(401, "Invalid or expired refresh token")
 
-        jti = auth_data.get("jti")
-        if jti:
-            token_blacklist.add(jti)
+        await revoke_token(auth_data)
 
         return APIResponse(message="Successfully logged out")
 
@@ -259,11 +492,17 @@ class UserRespository(BaseRepository):
     ) -> APIResponse | None:
         db: AsyncSession = await self.get_database_session()
         try:
-            stmt = select(Users).where(
-                Users.email == payload.email,
-                Users.is_deleted == False,  # noqa: E712
-            )
-            result = await db.execute(stmt)
+            finish_handlers: dict[str, Callable[..., Awaitable[APIResponse]]] = {
+                "finish-email-verification": self.handle_finish_email_verification,
+                "finish-email-authentication": self.handle_finish_email_authentication,
+                "finish-password-reset": self.handle_finish_password_reset,
+            }
+            finish_handler = finish_handlers.get(action)
+            if finish_handler:
+                # Consumes the token with one conditional UPDATE; no user load
+                return await finish_handler(payload, payload.email, db)
+
+            result = await db.execute(ACTIVE_USER_FOR_MANAGE, {"email": payload.email})
             user_or_none = result.scalar_one_or_none()
             if not user_or_none:
                 raise APIError(404, "User not found")
@@ -274,21 +513,12 @@ class UserRespository(BaseRepository):
                 "start-email-verification": lambda: self.handle_start_email_verification(
                     payload.email, user, db
                 ),
-                "finish-email-verification": lambda: self.handle_finish_email_verification(
-                    payload, payload.email, user, db
-                ),
                 "start-email-authentication": lambda: self.handle_start_email_authentication(
                     payload.email, user, db
                 ),
-                "finish-email-authentication": lambda: self.handle_finish_email_authentication(
-                    payload, payload.email, user, db
-                ),
                 "start-password-reset": lambda: self.handle_start_password_reset(
                     payload.email, user, db
                 ),
-                "finish-password-reset": lambda: self.handle_finish_password_reset(
-                    payload, payload.email, user, db
-                ),
                 "update-email": lambda: self.handle_update_email(
                     payload, payload.email, user, db
                 ),
@@ -320,31 +550,105 @@ class UserRespository(BaseRepository):
                 minutes=60 * 24
             )
             db.add(user)
+            if not await email_outbox.enqueue_template(
+                db,
+                "email-verification",
+                email,
+                {"token": user.verification_token},
+            ):
+                # Already sent within the deduplication window: keep that token
+                await db.rollback()
+                return APIResponse(message="Verification token sent")
             await db.commit()
-            await db.refresh(user)
+            await self._invalidate_user(user.id, email)
             return APIResponse(message="Verification token sent")
 
+    async def _consume_token(
+        self,
+        db: AsyncSession,
+        email: str,
+        token: str | None,
+        token_column: Any,
+        expires_column: Any,
+        errors: tuple[str, str],
+        values: dict[str, Any],
+    ):
+        """Apply `values` if `token` matches and has not expired, in one UPDATE.
+
+        The token is cleared by the same statement, so of several concurrent
+        submissions exactly one succeeds. On failure the user is looked up
+        only to report why: not found, invalid token (`errors[0]`) or expired
+        token (`errors[1]`).
+        """
+        now = datetime.now(timezone.utc)
+        if token:
+            result = await db.execute(
+                update(Users)
+                .where(
+                    Users.email == email,
+                    Users.is_deleted == False,  # noqa: E712
+                    token_column == token,
+                    expires_column > now,
+                )
+                .values(**values)
+                .returning(Users.id)
+                .execution_options(synchronize_session=False)
+            )
+            user_id = result.scalar_one_or_none()
+            if user_id is not None:
+                await db.commit()
+                await self._invalidate_user(user_id, email)
+                return
+
+        await self._raise_token_error(
+            db, email, token, token_column, expires_column, errors
+        )
+
+    async def _raise_token_error(
+        self,
+        db: AsyncSession,
+        email: str,
+        token: str | None,
+        token_column: Any,
+        expires_column: Any,
+        errors: tuple[str, str],
+    ):
+        """Raise the error a token check fails with; return if the token is valid."""
+        await db.rollback()
+        result = await db.execute(
+            select(token_column, expires_column).where(
+                Users.email == email,
+                Users.is_deleted == False,  # noqa: E712
+            )
+        )
+        row = result.one_or_none()
+        if row is None:
+            raise APIError(404, "User not found")
+        stored_token, expires = row
+        if token != stored_token:
+            raise APIError(400, errors[0])
+        if not expires or datetime.now(timezone.utc) > expires:
+            raise APIError(400, errors[1])
+
     async def handle_finish_email_verification(
         self,
         payload: UserManage,
         email: str,
-        user: Users,
         db: AsyncSession,
     ):
-        if payload.token != user.verification_token:
-            raise APIError(400, "Invalid verification token")
-        if (
-            not user.verification_token_expires
-            or datetime.now(timezone.utc) > user.verification_token_expires
-        ):
-            raise APIError(400, "Verification token expired")
-
-        user.verification_token = None
-        user.verification_token_expires = None
-        user.is_verified = True
-        db.add(user)
-        await db.commit()
-        await db.refresh(user)
+        await self._consume_token(
+            db,
+            email,
+            payload.token,
+            Users.verification_token,
+            Users.verification_token_expires,
+            ("Invalid verification token", "Verification token expired"),
+            {
+                "verification_token": None,
+                "verification_token_expires": None,
+                "is_verified": True,
+            },
+        )
         return APIResponse(message="Email successfully verified")
 
     async def handle_start_email_authentication(
@@ -355,31 +659,37 @@ class UserRespository(BaseRepository):
             minutes=5
         )
         db.add(user)
+        if not await email_outbox.enqueue_template(
+            db,
+            "email-authentication",
+            email,
+            {"token": user.authentication_token},
+        ):
+            await db.rollback()
+            return APIResponse(message="Authentication token sent")
         await db.commit()
-        await db.refresh(user)
+        await self._invalidate_user(user.id, email)
         return APIResponse(message="Authentication token sent")
 
     async def handle_finish_email_authentication(
         self,
         payload: UserManage,
         email: str,
-        user: Users,
         db: AsyncSession,
     ):
-        if payload.token != user.authentication_token:
-            raise APIError(400, "Invalid authentication token")
-        if (
-            not user.authentication_token_expires
-            or datetime.now(timezone.utc) > user.authentication_token_expires
-        ):
-            raise APIError(400, "Authentication token expired")
-
-        user.authentication_token = None
-        user.authentication_token_expires = None
-        user.authenticated_at = datetime.now(timezone.utc)
-        db.add(user)
-        await db.commit()
-        await db.refresh(user)
+        await self._consume_token(
+            db,
+            email,
+            payload.token,
+            Users.authentication_token,
+            Users.authentication_token_expires,
+            ("Invalid authentication token", "Authentication token expired"),
+            {
+                "authentication_token": None,
+                "authentication_token_expires": None,
+                "authenticated_at": datetime.now(timezone.utc),
+            },
+        )
         return APIResponse(message="Authentication successful")
 
     async def handle_start_password_reset(
@@ -388,33 +698,73 @@ class UserRespository(BaseRepository):
         user.reset_token = create_one_time_password()
         user.reset_token_expires = datetime.now(timezone.utc) + timedelta(minutes=60)
         db.add(user)
+        if not await email_outbox.enqueue_template(
+            db,
+            "password-reset",
+            email,
+            {"token": user.reset_token},
+        ):
+            await db.rollback()
+            return APIResponse(message="Password reset token sent")
         await db.commit()
-        await db.refresh(user)
+        await self._invalidate_user(user.id, email)
         return APIResponse(message="Password reset token sent")
 
     async def handle_finish_password_reset(
         self,
         payload: UserManage,
         email: str,
-        user: Users,
         db: AsyncSession,
     ):
-        if payload.token != user.reset_token:
-            raise APIError(400, "Invalid reset token")
-        if (
-            not user.reset_token_expires
-            or datetime.now(timezone.utc) > user.reset_token_expires
-        ):
-            raise APIError(400, "Reset token expired")
+        errors = ("Invalid reset token", "Reset token expired")
         if not payload.new_password:
+            # Report a bad token first, as the token check comes first
+            await self._raise_token_error(
+                db,
+                email,
+                payload.token,
+                Users.reset_token,
+                Users.reset_token_expires,
+                errors,
+            )
             raise APIError(400, "Missing new password")
 
-        user.password = hash_password(payload.new_password)
-        user.reset_token = None
-        user.reset_token_expires = None
-        db.add(user)
-        await db.commit()
-        await db.refresh(user)
+        # A cheap read-only check first, so a bad token costs no hash; the
+        # UPDATE below still decides, should the token be used meanwhile
+        result = await db.execute(
+            select(Users.id).where(
+                Users.email == email,
+                Users.is_deleted == False,  # noqa: E712
+                Users.reset_token == payload.token,
+                Users.reset_token_expires > datetime.now(timezone.utc),
+            )
+        )
+        if not payload.token or result.scalar_one_or_none() is None:
+            await self._raise_token_error(
+                db,
+                email,
+                payload.token,
+                Users.reset_token,
+                Users.reset_token_expires,
+                errors,
+            )
+        # Hash outside any transaction, so no connection or row lock is held
+        await db.rollback()
+        password = await hash_password_async(payload.new_password)
+
+        await self._consume_token(
+            db,
+            email,
+            payload.token,
+            Users.reset_token,
+            Users.reset_token_expires,
+            errors,
+            {
+                "password": password,
+                "reset_token": None,
+                "reset_token_expires": None,
+            },
+        )
         return APIResponse(message="Password has been reset successfully")
 
     async def handle_update_email(
@@ -428,6 +778,7 @@ class UserRespository(BaseRepository):
             raise APIError(400, "Missing new email")
         if payload.new_email == email:
             raise APIError(400, "New email cannot be the same as current email")
+        previous_email = user.email
         user.email = payload.new_email
         user.is_verified = False
         user.verification_token = create_one_time_password()
@@ -435,8 +786,17 @@ class UserRespository(BaseRepository):
             minutes=60 * 24
         )
         db.add(user)
+        if not await email_outbox.enqueue_template(
+            db,
+            "email-verification",
+            payload.new_email,
+            {"token": user.verification_token},
+        ):
+            # That address was just sent a token: keep the account as it was
+            await db.rollback()
+            return APIResponse(message="Email updated and verification required")
         await db.commit()
-        await db.refresh(user)
+        await self._invalidate_user(user.id, previous_email, user.email)
         return APIResponse(message="Email updated and verification required")
 
     async def handle_update_password(
@@ -448,10 +808,12 @@ class UserRespository(BaseRepository):
     ):
         if not payload.new_password:
             raise APIError(400, "Missing new password")
-        if not payload.password or not verify_password(payload.password, user.password):
+        if not payload.password or not await verify_password_async(
+            payload.password, user.password
+        ):
             raise APIError(401, "Invalid current password")
-        user.password = hash_password(payload.new_password)
+        user.password = await hash_password_async(payload.new_password)
         db.add(user)
         await db.commit()
-        await db.refresh(user)
+        await self._invalidate_user(user.id, email)
         return APIResponse(message="Password updated successfully")
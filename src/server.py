@@ -10,6 +10,8 @@ from api import setup_routes
 from core.app import App
 from core.config import settings
 from core.database import check_database_connection, engine
+from helpers.auth import password_executor, revocation_store
+from helpers.cache import close_caches
 from helpers.constants import USER_CREATED_EVENT
 from helpers.events import events
 from helpers.logger import Logger
@@ -32,6 +34,10 @@ async def app_lifespan(server: FastAPI) -> AsyncGenerator[None, None]:  # noqa:
     yield
     logger.info("Lifespan shutdown: Stopping worker")
     await events.stop_worker()
+    logger.info("Lifespan shutdown: Stopping password executor")
+    password_executor.shutdown()
+    await revocation_store.close()
+    await close_caches()
 
 
 server = App(
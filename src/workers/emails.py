@@ -0,0 +1,170 @@
+import asyncio
+import random
+import signal
+from datetime import timedelta
+from email.message import Message
+
+from core.config import settings
+from helpers.logger import Logger
+from helpers.mailer import Mailer, create_mailer
+from helpers.model import utc_now
+from helpers.templates import RenderedEmail
+from models.emails import EmailOutbox
+from repositories.emails import EmailOutboxRepository
+
+logger = Logger(__name__)
+
+
+class EmailDeliveryWorker:
+    """Deliver queued emails from the outbox.
+
+    Runs as its own process (`pdm run email-worker`), so delivery scales apart
+    from the API; any number of workers can share the outbox. The provider
+    quota set by `SMTP_RATE_LIMIT` applies per worker process.
+    """
+
+    def __init__(
+        self,
+        mailer: Mailer,
+        repository: EmailOutboxRepository | None = None,
+        batch_size: int = 50,
+        poll_interval: float = 1.0,
+        visibility_timeout: float = 300,
+        max_attempts: int = 5,
+        backoff: float = 30,
+        backoff_max: float = 3600,
+        retention: int = 7 * 24 * 3600,
+    ):
+        self.mailer = mailer
+        self.repository = repository or EmailOutboxRepository()
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+        self.visibility_timeout = visibility_timeout
+        self.max_attempts = max_attempts
+        self.backoff = backoff
+        self.backoff_max = backoff_max
+        self.retention = retention
+        self._stopping = asyncio.Event()
+        self._pruned_at: float | None = None
+
+    def retry_delay(self, attempts: int) -> float:
+        """Exponential backoff with jitter, so failed batches do not retry in step."""
+        delay = min(self.backoff * 2 ** (attempts - 1), self.backoff_max)
+        return delay * random.uniform(0.5, 1.0)
+
+    async def run_once(self) -> int:
+        """Deliver one batch of due emails and return how many were claimed."""
+        emails = await self.repository.claim(self.batch_size, self.visibility_timeout)
+        if not emails:
+            return 0
+
+        deliverable: list[EmailOutbox] = []
+        messages: list[Message | RenderedEmail] = []
+        for email in emails:
+            if email.template is None:
+                messages.append(
+                    self.mailer.build_message(
+                        email.recipient,
+                        email.subject or "",
+                        email.body or "",
+                        email.is_html,
+                    )
+                )
+            else:
+                try:
+                    messages.append(
+                        self.mailer.templates.render(
+                            email.template, email.recipient, **(email.context or {})
+                        )
+                    )
+                except (KeyError, ValueError) as e:
+                    # Rendering is deterministic, so retrying would not help
+                    logger.error(f"Cannot render email {email.id}: {e}")
+                    await self.repository.mark_failed(email.id, str(e), None)
+                    continue
+            deliverable.append(email)
+        results = await self.mailer.send_many(messages)
+
+        sent = []
+        for email, result in zip(deliverable, results, strict=True):
+            if result["status"] == "success":
+                sent.append(email.id)
+                continue
+            error = str(result.get("details"))
+            if email.attempts >= self.max_attempts:
+                logger.error(
+                    f"Giving up on email {email.id} after {email.attempts} attempts: {error}"
+                )
+                await self.repository.mark_failed(email.id, error, None)
+            else:
+                retry_at = utc_now() + timedelta(
+                    seconds=self.retry_delay(email.attempts)
+                )
+                logger.warning(
+                    f"Email {email.id} failed (attempt {email.attempts}): {error}"
+                )
+                await self.repository.mark_failed(email.id, error, retry_at)
+        await self.repository.mark_sent(sent)
+
+        logger.info(f"Delivered {len(sent)} of {len(emails)} email(s)")
+        return len(emails)
+
+    async def _prune(self):
+        loop = asyncio.get_running_loop()
+        if self._pruned_at is not None and loop.time() - self._pruned_at < 3600:
+            return
+        self._pruned_at = loop.time()
+        before = utc_now() - timedelta(seconds=self.retention)
+        pruned = await self.repository.prune(before)
+        if pruned:
+            logger.info(f"Pruned {pruned} settled email(s) from the outbox")
+
+    async def run(self):
+        logger.info("Email worker started")
+        try:
+            while not self._stopping.is_set():
+                try:
+                    await self._prune()
+                    claimed = await self.run_once()
+                except Exception as e:
+                    logger.exception(f"Email worker iteration failed: {e}")
+                    claimed = 0
+                # A full batch suggests more are due, so only idle on a short one
+                if claimed < self.batch_size:
+                    try:
+                        await asyncio.wait_for(
+                            self._stopping.wait(), timeout=self.poll_interval
+                        )
+                    except asyncio.TimeoutError:
+                        pass
+        finally:
+            await self.mailer.close()
+            logger.info("Email worker stopped")
+
+    def stop(self):
+        self._stopping.set()
+
+
+async def run_worker():
+    worker = EmailDeliveryWorker(
+        create_mailer(),
+        batch_size=settings.EMAIL_WORKER_BATCH_SIZE,
+        poll_interval=settings.EMAIL_WORKER_POLL_INTERVAL,
+        visibility_timeout=settings.EMAIL_VISIBILITY_TIMEOUT,
+        max_attempts=settings.EMAIL_MAX_ATTEMPTS,
+        backoff=settings.EMAIL_RETRY_BACKOFF,
+        backoff_max=settings.EMAIL_RETRY_BACKOFF_MAX,
+        retention=settings.EMAIL_OUTBOX_RETENTION,
+    )
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, worker.stop)
+    await worker.run()
+
+
+def main():
+    asyncio.run(run_worker())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+import asyncio
+import sys
+from collections.abc import Iterator
+from pathlib import Path
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import NullPool
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from core.database import PrimarySession, _WriteTrackingSession, router  # noqa: E402
+from models import SQLModel  # noqa: E402
+from repositories.users import user_cache  # noqa: E402
+
+
+@pytest.fixture
+def database(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Iterator[AsyncEngine]:
+    """Point every repository at a fresh SQLite database.
+
+    NullPool opens a connection per checkout, so the engine is not tied to the
+    event loop of any one `asyncio.run` call.
+    """
+    engine = create_async_engine(
+        f"sqlite+aiosqlite:///{tmp_path / 'test.db'}", poolclass=NullPool
+    )
+
+    async def create_tables():
+        async with engine.begin() as connection:
+            await connection.run_sync(SQLModel.metadata.create_all)
+
+    asyncio.run(create_tables())
+    monkeypatch.setattr(
+        router,
+        "primary",
+        async_sessionmaker(
+            bind=engine,
+            expire_on_commit=False,
+            class_=PrimarySession,
+            sync_session_class=_WriteTrackingSession,
+        ),
+    )
+    monkeypatch.setattr(router, "replicas", [])
+    user_cache.local.clear()
+    yield engine
+    user_cache.local.clear()
+    asyncio.run(engine.dispose())
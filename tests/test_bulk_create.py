@@ -0,0 +1,67 @@
+import asyncio
+
+import pytest
+from pydantic import ValidationError
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from helpers.auth import verify_password
+from models.users import UserBulkCreate, UserBulkCreateStatus, UserCreate, Users
+from repositories.users import UserRespository
+
+
+def user(index: int) -> dict[str, str]:
+    return {
+        "email": f"user{index}@example.com",
+        "first_name": f"First{index}",
+        "last_name": "Last",
+        "password": "password",
+    }
+
+
+def test_bulk_create_accepts_up_to_100_users():
+    assert len(UserBulkCreate(users=[user(i) for i in range(100)]).users) == 100
+
+
+def test_bulk_create_rejects_more_than_100_users():
+    with pytest.raises(ValidationError):
+        UserBulkCreate.model_validate({"users": [user(i) for i in range(101)]})
+
+
+def test_bulk_create_reports_each_row(database: AsyncEngine):
+    emails = ["new1", "old", "new1", "new2", "old"]
+
+    async def main():
+        repository = UserRespository()
+        await repository.create(UserCreate(**user(0) | {"email": "old@example.com"}))
+        response = await repository.bulk_create(
+            [
+                UserCreate(**user(index) | {"email": f"{email}@example.com"})
+                for index, email in enumerate(emails, start=1)
+            ]
+        )
+        async with database.connect() as connection:
+            result = await connection.execute(
+                select(Users.id, Users.email, Users.first_name, Users.password)
+            )
+            return response, {row.email: row for row in result}
+
+    response, rows = asyncio.run(main())
+    assert [(entry.email, entry.status) for entry in response.data] == [
+        ("new1@example.com", UserBulkCreateStatus.CREATED),
+        ("old@example.com", UserBulkCreateStatus.EXISTS),
+        ("new1@example.com", UserBulkCreateStatus.DUPLICATE),
+        ("new2@example.com", UserBulkCreateStatus.CREATED),
+        ("old@example.com", UserBulkCreateStatus.DUPLICATE),
+    ]
+    assert response.meta == {"requested": 5, "created": 2}
+    assert sorted(rows) == ["new1@example.com", "new2@example.com", "old@example.com"]
+    for entry in response.data:
+        if entry.status == UserBulkCreateStatus.CREATED:
+            assert entry.id == rows[entry.email].id
+        else:
+            assert entry.id is None
+    # The first occurrence wins, and the existing user is left untouched
+    assert rows["new1@example.com"].first_name == "First1"
+    assert rows["old@example.com"].first_name == "First0"
+    assert verify_password("password", rows["new2@example.com"].password)
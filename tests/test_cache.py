@@ -0,0 +1,96 @@
+import asyncio
+
+import pytest
+
+from helpers.cache import ReadThroughCache
+from models.users import UserCreate, UserManage, UserManageAction
+from repositories.users import UserRespository
+
+
+def create_cache() -> ReadThroughCache[str]:
+    return ReadThroughCache(
+        "test",
+        keys=lambda value: (value,),
+        dumps=str.encode,
+        loads=bytes.decode,
+        max_size=10,
+        ttl=60,
+    )
+
+
+def test_waiter_takes_over_the_load_of_a_cancelled_caller():
+    cache = create_cache()
+    loads = 0
+
+    async def loader() -> str:
+        nonlocal loads
+        loads += 1
+        await asyncio.sleep(0.05)
+        return "key"
+
+    async def main():
+        leader = asyncio.create_task(cache.get("key", loader))
+        await asyncio.sleep(0)
+        waiter = asyncio.create_task(cache.get("key", loader))
+        await asyncio.sleep(0)
+        leader.cancel()
+        return await asyncio.gather(leader, waiter, return_exceptions=True)
+
+    leader, waiter = asyncio.run(main())
+
+    assert isinstance(leader, asyncio.CancelledError)
+    assert waiter == "key"
+    assert loads == 2
+
+
+def test_waiters_share_a_failed_load():
+    cache = create_cache()
+    loads = 0
+
+    async def loader() -> str:
+        nonlocal loads
+        loads += 1
+        await asyncio.sleep(0.01)
+        raise RuntimeError("database unavailable")
+
+    async def main():
+        calls = [cache.get("key", loader) for _ in range(3)]
+        return await asyncio.gather(*calls, return_exceptions=True)
+
+    results = asyncio.run(main())
+
+    assert [type(result) for result in results] == [RuntimeError] * 3
+    assert loads == 1
+
+
+@pytest.mark.usefixtures("database")
+@pytest.mark.parametrize(
+    ("action", "fields"),
+    [
+        (UserManageAction.START_EMAIL_VERIFICATION, {}),
+        (UserManageAction.START_EMAIL_AUTHENTICATION, {}),
+        (UserManageAction.START_PASSWORD_RESET, {}),
+        (UserManageAction.UPDATE_PASSWORD, {"password": "pw", "new_password": "new"}),
+    ],
+)
+def test_account_writes_invalidate_the_cached_user(
+    action: UserManageAction, fields: dict[str, str]
+):
+    email = "ada@example.com"
+
+    async def main():
+        repository = UserRespository()
+        await repository.create(
+            UserCreate(
+                email=email, first_name="Ada", last_name="Lovelace", password="pw"
+            )
+        )
+        before = await repository.get_by_email(email)
+        await repository.manage(action, UserManage(email=email, **fields))
+        after = await repository.get_by_email(email)
+        return before.data.updated_at, after.data.updated_at
+
+    before, after = asyncio.run(main())
+
+    assert before is None
+    assert after is not None
@@ -0,0 +1,40 @@
+import asyncio
+from pathlib import Path
+
+import pytest
+from sqlalchemy import exc
+
+import core.database
+from core.config import settings
+from core.database import create_pooled_engine, pool_checkout_seconds, pool_timeouts
+
+
+def test_exhausted_pool_records_the_wait_and_the_timeout(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+):
+    monkeypatch.setattr(settings, "POSTGRESQL_POOL_SIZE", 1)
+    monkeypatch.setattr(settings, "POSTGRESQL_MAX_OVERFLOW", 0)
+    monkeypatch.setattr(settings, "POSTGRESQL_POOL_TIMEOUT", 0.2)
+    monkeypatch.setattr(core.database, "_engines", [])
+    labels = ("exhausted",)
+
+    async def main():
+        engine = create_pooled_engine(
+            f"sqlite+aiosqlite:///{tmp_path / 'pool.db'}", "exhausted"
+        )
+        try:
+            async with engine.connect():
+                with pytest.raises(exc.TimeoutError):
+                    async with engine.connect():
+                        pass
+        finally:
+            await engine.dispose()
+
+    asyncio.run(main())
+
+    assert pool_timeouts.value(labels) == 1
+    samples = list(pool_checkout_seconds.samples())
+    # The first checkout was immediate; the second waited out pool_timeout
+    assert 'db_pool_checkout_seconds_bucket{pool="exhausted",le="0.1"} 1' in samples
+    assert 'db_pool_checkout_seconds_bucket{pool="exhausted",le="0.25"} 2' in samples
+    assert 'db_pool_checkout_seconds_count{pool="exhausted"} 2' in samples
@@ -0,0 +1,135 @@
+import asyncio
+import time
+from collections.abc import Iterator
+from pathlib import Path
+
+import pytest
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
+from sqlalchemy.pool import NullPool
+
+from core.database import router
+from helpers.model import APIError
+from models import SQLModel
+from models.users import UserCreate
+from repositories.users import UserRespository, user_cache
+
+
+@pytest.fixture
+def replicas(
+    database: AsyncEngine,  # noqa: ARG001
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+) -> Iterator[list[AsyncEngine]]:
+    """Two SQLite files standing in for read replicas of the test database."""
+    engines = [
+        create_async_engine(
+            f"sqlite+aiosqlite:///{tmp_path / f'replica-{index}.db'}",
+            poolclass=NullPool,
+        )
+        for index in range(2)
+    ]
+
+    async def create_tables():
+        for engine in engines:
+            async with engine.begin() as connection:
+                await connection.run_sync(SQLModel.metadata.create_all)
+
+    asyncio.run(create_tables())
+    monkeypatch.setattr(
+        router,
+        "replicas",
+        [
+            (engine, async_sessionmaker(bind=engine, class_=AsyncSession))
+            for engine in engines
+        ],
+    )
+    monkeypatch.setattr(router, "balancing", "round-robin")
+    monkeypatch.setattr(router, "_next", 0)
+    monkeypatch.setattr(router, "_written", {})
+    monkeypatch.setattr(router, "_expiries", [])
+    monkeypatch.setattr(user_cache, "enabled", False)
+    yield engines
+
+    async def dispose():
+        for engine in engines:
+            await engine.dispose()
+
+    asyncio.run(dispose())
+
+
+def bind(readonly: bool = False, key: str | None = None) -> AsyncEngine:
+    return router.session(readonly, key).bind
+
+
+def test_reads_are_balanced_across_replicas(
+    database: AsyncEngine, replicas: list[AsyncEngine]
+):
+    assert bind() is database
+    assert [bind(readonly=True) for _ in range(4)] == replicas * 2
+
+
+def test_written_keys_are_read_from_the_primary(
+    database: AsyncEngine, replicas: list[AsyncEngine]
+):
+    router.mark_written("email:ada@example.com")
+
+    assert bind(readonly=True, key="email:ada@example.com") is database
+    assert bind(readonly=True, key="email:bob@example.com") in replicas
+
+
+def test_expired_pins_are_dropped_as_keys_are_written(
+    database: AsyncEngine,
+    replicas: list[AsyncEngine],
+    monkeypatch: pytest.MonkeyPatch,
+):
+    now = 1000.0
+    monkeypatch.setattr(time, "monotonic", lambda: now)
+    monkeypatch.setattr(router, "read_your_writes", 5)
+
+    router.mark_written("a", "b", ("c", 1))
+    now += 3
+    router.mark_written("a", 42)
+    now += 3
+    router.mark_written("d")
+
+    # "b" and ("c", 1) expired; "a" was written again in the meantime
+    assert router._written == {"a": 1008.0, 42: 1008.0, "d": 1011.0}
+    assert [entry[0] for entry in sorted(router._expiries)] == [1008, 1008, 1011]
+    assert bind(readonly=True, key="a") is database
+    assert bind(readonly=True, key="b") in replicas
+
+
+def test_a_unit_of_work_reads_its_own_writes(
+    database: AsyncEngine, replicas: list[AsyncEngine]
+):
+    repository = UserRespository()
+
+    def user(email: str) -> UserCreate:
+        return UserCreate(
+            email=email, first_name="Ada", last_name="Lovelace", password="pw"
+        )
+
+    async def main():
+        # Writes outside a unit of work, as a consumer or worker task makes
+        # them, do not pin the task to the primary
+        await repository.create(user("ada@example.com"))
+        assert bind(readonly=True) in replicas
+
+        with router.unit_of_work():
+            assert bind(readonly=True) in replicas
+            await repository.create(user("bob@example.com"))
+            assert bind(readonly=True) is database
+            # The replicas have not caught up, but this unit reads the primary
+            assert (await repository.get_by_email("bob@example.com")).data
+
+        with router.unit_of_work():
+            assert bind(readonly=True) in replicas
+            with pytest.raises(APIError):
+                await repository.get_by_email("bob@example.com")
+
+    asyncio.run(main())
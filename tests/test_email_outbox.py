@@ -0,0 +1,222 @@
+import asyncio
+from collections.abc import Sequence
+from datetime import timedelta
+from email.message import Message
+from typing import Any
+
+import pytest
+from sqlalchemy import event, select, update
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+
+from helpers.mailer import Mailer
+from helpers.model import utc_now
+from helpers.templates import EmailTemplates, RenderedEmail
+from models.emails import EmailOutbox, EmailStatus
+from models.users import UserCreate, UserManage, UserManageAction, Users
+from repositories.emails import EmailOutboxRepository
+from repositories.users import UserRespository, email_outbox
+from workers.emails import EmailDeliveryWorker
+
+
+class StubMailer:
+    """Accepts every message except those addressed to `refused.test`."""
+
+    build_message = Mailer.build_message
+
+    def __init__(self):
+        self.sender_email = "sender@example.com"
+        self.templates = EmailTemplates(self.sender_email)
+        self.sent: list[str] = []
+
+    async def send_many(
+        self, messages: Sequence[Message | RenderedEmail]
+    ) -> list[dict[str, Any]]:
+        results = []
+        for message in messages:
+            recipient = (
+                message.recipient
+                if isinstance(message, RenderedEmail)
+                else message["To"]
+            )
+            if recipient.endswith("@refused.test"):
+                results.append({"status": "error", "details": "550 Refused"})
+            else:
+                self.sent.append(recipient)
+                results.append({"status": "success", "details": {}})
+        return results
+
+
+async def enqueue(engine: AsyncEngine, *recipients: str, template: str | None = None):
+    """Queue an email to each of `recipients`, committed on its own."""
+    async with AsyncSession(bind=engine) as db:
+        for recipient in recipients:
+            if template is None:
+                await email_outbox.enqueue(db, "test", recipient, "Subject", "Body")
+            else:
+                await email_outbox.enqueue_template(
+                    db, template, recipient, {"token": "123456"}
+                )
+        await db.commit()
+
+
+async def outbox(engine: AsyncEngine) -> dict[str, EmailOutbox]:
+    async with engine.connect() as connection:
+        result = await connection.execute(select(EmailOutbox))
+        return {row.recipient: row for row in result}
+
+
+def test_claims_are_exclusive_until_the_visibility_timeout(database: AsyncEngine):
+    claim_sql: list[str] = []
+
+    def before_execute(conn, clause, *args):  # noqa: ARG001
+        claim_sql.append(str(clause.compile(dialect=postgresql.dialect())))
+
+    async def main():
+        await enqueue(database, *(f"user{index}@example.com" for index in range(5)))
+        repository = EmailOutboxRepository()
+        event.listen(database.sync_engine, "before_execute", before_execute)
+        claims = await asyncio.gather(
+            *(repository.claim(batch_size=2, visibility_timeout=1) for _ in range(3))
+        )
+        event.remove(database.sync_engine, "before_execute", before_execute)
+        # Every email is locked, so nothing is due until the claims expire
+        assert await repository.claim(batch_size=10, visibility_timeout=60) == []
+
+        await asyncio.sleep(1)
+        reclaimed = await repository.claim(batch_size=10, visibility_timeout=60)
+        return claims, reclaimed
+
+    claims, reclaimed = asyncio.run(main())
+    claimed = [email.id for claim in claims for email in claim]
+    assert len(claimed) == len(set(claimed)) == 5
+    assert max(len(claim) for claim in claims) == 2
+    assert any("FOR UPDATE SKIP LOCKED" in sql for sql in claim_sql)
+    assert {email.id for email in reclaimed} == set(claimed)
+    assert {email.attempts for email in reclaimed} == {2}
+
+
+@pytest.mark.usefixtures("database")
+def test_enqueue_is_deduplicated_within_the_window():
+    async def main():
+        repository = EmailOutboxRepository()
+        db = await repository.get_database_session()
+        try:
+            first = await repository.enqueue_template(
+                db, "email-verification", "ada@example.com", {"token": "1"}
+            )
+            second = await repository.enqueue_template(
+                db, "email-verification", "ada@example.com", {"token": "2"}
+            )
+            other = await repository.enqueue_template(
+                db, "email-authentication", "ada@example.com", {"token": "3"}
+            )
+            await db.commit()
+        finally:
+            await repository.close_database_session()
+        return first, second, other
+
+    assert asyncio.run(main()) == (True, False, True)
+
+
+def test_settled_emails_are_not_claimed_and_are_pruned(database: AsyncEngine):
+    async def main():
+        await enqueue(
+            database, "sent@example.com", "retry@example.com", "failed@example.com"
+        )
+        repository = EmailOutboxRepository()
+        emails = {
+            email.recipient: email.id
+            for email in await repository.claim(batch_size=10, visibility_timeout=60)
+        }
+        await repository.mark_sent([emails["sent@example.com"]])
+        await repository.mark_failed(
+            emails["retry@example.com"], "busy", utc_now() + timedelta(hours=1)
+        )
+        await repository.mark_failed(emails["failed@example.com"], "gone", None)
+        # Backed off or settled: none of them is due
+        assert await repository.claim(batch_size=10, visibility_timeout=60) == []
+        settled = await outbox(database)
+
+        pruned = await repository.prune(utc_now() + timedelta(seconds=1))
+        return settled, pruned, await outbox(database)
+
+    settled, pruned, remaining = asyncio.run(main())
+    assert settled["sent@example.com"].status == EmailStatus.SENT
+    assert settled["sent@example.com"].sent_at is not None
+    assert settled["retry@example.com"].status == EmailStatus.PENDING
+    assert settled["retry@example.com"].last_error == "busy"
+    assert settled["retry@example.com"].locked_until is None
+    assert settled["failed@example.com"].status == EmailStatus.FAILED
+    assert pruned == 2
+    assert list(remaining) == ["retry@example.com"]
+
+
+def test_worker_delivers_backs_off_and_gives_up(database: AsyncEngine):
+    mailer = StubMailer()
+    worker = EmailDeliveryWorker(mailer, max_attempts=2, backoff=60)
+
+    async def main():
+        await enqueue(database, "ada@example.com", "bob@refused.test")
+        await enqueue(database, "eve@example.com", template="email-verification")
+        await enqueue(database, "ian@example.com", template="missing-template")
+        started = utc_now()
+
+        first = await worker.run_once()
+        after_first = await outbox(database)
+        # The refused email backs off, so nothing is due
+        second = await worker.run_once()
+
+        async with database.begin() as connection:
+            await connection.execute(
+                update(EmailOutbox)
+                .where(EmailOutbox.recipient == "bob@refused.test")
+                .values(available_at=utc_now())
+            )
+        third = await worker.run_once()
+        return started, (first, second, third), after_first, await outbox(database)
+
+    started, claimed, after_first, after_last = asyncio.run(main())
+    assert claimed == (4, 0, 1)
+    assert sorted(mailer.sent) == ["ada@example.com", "eve@example.com"]
+
+    assert after_first["ada@example.com"].status == EmailStatus.SENT
+    assert after_first["eve@example.com"].status == EmailStatus.SENT
+    # Rendering fails the same way every time, so it is not retried
+    assert after_first["ian@example.com"].status == EmailStatus.FAILED
+    assert after_first["ian@example.com"].attempts == 1
+    refused = after_first["bob@refused.test"]
+    assert (refused.status, refused.attempts) == (EmailStatus.PENDING, 1)
+    assert refused.last_error == "550 Refused"
+    # Between half and all of the first 60-second backoff
+    delay = refused.available_at - started.replace(tzinfo=None)
+    assert timedelta(seconds=30) <= delay <= timedelta(seconds=61)
+
+    refused = after_last["bob@refused.test"]
+    assert (refused.status, refused.attempts) == (EmailStatus.FAILED, 2)
+
+
+def test_update_email_keeps_the_account_when_deduplicated(database: AsyncEngine):
+    async def main():
+        repository = UserRespository()
+        await repository.create(
+            UserCreate(
+                email="ada@example.com",
+                first_name="Ada",
+                last_name="Lovelace",
+                password="password",
+            )
+        )
+        # The new address was already sent a verification in this window
+        await enqueue(database, "new@example.com", template="email-verification")
+        await repository.manage(
+            UserManageAction.UPDATE_EMAIL,
+            UserManage(email="ada@example.com", new_email="new@example.com"),
+        )
+        async with database.connect() as connection:
+            result = await connection.execute(
+                select(Users.email, Users.verification_token)
+            )
+            return result.all()
+
+    assert asyncio.run(main()) == [("ada@example.com", None)]
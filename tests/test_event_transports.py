@@ -0,0 +1,38 @@
+import asyncio
+
+from helpers.event_transports import EventEnvelope, MemoryEventTransport
+
+
+def test_nack_does_not_wait_for_room_in_a_full_queue():
+    async def main():
+        transport = MemoryEventTransport(max_size=1)
+        await transport.put([EventEnvelope("test", (1,))])
+        first = await transport.get()
+        await transport.put([EventEnvelope("test", (2,))])
+
+        # The queue is full again; releasing must not block the consumer
+        await asyncio.wait_for(transport.nack(first), 0.5)
+
+        second = await transport.get()
+        await transport.ack(second)
+        redelivered = await asyncio.wait_for(transport.get(), 0.5)
+        await transport.ack(redelivered)
+        await transport.close()
+        return second.args, redelivered.args
+
+    assert asyncio.run(main()) == ((2,), (1,))
+
+
+def test_delayed_nack_redelivers_after_the_delay():
+    async def main():
+        transport = MemoryEventTransport()
+        await transport.put([EventEnvelope("test", (1,))])
+        envelope = await transport.get()
+        await transport.nack(envelope, delay=0.1)
+        assert transport.qsize() == 0
+        assert transport.delayed() == 1
+        redelivered = await asyncio.wait_for(transport.get(), 0.5)
+        await transport.close()
+        return redelivered.args
+
+    assert asyncio.run(main()) == (1,)
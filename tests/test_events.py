@@ -0,0 +1,213 @@
+import asyncio
+import threading
+import time
+from collections.abc import Sequence
+
+from helpers.event_transports import (
+    EventEnvelope,
+    EventQueueFullError,
+    MemoryEventTransport,
+)
+from helpers.events import Events, ListenerEntry
+from helpers.executor import BoundedExecutor
+
+
+class SlowListener:
+    """Synchronous listener that outlives its timeout and tracks overlap."""
+
+    def __init__(self, fail: bool):
+        self.fail = fail
+        self.calls = 0
+        self.running = 0
+        self.overlap = 0
+        self.lock = threading.Lock()
+
+    def __call__(self, value: int):
+        with self.lock:
+            self.calls += 1
+            self.running += 1
+            self.overlap = max(self.overlap, self.running)
+        time.sleep(0.2)
+        with self.lock:
+            self.running -= 1
+        if self.fail:
+            raise RuntimeError("listener failed")
+
+
+def run_bus(listener: SlowListener, seconds: float) -> Events:
+    async def main():
+        bus = Events(
+            default_retry_attempts=3,
+            default_retry_delay=0.01,
+            concurrency=2,
+            thread_executor=BoundedExecutor(4, 10, name="test-listeners"),
+        )
+        bus.on("test", listener, timeout=0.05)
+        await bus.start_worker()
+        await bus.emit("test", 1)
+        await asyncio.sleep(seconds)
+        await bus.stop_worker()
+        return bus
+
+    return asyncio.run(main())
+
+
+def test_timed_out_thread_listener_is_not_retried_while_running():
+    listener = SlowListener(fail=False)
+    bus = run_bus(listener, 0.6)
+    labels = ("test", ListenerEntry(listener).name)
+
+    assert listener.calls == 1
+    assert bus.attempts.value((*labels, "timeout")) == 1
+    assert bus.retries.value(labels) == 0
+
+
+def test_timed_out_thread_listener_failing_later_is_retried_in_turn():
+    listener = SlowListener(fail=True)
+    run_bus(listener, 1.0)
+
+    assert listener.calls == 3
+    assert listener.overlap == 1
+
+
+def run_events(bus: Events, emits: list[tuple[str, int]], seconds: float = 0.3):
+    async def main():
+        await bus.start_worker()
+        for event, value in emits:
+            await bus.emit(event, value)
+        await asyncio.sleep(seconds)
+        await bus.stop_worker()
+
+    asyncio.run(main())
+
+
+def test_once_listener_runs_once_across_consumers():
+    calls: list[int] = []
+
+    async def listener(value: int):
+        await asyncio.sleep(0.01)
+        calls.append(value)
+
+    bus = Events(concurrency=4)
+    bus.on("test", listener, once=True)
+    run_events(bus, [("test", index) for index in range(10)])
+
+    assert len(calls) == 1
+
+
+def test_failed_once_listener_is_retried():
+    calls: list[int] = []
+
+    async def listener(value: int):
+        calls.append(value)
+        if len(calls) == 1:
+            raise RuntimeError("first attempt fails")
+
+    bus = Events(default_retry_delay=0.01, concurrency=2)
+    bus.on("test", listener, once=True)
+    run_events(bus, [("test", 1)])
+
+    assert calls == [1, 1]
+    assert bus._entries == {}
+
+
+def test_retry_runs_only_the_listener_that_failed():
+    calls: list[str] = []
+    bus = Events(default_retry_delay=0.01)
+    # Two lambdas share a module and qualname, but not a registration key
+    bus.on("test", lambda value: calls.append("ok"))  # noqa: ARG005
+    bus.on(
+        "test",
+        lambda value: calls.append("fail") or 1 / 0,  # noqa: ARG005
+        retry_attempts=2,
+    )
+    run_events(bus, [("test", 1)])
+
+    assert sorted(calls) == ["fail", "fail", "ok"]
+
+
+class RetryRejectingTransport(MemoryEventTransport):
+    async def put(self, envelopes: Sequence[EventEnvelope], delay: float = 0):
+        if any(envelope.listener for envelope in envelopes):
+            raise EventQueueFullError("Event queue is full")
+        await super().put(envelopes, delay)
+
+
+def test_unqueued_retry_gives_up_without_failing_the_envelope():
+    calls: list[str] = []
+
+    async def succeeds(value: int):  # noqa: ARG001
+        calls.append("ok")
+
+    async def fails(value: int):  # noqa: ARG001
+        calls.append("fail")
+        raise RuntimeError("listener failed")
+
+    bus = Events(
+        default_retry_delay=0.01,
+        transport=RetryRejectingTransport(),
+    )
+    bus.on("test", succeeds)
+    bus.on("test", fails)
+    run_events(bus, [("test", 1)])
+
+    assert sorted(calls) == ["fail", "ok"]
+    assert bus.giveups.value(("test", ListenerEntry(fails).name)) == 1
+
+
+def sleep_in_process(value: int):
+    time.sleep(value)
+
+
+def test_thread_overruns_are_capped_and_reported():
+    listener = SlowListener(fail=True)
+
+    async def main():
+        bus = Events(
+            default_retry_delay=0.01,
+            thread_executor=BoundedExecutor(4, 10, name="test-listeners"),
+            max_overruns=0,
+        )
+        bus.on("test", listener, timeout=0.05)
+        await bus.start_worker()
+        await bus.emit("test", 1)
+        await asyncio.sleep(0.1)
+        during = bus.overruns()
+        await asyncio.sleep(0.3)
+        after = bus.overruns()
+        await bus.stop_worker()
+        return bus, during, after
+
+    bus, during, after = asyncio.run(main())
+
+    assert (during["thread"], after["thread"]) == (1, 0)
+    # Given up at the timeout, so the late failure is not retried
+    assert listener.calls == 1
+    assert bus.giveups.value(("test", ListenerEntry(listener).name)) == 1
+
+
+def test_timed_out_process_listener_frees_its_slot():
+    process_executor = BoundedExecutor(1, 10, mode="process", name="test-processes")
+
+    async def main():
+        bus = Events(process_executor=process_executor)
+        bus.on(
+            "test",
+            sleep_in_process,
+            executor="process",
+            timeout=0.5,
+            retry_attempts=1,
+        )
+        await bus.start_worker()
+        await bus.emit("test", 30)
+        await asyncio.sleep(2)
+        running = process_executor.stats()["running"]
+        await bus.stop_worker()
+        return bus, running
+
+    started = time.monotonic()
+    bus, running = asyncio.run(main())
+
+    assert running == 0
+    assert time.monotonic() - started < 10
+    assert bus.giveups.value(("test", ListenerEntry(sleep_in_process).name)) == 1
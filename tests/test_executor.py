@@ -0,0 +1,32 @@
+import asyncio
+
+import pytest
+
+from helpers.executor import BoundedExecutor
+from tests.test_metrics import get_metrics
+
+
+def fail():
+    raise ValueError("boom")
+
+
+def test_failed_calls_are_counted_apart_from_completed_ones():
+    executor = BoundedExecutor(1, 1, name="failing")
+
+    async def main():
+        assert await executor.run(sum, [1, 2]) == 3
+        with pytest.raises(ValueError):
+            await executor.run(fail)
+        with pytest.raises(ValueError):
+            await executor.run(fail)
+
+    try:
+        asyncio.run(main())
+    finally:
+        executor.shutdown()
+
+    stats = executor.stats()
+    assert (stats["completed"], stats["failed"], stats["running"]) == (1, 2, 0)
+    metrics = get_metrics().text
+    assert 'executor_completed{executor="failing",mode="thread"} 1' in metrics
+    assert 'executor_failed{executor="failing",mode="thread"} 2' in metrics
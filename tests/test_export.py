@@ -0,0 +1,95 @@
+import asyncio
+import contextvars
+import json
+import tracemalloc
+import uuid
+from datetime import timedelta
+
+from sqlalchemy import event, insert
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from helpers.model import utc_now
+from models.users import UserQuery, UserRole, Users
+from repositories.users import UserRespository
+
+
+async def seed(engine: AsyncEngine, count: int, start: int = 0):
+    now = utc_now()
+    rows = [
+        {
+            "id": uuid.uuid4(),
+            "email": f"user{index}@example.com",
+            "first_name": "First",
+            "last_name": "Last",
+            "password": "x" * 60,
+            "role": UserRole.USER,
+            "is_active": True,
+            "is_verified": True,
+            "is_deleted": False,
+            "meta_data": {"index": index},
+            "created_at": now + timedelta(microseconds=index),
+        }
+        for index in range(start, start + count)
+    ]
+    async with engine.begin() as connection:
+        await connection.execute(insert(Users), rows)
+
+
+async def export_peak(chunk_size: int) -> tuple[int, int]:
+    """Stream the whole export, returning the line count and peak allocation."""
+    repository = UserRespository()
+    lines = 0
+    tracemalloc.start()
+    try:
+        async for chunk in repository.export(UserQuery(), chunk_size=chunk_size):
+            lines += chunk.count(b"\n")
+        return lines, tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def test_export_memory_does_not_grow_with_rows(database: AsyncEngine):
+    async def main():
+        await seed(database, 1000)
+        small = await export_peak(chunk_size=100)
+        await seed(database, 9000, start=1000)
+        large = await export_peak(chunk_size=100)
+        return small, large
+
+    (small_lines, small_peak), (large_lines, large_peak) = asyncio.run(main())
+
+    assert (small_lines, large_lines) == (1000, 10000)
+    # Ten times the rows; a buffered export would need ten times the memory
+    assert large_peak < small_peak * 2
+
+
+def test_export_writes_every_row_once(database: AsyncEngine):
+    async def main():
+        await seed(database, 250)
+        repository = UserRespository()
+        return b"".join(
+            [chunk async for chunk in repository.export(UserQuery(), chunk_size=100)]
+        )
+
+    rows = [json.loads(line) for line in asyncio.run(main()).splitlines()]
+    assert [row["email"] for row in rows] == [
+        f"user{index}@example.com" for index in range(250)
+    ]
+
+
+def test_export_closes_session_when_finalised_elsewhere(database: AsyncEngine):
+    checkouts: list[str] = []
+    event.listen(database.sync_engine, "checkout", lambda *_: checkouts.append("out"))
+    event.listen(database.sync_engine, "checkin", lambda *_: checkouts.append("in"))
+
+    async def main():
+        await seed(database, 250)
+        export = UserRespository().export(UserQuery(), chunk_size=100)
+        await anext(export)
+        # A disconnected client's stream is closed from a fresh context
+        close = contextvars.Context().run(asyncio.create_task, export.aclose())
+        await close
+
+    asyncio.run(main())
+    assert checkouts[-2:] == ["out", "in"]
+    assert checkouts.count("out") == checkouts.count("in")
@@ -0,0 +1,40 @@
+import asyncio
+
+import httpx
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import JSONResponse
+
+from middlewares import log_requests
+from middlewares.log_requests import LogRequests
+
+
+def test_server_errors_bypass_sampling(monkeypatch: pytest.MonkeyPatch):
+    logged: list[tuple[str, int]] = []
+    monkeypatch.setattr(
+        log_requests.logger, "info", lambda *args: logged.append(("info", args[3]))
+    )
+    monkeypatch.setattr(
+        log_requests.logger, "error", lambda *args: logged.append(("error", args[3]))
+    )
+
+    app = FastAPI()
+
+    @app.get("/ok")
+    async def ok():
+        return {"status": "ok"}
+
+    @app.get("/broken")
+    async def broken():
+        return JSONResponse({"error": "broken"}, status_code=500)
+
+    app.add_middleware(LogRequests, sample_rate=0.0)
+
+    async def main():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as c:
+            assert (await c.get("/ok")).status_code == 200
+            assert (await c.get("/broken")).status_code == 500
+
+    asyncio.run(main())
+    assert logged == [("error", 500)]
@@ -0,0 +1,55 @@
+import logging
+import queue
+import threading
+
+from helpers.logger import BatchingQueueListener, DroppingQueueHandler
+
+
+class CollectingHandler(logging.Handler):
+    def __init__(self, release: threading.Event):
+        super().__init__()
+        self.unblocked = release
+        self.entered = threading.Event()
+        self.messages: list[str] = []
+
+    def emit(self, record: logging.LogRecord):
+        self.entered.set()
+        self.unblocked.wait()
+        self.messages.append(record.getMessage())
+
+
+def test_stop_flushes_a_full_queue():
+    release = threading.Event()
+    handler = CollectingHandler(release)
+    log_queue: queue.Queue = queue.Queue(maxsize=5)
+    listener = BatchingQueueListener(log_queue, handler, batch_size=2)
+    listener.start()
+
+    queue_handler = DroppingQueueHandler(log_queue)
+    logger = logging.getLogger("tests.logger.full")
+    logger.propagate = False
+    logger.addHandler(queue_handler)
+    # Hold the listener inside a handler while the queue fills up
+    logger.warning("first")
+    assert handler.entered.wait(5)
+    for index in range(20):
+        logger.warning("record %d", index)
+    assert log_queue.full()
+
+    threading.Timer(0.1, release.set).start()
+    listener.stop()
+
+    assert handler.messages == ["first"] + [f"record {index}" for index in range(5)]
+
+
+def test_arguments_are_captured_when_logged():
+    log_queue: queue.Queue = queue.Queue()
+    logger = logging.getLogger("tests.logger.args")
+    logger.propagate = False
+    logger.addHandler(DroppingQueueHandler(log_queue))
+
+    values = [1]
+    logger.warning("values: %s", values)
+    values.append(2)
+
+    assert log_queue.get_nowait().getMessage() == "values: [1]"
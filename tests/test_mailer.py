@@ -0,0 +1,114 @@
+import asyncio
+import socket
+from collections.abc import Iterator
+
+import pytest
+from aiosmtpd.controller import Controller
+from aiosmtpd.smtp import SMTP, Envelope, Session
+
+from helpers.mailer import Mailer
+
+
+class RecordingHandler:
+    """Keeps every accepted envelope and refuses recipients at `refused.test`."""
+
+    def __init__(self):
+        self.envelopes: list[Envelope] = []
+
+    async def handle_RCPT(
+        self,
+        server: SMTP,  # noqa: ARG002
+        session: Session,  # noqa: ARG002
+        envelope: Envelope,
+        address: str,
+        rcpt_options: list[str],  # noqa: ARG002
+    ) -> str:
+        if address.endswith("@refused.test"):
+            return "550 Mailbox unavailable"
+        envelope.rcpt_tos.append(address)
+        return "250 OK"
+
+    async def handle_DATA(
+        self,
+        server: SMTP,  # noqa: ARG002
+        session: Session,  # noqa: ARG002
+        envelope: Envelope,
+    ) -> str:
+        self.envelopes.append(envelope)
+        return "250 Message accepted for delivery"
+
+
+@pytest.fixture
+def smtp_server() -> Iterator[tuple[Controller, RecordingHandler]]:
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        port = probe.getsockname()[1]
+    handler = RecordingHandler()
+    controller = Controller(handler, hostname="127.0.0.1", port=port)
+    controller.start()
+    yield controller, handler
+    controller.stop()
+
+
+def create_test_mailer(controller: Controller, pool_size: int = 2) -> Mailer:
+    return Mailer(
+        controller.hostname,
+        controller.port,
+        "",
+        "",
+        "sender@example.com",
+        pool_size=pool_size,
+        start_tls=False,
+    )
+
+
+def test_send_email_reuses_the_connection(
+    smtp_server: tuple[Controller, RecordingHandler],
+):
+    controller, handler = smtp_server
+    mailer = create_test_mailer(controller)
+
+    async def main():
+        try:
+            return [
+                await mailer.send_email(f"user{index}@example.com", "Hello", "Body")
+                for index in range(3)
+            ]
+        finally:
+            await mailer.close()
+
+    results = asyncio.run(main())
+
+    assert [result["status"] for result in results] == ["success"] * 3
+    assert [envelope.rcpt_tos for envelope in handler.envelopes] == [
+        [f"user{index}@example.com"] for index in range(3)
+    ]
+    assert mailer.pool.stats()["connects"] == 1
+
+
+def test_send_many_batches_over_the_pool(
+    smtp_server: tuple[Controller, RecordingHandler],
+):
+    controller, handler = smtp_server
+    mailer = create_test_mailer(controller, pool_size=2)
+    recipients = [f"user{index}@example.com" for index in range(10)]
+    recipients[4] = "nobody@refused.test"
+
+    async def main():
+        messages = [
+            mailer.templates.render("email-verification", recipient, token="123456")
+            for recipient in recipients
+        ]
+        try:
+            return await mailer.send_many(messages)
+        finally:
+            await mailer.close()
+
+    results = asyncio.run(main())
+
+    statuses = [result["status"] for result in results]
+    assert statuses == ["success"] * 4 + ["error"] + ["success"] * 5
+    delivered = sorted(envelope.rcpt_tos[0] for envelope in handler.envelopes)
+    assert delivered == sorted(r for r in recipients if not r.endswith(".test"))
+    # A refused recipient does not cost the batch its connection
+    assert mailer.pool.stats()["connects"] == 2
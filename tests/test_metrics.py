@@ -0,0 +1,47 @@
+import asyncio
+
+import httpx
+import pytest
+
+from core.config import settings
+from helpers.metrics import Metric
+from server import app
+
+
+def get_metrics(headers: dict[str, str] | None = None) -> httpx.Response:
+    async def main():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(
+            transport=transport, base_url="http://test"
+        ) as client:
+            return await client.get("/internal/metrics", headers=headers)
+
+    return asyncio.run(main())
+
+
+@pytest.mark.parametrize(
+    ("env", "token", "headers", "status_code"),
+    [
+        ("development", "", None, 200),
+        ("production", "", None, 403),
+        ("production", "", {"X-Internal-Token": ""}, 403),
+        ("production", "secret", None, 403),
+        ("production", "secret", {"X-Internal-Token": "wrong"}, 403),
+        ("production", "secret", {"X-Internal-Token": "secret"}, 200),
+    ],
+)
+def test_metrics_access(
+    monkeypatch: pytest.MonkeyPatch,
+    env: str,
+    token: str,
+    headers: dict[str, str] | None,
+    status_code: int,
+):
+    monkeypatch.setattr(settings, "ENV", env)
+    monkeypatch.setattr(settings, "INTERNAL_API_TOKEN", token)
+    assert get_metrics(headers).status_code == status_code
+
+
+def test_metric_requires_samples():
+    with pytest.raises(TypeError):
+        Metric("untyped", "No samples")
@@ -0,0 +1,75 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+import repositories.users
+from helpers.auth import verify_password
+from helpers.model import APIError
+from models.users import UserCreate, UserManage, UserManageAction, Users
+from repositories.users import UserRespository
+from tests.test_query_counts import count_statements
+
+EMAIL = "ada@example.com"
+
+
+def test_reset_hashes_only_after_the_token_matches(
+    database: AsyncEngine, monkeypatch: pytest.MonkeyPatch
+):
+    hashed: list[str] = []
+    hash_password_async = repositories.users.hash_password_async
+
+    async def counting_hash(password: str) -> str:
+        hashed.append(password)
+        return await hash_password_async(password)
+
+    async def main():
+        repository = UserRespository()
+        await repository.create(
+            UserCreate(
+                email=EMAIL, first_name="Ada", last_name="Lovelace", password="old"
+            )
+        )
+        async with database.begin() as connection:
+            await connection.execute(
+                update(Users)
+                .where(Users.email == EMAIL)
+                .values(
+                    reset_token="123456",
+                    reset_token_expires=datetime.now(timezone.utc) + timedelta(hours=1),
+                )
+            )
+        monkeypatch.setattr(repositories.users, "hash_password_async", counting_hash)
+
+        with pytest.raises(APIError) as error:
+            await repository.manage(
+                UserManageAction.FINISH_PASSWORD_RESET,
+                UserManage(email=EMAIL, token="000000", new_password="wrong"),
+            )
+        assert (error.value.status_code, error.value.error) == (
+            400,
+            "Invalid reset token",
+        )
+        assert hashed == []
+
+        with count_statements(database) as statements:
+            await repository.manage(
+                UserManageAction.FINISH_PASSWORD_RESET,
+                UserManage(email=EMAIL, token="123456", new_password="new"),
+            )
+        assert hashed == ["new"]
+        # The pre-check, then one UPDATE consuming the token and setting the
+        # password together
+        assert statements == ["SELECT", "UPDATE"]
+
+        async with database.connect() as connection:
+            result = await connection.execute(
+                select(Users.password, Users.reset_token).where(Users.email == EMAIL)
+            )
+            return result.one()
+
+    password, reset_token = asyncio.run(main())
+    assert verify_password("new", password)
+    assert reset_token is None
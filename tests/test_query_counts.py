@@ -0,0 +1,86 @@
+import asyncio
+from collections.abc import Iterator
+from contextlib import contextmanager
+
+import httpx
+import pytest
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from helpers.auth import create_access_token
+from repositories.users import user_cache
+from server import app
+
+USER = {
+    "email": "ada@example.com",
+    "first_name": "Ada",
+    "last_name": "Lovelace",
+    "password": "password",
+}
+
+
+@contextmanager
+def count_statements(engine: AsyncEngine) -> Iterator[list[str]]:
+    """Collect every statement `engine` sends while the block runs."""
+    statements: list[str] = []
+
+    def before_cursor_execute(
+        conn,  # noqa: ARG001
+        cursor,  # noqa: ARG001
+        statement: str,
+        parameters,  # noqa: ARG001
+        context,  # noqa: ARG001
+        executemany,  # noqa: ARG001
+    ):
+        statements.append(statement.split(None, 1)[0].upper())
+
+    event.listen(engine.sync_engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", before_cursor_execute)
+
+
+def test_statements_per_endpoint(
+    database: AsyncEngine, monkeypatch: pytest.MonkeyPatch
+):
+    # Every read reaches the database rather than the user cache
+    monkeypatch.setattr(user_cache, "enabled", False)
+    authorization = {"Authorization": f"Bearer {create_access_token(USER['email'])}"}
+    requests = [
+        ("create", "POST", "/api/v1/users/account", {"json": USER}),
+        (
+            "validate",
+            "POST",
+            "/api/v1/users/account/validate",
+            {"json": {"email": USER["email"], "password": USER["password"]}},
+        ),
+        ("get", "GET", "/api/v1/users/account", {"headers": authorization}),
+        (
+            "update",
+            "PATCH",
+            "/api/v1/users/account",
+            {"json": {"first_name": "Augusta"}, "headers": authorization},
+        ),
+    ]
+
+    async def main() -> dict[str, list[str]]:
+        transport = httpx.ASGITransport(app=app)
+        counts: dict[str, list[str]] = {}
+        async with httpx.AsyncClient(
+            transport=transport, base_url="http://test"
+        ) as client:
+            for name, method, url, options in requests:
+                with count_statements(database) as statements:
+                    response = await client.request(method, url, **options)
+                assert response.status_code == 200, response.text
+                counts[name] = statements
+        return counts
+
+    assert asyncio.run(main()) == {
+        "create": ["INSERT"],
+        "validate": ["SELECT", "UPDATE"],
+        "get": ["SELECT"],
+        # The endpoint looks the account up by the token's email first
+        "update": ["SELECT", "SELECT", "UPDATE"],
+    }
@@ -0,0 +1,62 @@
+import asyncio
+import base64
+import contextvars
+import json
+
+import pytest
+
+from helpers.model import APIError
+from helpers.repository import decode_cursor, encode_cursor
+from repositories.users import UserRespository
+
+
+@pytest.mark.usefixtures("database")
+def test_sessions_are_scoped_to_the_task():
+    repository = UserRespository()
+
+    async def session_id() -> int:
+        session = await repository.get_database_session()
+        await asyncio.sleep(0)
+        try:
+            assert await repository.get_database_session() is session
+            return id(session)
+        finally:
+            await repository.close_database_session()
+
+    async def main():
+        return await asyncio.gather(*(session_id() for _ in range(50)))
+
+    assert len(set(asyncio.run(main()))) == 50
+
+
+@pytest.mark.usefixtures("database")
+def test_repositories_do_not_grow_the_context():
+    async def main() -> int:
+        for _ in range(500):
+            repository = UserRespository()
+            await repository.get_database_session()
+            await repository.close_database_session()
+        return len(contextvars.copy_context())
+
+    async def baseline() -> int:
+        repository = UserRespository()
+        await repository.get_database_session()
+        await repository.close_database_session()
+        return len(contextvars.copy_context())
+
+    assert asyncio.run(main()) == asyncio.run(baseline())
+
+
+def test_cursor_round_trip():
+    assert decode_cursor(encode_cursor("a", 1), 2) == ["a", "1"]
+
+
+@pytest.mark.parametrize(
+    "values", [[1, 2], [None, "x"], ["x", ["y"]], ["x"], {"a": "b"}]
+)
+def test_malformed_cursors_are_rejected(values):
+    raw = json.dumps(values).encode()
+    cursor = base64.urlsafe_b64encode(raw).decode().rstrip("=")
+    with pytest.raises(APIError) as error:
+        decode_cursor(cursor, 2)
+    assert error.value.status_code == 400
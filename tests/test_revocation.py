@@ -0,0 +1,124 @@
+import asyncio
+import time
+
+import httpx
+import pytest
+
+import helpers.auth
+from helpers.auth import create_access_token
+from helpers.revocation import (
+    MemoryRevocationStore,
+    RedisRevocationStore,
+    RevocationStoreError,
+)
+from server import app
+
+
+class FakePipeline:
+    def __init__(self, client: "FakeRedis"):
+        self.client = client
+        self.keys: list[str] = []
+
+    async def __aenter__(self) -> "FakePipeline":
+        return self
+
+    async def __aexit__(self, *args):
+        pass
+
+    def exists(self, key: str):
+        self.keys.append(key)
+
+    async def execute(self) -> list[int]:
+        self.client.round_trips.append(self.keys)
+        if self.client.error:
+            raise self.client.error
+        return [int(key in self.client.keys) for key in self.keys]
+
+
+class FakeRedis:
+    """Just enough of redis.asyncio.Redis for the revocation store."""
+
+    def __init__(self, *keys: str):
+        self.keys = set(keys)
+        self.round_trips: list[list[str]] = []
+        self.error: Exception | None = None
+
+    def pipeline(self, transaction: bool = True) -> FakePipeline:  # noqa: ARG002
+        return FakePipeline(self)
+
+    async def set(self, key: str, value: int, ex: int, nx: bool) -> bool:  # noqa: ARG002
+        if self.error:
+            raise self.error
+        if nx and key in self.keys:
+            return False
+        self.keys.add(key)
+        return True
+
+
+def redis_store(client: FakeRedis) -> RedisRevocationStore:
+    store = RedisRevocationStore("redis://localhost:6379/0")
+    store._client = client
+    return store
+
+
+def test_memory_store_evicts_expired_ids(monkeypatch: pytest.MonkeyPatch):
+    now = 1000.0
+    monkeypatch.setattr(time, "time", lambda: now)
+    store = MemoryRevocationStore()
+
+    async def main():
+        assert await store.revoke("a", 1010)
+        assert not await store.revoke("a", 1010)
+        assert await store.revoke("b", 1020)
+        assert await store.is_revoked("a")
+
+    asyncio.run(main())
+    now = 1015.0
+
+    async def later():
+        assert not await store.is_revoked("a")
+        assert await store.is_revoked("b")
+        # Revoking pops every expired id off the heap
+        assert await store.revoke("c", 1030)
+        assert len(store) == 2
+        # An id whose token has already expired is not stored
+        assert await store.revoke("d", 1000)
+        assert len(store) == 2
+
+    asyncio.run(later())
+
+
+def test_concurrent_lookups_share_one_round_trip():
+    client = FakeRedis("revoked:b")
+    store = redis_store(client)
+
+    async def main():
+        return await asyncio.gather(
+            *(store.is_revoked(jti) for jti in ("a", "b", "a", "c", "b"))
+        )
+
+    assert asyncio.run(main()) == [False, True, False, False, True]
+    assert client.round_trips == [["revoked:a", "revoked:b", "revoked:c"]]
+
+
+def test_unreachable_store_fails_closed(monkeypatch: pytest.MonkeyPatch):
+    client = FakeRedis()
+    client.error = ConnectionError("Connection refused")
+    monkeypatch.setattr(helpers.auth, "revocation_store", redis_store(client))
+    headers = {"Authorization": f"Bearer {create_access_token('ada@example.com')}"}
+
+    async def main():
+        with pytest.raises(RevocationStoreError):
+            await helpers.auth.revocation_store.revoke("a", time.time() + 60)
+
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(
+            transport=transport, base_url="http://test"
+        ) as http:
+            return await asyncio.gather(
+                *(http.get("/api/v1/users/account", headers=headers) for _ in range(3))
+            )
+
+    responses = asyncio.run(main())
+    assert [response.status_code for response in responses] == [503] * 3
+    assert responses[0].json()["error"] == "Authentication is temporarily unavailable"
@@ -0,0 +1,46 @@
+import asyncio
+
+import httpx
+import pytest
+
+from helpers.auth import create_access_token
+from models.users import UserCreate
+from repositories.users import UserRespository, user_cache
+from server import app
+
+
+@pytest.mark.usefixtures("database")
+def test_account_under_concurrent_requests(monkeypatch: pytest.MonkeyPatch):
+    # Bypass the user cache so every request opens its own session
+    monkeypatch.setattr(user_cache, "enabled", False)
+    emails = [f"user{index}@example.com" for index in range(3)]
+
+    async def main():
+        repository = UserRespository()
+        for email in emails:
+            await repository.create(
+                UserCreate(
+                    email=email, first_name="Ada", last_name="Lovelace", password="pw"
+                )
+            )
+
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(
+            transport=transport, base_url="http://test"
+        ) as client:
+
+            async def account(email: str) -> httpx.Response:
+                token = create_access_token(email)
+                return await client.get(
+                    "/api/v1/users/account",
+                    headers={"Authorization": f"Bearer {token}"},
+                )
+
+            requests = [emails[index % len(emails)] for index in range(300)]
+            responses = await asyncio.gather(*(account(email) for email in requests))
+
+        for email, response in zip(requests, responses, strict=True):
+            assert response.status_code == 200, response.text
+            assert response.json()["data"]["email"] == email
+
+    asyncio.run(main())